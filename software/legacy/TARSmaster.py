@@ -16,7 +16,7 @@ from tkinter.font import Font
 # Add project root to path so tars/ package can be imported
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from tars.ai import chat  # noqa: E402
+from tars.ai import acks, chat  # noqa: E402
 from tars.commands.language import LanguageState  # noqa: E402
 from tars.commands.movement import (  # noqa: E402
     move_forward,
@@ -24,7 +24,7 @@ from tars.commands.movement import (  # noqa: E402
     turn_left,
     turn_right,
 )
-from tars.commands.router import process_command  # noqa: E402
+from tars.commands.router import process_command, refresh_acks  # noqa: E402
 from tars.hardware import servos  # noqa: E402
 from tars.voice import listener, speaker  # noqa: E402
 
@@ -86,6 +86,21 @@ def read_controller_input():
         return None
 
 
+def _ack_response(prompt, state):
+    """Reply to a canned prompt — from the ack pool when possible, otherwise the AI."""
+    return acks.take(
+        prompt,
+        honesty=state.honesty,
+        humor=state.humor,
+        target_language=state.current_language,
+    ) or chat.get_response(
+        prompt,
+        honesty=state.honesty,
+        humor=state.humor,
+        target_language=state.current_language,
+    )
+
+
 def process_controller_command(command, state):
     action_map = {
         "move_forward": ("Moving forward", move_forward),
@@ -96,20 +111,10 @@ def process_controller_command(command, state):
     if command in action_map:
         prompt, action = action_map[command]
         action(state.current_language)
-        response = chat.get_response(
-            prompt,
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
+        response = _ack_response(prompt, state)
         speaker.speak(response, state.current_language)
     elif command == "stop":
-        response = chat.get_response(
-            "Goodbye",
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
+        response = _ack_response("Goodbye", state)
         speaker.speak(response, state.current_language)
         time.sleep(1)
         return "stop"
@@ -297,6 +302,10 @@ def main():
     ui = TARSTerminalUI(root)
     ui_instance = ui
 
+    # Pre-generate controller acknowledgements; process_command refreshes
+    # them whenever humor, honesty or language changes
+    refresh_acks(ui.state)
+
     try:
         threading.Thread(target=continuous_listening, daemon=True).start()
         root.mainloop()
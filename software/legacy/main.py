@@ -5,6 +5,7 @@ Usage:
     python main.py              # Interactive mode (text + voice, always listening)
     python main.py --text-only  # Text-only mode (no mic/speaker)
     python main.py --wake-word  # Require "Hey TARS" before listening
+    python main.py --prerender-speech  # Fill the speech cache for fixed phrases, then exit
     python main.py --help       # Show help
 """
 
@@ -42,15 +43,16 @@ try:
 except Exception:
     pass  # Not on Linux or no ALSA — that's fine
 
-from tars.ai import chat  # noqa: E402
-from tars.commands.language import LanguageState  # noqa: E402
+from tars import config  # noqa: E402
+from tars.ai import acks, chat, local_llm  # noqa: E402
+from tars.commands.language import LanguageState, get_supported_languages  # noqa: E402
 from tars.commands.movement import neutral  # noqa: E402
-from tars.commands.router import process_command  # noqa: E402
+from tars.commands.router import FIXED_PHRASES, MOVEMENT_COMMANDS, command_phrases, process_command  # noqa: E402
 from tars.hardware import camera, servos  # noqa: E402
 from tars.ui import terminal  # noqa: E402
 from tars.utils.logging import setup as setup_logging  # noqa: E402
 from tars.utils.threading import SharedState, is_shutting_down, request_shutdown, shutdown_event  # noqa: E402
-from tars.voice import listener, speaker  # noqa: E402
+from tars.voice import capture, clips, keywords, listener, speaker, stt  # noqa: E402
 from tars.voice.voice_state import VoiceState, VoiceStateMachine  # noqa: E402
 from tars.voice.wake_word import WakeWordDetector  # noqa: E402
 
@@ -69,8 +71,6 @@ def first_run_check():
     """Check if .env exists; if not, guide the user through setup."""
     from pathlib import Path
 
-    from tars import config
-
     env_path = Path(config._PROJECT_ROOT) / ".env"
     if env_path.exists():
         return
@@ -127,7 +127,12 @@ def voice_pipeline_thread(state, voice_sm, use_wake_word=False):
 
             # LISTENING: Record user speech
             voice_sm.transition(VoiceState.LISTENING)
-            command = listener.listen()
+            # Pick up exactly where the wake word ended — nothing said after it is lost
+            command = listener.listen(
+                start=wake_detector.detected_at if use_wake_word else None,
+                on_partial=terminal.print_partial,
+            )
+            terminal.print_partial("")
 
             if not command or is_shutting_down():
                 continue
@@ -236,6 +241,21 @@ def text_input_loop(state):
             break
 
 
+def prerender_speech():
+    """Render movement messages, fixed router lines and time clips for every language into the speech cache."""
+    speaker.initialize(audio=False)
+    phrases = []
+    for lang in get_supported_languages():
+        phrases += [(message, lang) for message in config.MOVEMENT_MESSAGES.get(lang, {}).values()]
+        phrases += [(phrase, lang) for phrase in FIXED_PHRASES]
+    terminal.print_system(f"Pre-rendering {len(phrases)} phrases...")
+    ready = speaker.prerender(phrases)
+    terminal.print_system(f"{ready}/{len(phrases)} phrases cached.")
+    for lang in get_supported_languages():
+        ready = clips.prerender(lang)
+        terminal.print_system(f"{ready}/{len(clips.all_phrases())} time clips cached ({lang}).")
+
+
 def main():
     parser = argparse.ArgumentParser(description="TARS-WIZARD v2.0")
     parser.add_argument(
@@ -248,11 +268,20 @@ def main():
         action="store_true",
         help="Enable wake word detection (say 'Hey TARS' to activate)",
     )
+    parser.add_argument(
+        "--prerender-speech",
+        action="store_true",
+        help="Render fixed phrases in every language into the speech cache, then exit",
+    )
     args = parser.parse_args()
 
     # Set up logging
     setup_logging()
 
+    if args.prerender_speech:
+        prerender_speech()
+        return
+
     # First-run setup wizard
     first_run_check()
 
@@ -264,6 +293,9 @@ def main():
     terminal.print_system("Initializing...")
     servos.initialize()
     speaker.initialize()
+    if not args.text_only:
+        stt.initialize()
+        keywords.initialize(command_phrases(), MOVEMENT_COMMANDS)
     chat.initialize()
     camera.initialize()
 
@@ -275,10 +307,16 @@ def main():
     lang_state = LanguageState()
     state = SharedState(lang_state, text_only=args.text_only)
 
+    # Pre-generate replies to movement/controller prompts in the background
+    acks.prefill(state.honesty, state.humor, state.current_language)
+
     # Create voice state machine
     use_wake_word = not args.text_only and args.wake_word
     voice_sm = VoiceStateMachine(use_wake_word=use_wake_word)
 
+    # Keep the offline model warm only while TARS is awake
+    voice_sm.on_transition(lambda old, new: local_llm.set_awake(new != VoiceState.SLEEPING))
+
     # Initialize servos to neutral
     neutral()
 
@@ -317,6 +355,9 @@ def main():
         # Stop any ongoing speech
         speaker.stop_speaking()
 
+        # Release the microphone
+        capture.stop()
+
         # Clean up camera
         camera.cleanup()
 
@@ -36,6 +36,7 @@ sudo apt-get install -y \
     python3-venv \
     git \
     ffmpeg \
+    espeak-ng \
     portaudio19-dev \
     libasound-dev \
     libatlas-base-dev \
@@ -0,0 +1,128 @@
+"""Pre-generated acknowledgements for TARS — instant replies to canned prompts.
+
+Movement and controller commands ask the AI to react to fixed prompts like
+"Moving forward". Instead of a full LLM round trip after the servos finish,
+replies are generated ahead of time on a background thread and kept in a
+small pool per (prompt, language, humor bucket, honesty bucket). Each reply
+is used once; a pool that runs low is refilled asynchronously.
+"""
+
+import queue
+import threading
+from collections import deque
+
+from tars import config
+from tars.ai import chat
+
+# Canned prompts sent by the router for movement, controller and system events
+PROMPTS = (
+    "Moving forward",
+    "Turning left",
+    "Turning right",
+    "Neutral position",
+    "Goodbye",
+    "Confirm language change",
+)
+
+_pools = {}  # (prompt, language, humor bucket, honesty bucket) -> deque of replies
+_pending = set()  # keys queued or being refilled
+_lock = threading.Lock()
+_generation = 0  # bumped by clear() so refills for old settings are dropped
+_refill_queue = queue.Queue()
+_worker = None
+
+
+def _bucket(value):
+    """Snap a 0.0-1.0 personality level to the nearest bucket."""
+    step = config.ACK_POOL_BUCKET / 100
+    return round(round(value / step) * step, 2)
+
+
+def _key(prompt, honesty, humor, target_language):
+    return prompt, target_language, _bucket(humor), _bucket(honesty)
+
+
+def take(prompt, honesty=0.5, humor=0.5, target_language="english"):
+    """Pop a pre-generated reply for a canned prompt.
+
+    Returns None on a miss (caller should ask the AI directly). Schedules a
+    background refill whenever the pool is running low.
+    """
+    if not config.ACK_POOL_ENABLED:
+        return None
+
+    key = _key(prompt, honesty, humor, target_language)
+    with _lock:
+        pool = _pools.get(key)
+        reply = pool.popleft() if pool else None
+        remaining = len(pool) if pool else 0
+
+    if remaining <= config.ACK_POOL_LOW_WATER:
+        _schedule(key)
+    return reply
+
+
+def prefill(honesty=0.5, humor=0.5, target_language="english"):
+    """Queue background generation of every canned prompt for these settings."""
+    if not config.ACK_POOL_ENABLED:
+        return
+    for prompt in PROMPTS:
+        _schedule(_key(prompt, honesty, humor, target_language))
+
+
+def clear():
+    """Drop all pooled replies — call when personality settings change."""
+    global _generation
+    with _lock:
+        _pools.clear()
+        _pending.clear()
+        _generation += 1
+
+
+def pool_sizes():
+    """Return {key: replies ready} for status/debugging."""
+    with _lock:
+        return {key: len(pool) for key, pool in _pools.items()}
+
+
+def _schedule(key):
+    """Queue a pool for refill unless it is already queued."""
+    global _worker
+    if not chat.is_available():
+        return
+    with _lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+        generation = _generation
+        if _worker is None:
+            _worker = threading.Thread(target=_refill_loop, daemon=True)
+            _worker.start()
+    _refill_queue.put((key, generation))
+
+
+def _refill_loop():
+    """Single background worker — tops up queued pools one reply at a time."""
+    while True:
+        key, generation = _refill_queue.get()
+        prompt, language, humor, honesty = key
+        while True:
+            with _lock:
+                if generation != _generation:
+                    break
+                if len(_pools.setdefault(key, deque())) >= config.ACK_POOL_SIZE:
+                    _pending.discard(key)
+                    break
+            try:
+                reply = chat.generate(prompt, honesty, humor, language)
+            except Exception as e:
+                print(f"Ack pool refill error: {e}")
+                reply = None
+            with _lock:
+                if generation != _generation:
+                    break
+                if reply is None:
+                    # AI unreachable — give up for now, the next miss retries
+                    _pending.discard(key)
+                    break
+                _pools[key].append(reply)
@@ -0,0 +1,149 @@
+"""Circuit breakers for TARS AI backends — skip known-bad providers instantly.
+
+States:
+    CLOSED    — healthy, requests flow normally
+    OPEN      — failing, requests are skipped without touching the network
+    HALF_OPEN — cooldown over, one trial request decides CLOSED vs OPEN
+
+A breaker opens after several consecutive failures, or when the error rate
+over the rolling window gets too high. While open, an optional probe (a
+cheap health check like listing models) runs in a background thread every
+cooldown period; once it succeeds the breaker goes half-open.
+"""
+
+import enum
+import threading
+import time
+from collections import deque
+
+from tars.ai.hedge import LatencyTracker
+
+# Requests needed before the error rate is trusted (or a full window, if smaller)
+_MIN_REQUESTS = 5
+
+
+class BreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker with rolling error rate and latency."""
+
+    def __init__(self, name, window=20, error_rate=0.5, consecutive_failures=3,
+                 cooldown=30.0, probe=None):
+        self.name = name
+        self.latency = LatencyTracker(window=window, min_samples=1)
+        self._results = deque(maxlen=window)
+        self._error_rate = error_rate
+        self._consecutive_limit = consecutive_failures
+        self._cooldown = cooldown
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._probing = False
+        self._requests = 0
+        self._failures = 0
+        self._skipped = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow_request(self):
+        """Return True if a request may go to this backend right now."""
+        with self._lock:
+            if self._state == BreakerState.OPEN and not self._probe:
+                # No background probe — let a trial through once cooled down
+                if time.monotonic() - self._opened_at >= self._cooldown:
+                    self._state = BreakerState.HALF_OPEN
+            if self._state == BreakerState.CLOSED:
+                return True
+            if self._state == BreakerState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self._skipped += 1
+            return False
+
+    def record_success(self, latency=None):
+        """Record a successful request (latency in seconds, if measured)."""
+        if latency is not None:
+            self.latency.record(latency)
+        with self._lock:
+            self._requests += 1
+            self._results.append(True)
+            self._consecutive = 0
+            if self._state == BreakerState.HALF_OPEN:
+                self._state = BreakerState.CLOSED
+                self._results.clear()
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed request; may open the breaker."""
+        with self._lock:
+            self._requests += 1
+            self._failures += 1
+            self._results.append(False)
+            self._consecutive += 1
+            self._trial_in_flight = False
+            if self._state == BreakerState.HALF_OPEN or self._should_trip():
+                self._trip()
+
+    def release(self):
+        """Give back a half-open trial that was abandoned without a verdict."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self):
+        """Return a dict of state and counters for status display."""
+        with self._lock:
+            results = list(self._results)
+            snap = {
+                "state": self._state.value,
+                "requests": self._requests,
+                "failures": self._failures,
+                "skipped": self._skipped,
+                "error_rate": results.count(False) / len(results) if results else 0.0,
+            }
+        snap["p50"] = self.latency.percentile(50)
+        snap["p95"] = self.latency.percentile(95)
+        return snap
+
+    def _should_trip(self):
+        if self._state != BreakerState.CLOSED:
+            return False
+        if self._consecutive >= self._consecutive_limit:
+            return True
+        if len(self._results) < min(self._results.maxlen, _MIN_REQUESTS):
+            return False
+        return self._results.count(False) / len(self._results) >= self._error_rate
+
+    def _trip(self):
+        """Open the breaker (lock held) and start background probing."""
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        if self._probe and not self._probing:
+            self._probing = True
+            threading.Thread(target=self._probe_loop, daemon=True).start()
+
+    def _probe_loop(self):
+        """Probe the backend every cooldown period until it answers."""
+        while True:
+            time.sleep(self._cooldown)
+            try:
+                healthy = bool(self._probe())
+            except Exception:
+                healthy = False
+            with self._lock:
+                if self._state != BreakerState.OPEN:
+                    self._probing = False
+                    return
+                if healthy:
+                    self._state = BreakerState.HALF_OPEN
+                    self._probing = False
+                    return
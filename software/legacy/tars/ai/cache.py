@@ -0,0 +1,194 @@
+"""Semantic response cache for TARS — instant answers to repeated questions.
+
+At events people ask the same handful of questions over and over. Each
+question is normalized and turned into a lightweight embedding (hashed
+character trigrams and words, no model needed). A lookup compares it
+against every cached question in one NumPy matrix-vector product and
+returns the stored answer if the nearest one is similar enough — and
+asks about the same numbers: "what is 12 times 4" and "what is 12 times 5"
+embed almost identically but need different answers.
+
+Entries are separated by language and personality bucket, expire after a
+TTL, and the least recently used entry is evicted when the cache is full.
+Opt-in via ai.cache.enabled — cached answers ignore conversation context.
+"""
+
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from tars import config
+
+# Embedding width — plenty for short spoken questions
+_DIM = 512
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_NUMBERS = re.compile(
+    r"\d+|\b(?:zero|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen"
+    r"|fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|eighty"
+    r"|ninety|hundred|thousand|million|billion|half|quarter)\b"
+)
+
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace."""
+    text = _PUNCTUATION.sub("", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def numbers(text):
+    """The numbers in normalized text, in order — digits or spelled out."""
+    return tuple(_NUMBERS.findall(text))
+
+
+def embed(text, dim=_DIM):
+    """Unit-length hashed bag of character trigrams and words for normalized text."""
+    padded = f" {text} "
+    features = [padded[i:i + 3] for i in range(len(padded) - 2)] + text.split()
+    if not features:
+        return np.zeros(dim, dtype=np.float32)
+    indices = [zlib.crc32(f.encode()) % dim for f in features]
+    vector = np.bincount(indices, minlength=dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class ResponseCache:
+    """Thread-safe, size-bounded semantic cache with TTL and LRU eviction.
+
+    Args:
+        max_entries: Answers kept before the least recently used is evicted.
+        similarity: Minimum cosine similarity for a near-duplicate hit.
+        ttl: Seconds an answer stays valid.
+    """
+
+    def __init__(self, max_entries=256, similarity=0.85, ttl=3600, dim=_DIM):
+        self.similarity = similarity
+        self.ttl = ttl
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._stored_at = np.full(max_entries, -np.inf)
+        self._last_used = np.full(max_entries, -np.inf)
+        self._buckets = [None] * max_entries
+        self._texts = [None] * max_entries
+        self._numbers = [None] * max_entries
+        self._answers = [None] * max_entries
+        self._index = {}  # (bucket, normalized text) -> slot
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, bucket):
+        """Return the cached answer for a near-duplicate question, or None."""
+        text = normalize(text)
+        now = time.monotonic()
+        with self._lock:
+            slot = self._index.get((bucket, text))
+            if slot is None:
+                slot = self._nearest(embed(text, self._vectors.shape[1]), bucket, numbers(text), now)
+            elif now - self._stored_at[slot] > self.ttl:
+                slot = None
+            if slot is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._last_used[slot] = now
+            return self._answers[slot]
+
+    def put(self, text, bucket, answer):
+        """Store an answer, replacing an identical question or evicting the LRU entry."""
+        text = normalize(text)
+        if not text:
+            return
+        now = time.monotonic()
+        with self._lock:
+            slot = self._index.get((bucket, text))
+            if slot is None:
+                slot = int(np.argmin(self._last_used))
+                if self._texts[slot] is not None:
+                    del self._index[(self._buckets[slot], self._texts[slot])]
+                self._index[(bucket, text)] = slot
+            self._vectors[slot] = embed(text, self._vectors.shape[1])
+            self._stored_at[slot] = now
+            self._last_used[slot] = now
+            self._buckets[slot] = bucket
+            self._texts[slot] = text
+            self._numbers[slot] = numbers(text)
+            self._answers[slot] = answer
+
+    def clear(self):
+        with self._lock:
+            self._stored_at[:] = -np.inf
+            self._last_used[:] = -np.inf
+            self._buckets = [None] * len(self._buckets)
+            self._texts = [None] * len(self._texts)
+            self._numbers = [None] * len(self._numbers)
+            self._answers = [None] * len(self._answers)
+            self._index.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index)
+
+    def _nearest(self, vector, bucket, nums, now):
+        """Slot of the most similar live entry in this bucket with the same numbers (lock held), or None."""
+        if not self._index:
+            return None
+        scores = self._vectors @ vector
+        live = (now - self._stored_at) <= self.ttl
+        live &= np.fromiter((b == bucket and n == nums for b, n in zip(self._buckets, self._numbers)),
+                            dtype=bool, count=len(self._buckets))
+        scores[~live] = -1.0
+        slot = int(np.argmax(scores))
+        return slot if scores[slot] >= self.similarity else None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                max_entries=config.AI_CACHE_MAX_ENTRIES,
+                similarity=config.AI_CACHE_SIMILARITY,
+                ttl=config.AI_CACHE_TTL,
+            )
+        return _cache
+
+
+def _bucket(honesty, humor, target_language):
+    """Cache partition for a language and snapped personality levels."""
+    step = config.AI_CACHE_BUCKET / 100
+    return target_language, round(round(humor / step) * step, 2), round(round(honesty / step) * step, 2)
+
+
+def lookup(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Return a cached answer for a near-duplicate question, or None (also when disabled)."""
+    if not config.AI_CACHE_ENABLED:
+        return None
+    return _get_cache().get(user_input, _bucket(honesty, humor, target_language))
+
+
+def store(user_input, response, honesty=0.5, humor=0.5, target_language="english"):
+    """Remember an answer for later near-duplicate questions (no-op when disabled)."""
+    if not config.AI_CACHE_ENABLED:
+        return
+    _get_cache().put(user_input, _bucket(honesty, humor, target_language), response)
+
+
+def clear():
+    """Forget every cached answer."""
+    if _cache is not None:
+        _cache.clear()
+
+
+def stats():
+    """Return entry count and hit/miss counters for status display."""
+    if _cache is None:
+        return {"entries": 0, "hits": 0, "misses": 0}
+    return {"entries": len(_cache), "hits": _cache.hits, "misses": _cache.misses}
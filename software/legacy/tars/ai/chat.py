@@ -2,16 +2,32 @@
 
 Tries Cerebras first for fastest inference. Falls back to OpenAI, then Ollama.
 All three use the OpenAI-compatible SDK — just different base URLs.
-Maintains conversation history for natural multi-turn dialogue.
+Maintains token-budgeted conversation history for natural multi-turn
+dialogue (older turns are summarized, see tars.ai.history).
+get_response_stream() yields text as it is generated, so callers can start
+speaking the first sentence before the rest of the reply exists.
+With ai.hedge.enabled, Cerebras and OpenAI are raced instead of tried in
+sequence (see tars.ai.hedge). Each backend sits behind a circuit breaker
+(see tars.ai.breaker) so a provider that is down is skipped instantly.
+With ai.cache.enabled, near-duplicate questions are answered from a local
+semantic cache (see tars.ai.cache). Cloud connections are warmed at startup
+and kept alive between turns (see tars.ai.connections).
+
+The native API is async (get_response_async and friends) and runs on one
+long-lived event loop thread with shared AsyncOpenAI / aiohttp clients. The
+sync functions are thin wrappers that submit to that loop, so any thread
+can call them, and submit_response() lets callers overlap a request with
+other work such as servo motion.
 """
 
-import threading
-from collections import deque
+import asyncio
+import time
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from tars import config
-from tars.ai import local_llm
+from tars.ai import breaker, cache, connections, hedge, history, local_llm
+from tars.utils.aio import LoopThread
 
 # AI clients — initialized lazily
 _cerebras_client = None
@@ -19,9 +35,50 @@ _openai_client = None
 _cerebras_available = False
 _openai_available = False
 
-# Conversation history — rolling buffer of recent messages for context
-_history = deque(maxlen=20)  # 10 exchanges (user + assistant)
-_history_lock = threading.Lock()
+# One event loop for all AI traffic — clients and connection pools live here
+_loop = LoopThread("tars-ai")
+
+# Connection reuse vs fresh handshakes per cloud backend
+_connection_stats = {
+    "cerebras": connections.ConnectionStats(),
+    "openai": connections.ConnectionStats(),
+}
+_keeper = None  # Future of the warm-up/keep-alive task
+
+
+def _new_breakers():
+    """Create one circuit breaker per backend, probing with cheap health checks."""
+    probes = {
+        "cerebras": lambda: _loop.run(_probe_cloud(_cerebras_client), timeout=10),
+        "openai": lambda: _loop.run(_probe_cloud(_openai_client), timeout=10),
+        "ollama": lambda: local_llm.ping(),
+    }
+    return {
+        name: breaker.CircuitBreaker(
+            name,
+            window=config.AI_BREAKER_WINDOW,
+            error_rate=config.AI_BREAKER_ERROR_RATE,
+            consecutive_failures=config.AI_BREAKER_CONSECUTIVE_FAILURES,
+            cooldown=config.AI_BREAKER_COOLDOWN,
+            probe=probe,
+        )
+        for name, probe in probes.items()
+    }
+
+
+class StreamInterrupted(Exception):
+    """A backend failed after it had already produced part of its reply."""
+
+
+# Per-backend health — latency here is time-to-first-token when streaming
+_breakers = _new_breakers()
+
+# Conversation history — recent turns under a token budget, older ones summarized
+_history = history.ConversationHistory(
+    token_budget=config.AI_HISTORY_TOKEN_BUDGET,
+    keep_recent=config.AI_HISTORY_KEEP_RECENT,
+    summarize=lambda summary, turns: _summarize(summary, turns),
+)
 
 # TARS system prompt — helpful assistant with dry personality
 _SYSTEM_PROMPT = (
@@ -34,28 +91,36 @@ _SYSTEM_PROMPT = (
     "Respond in {language}."
 )
 
+# Used off the hot path to compact old turns into a rolling summary
+_SUMMARY_PROMPT = (
+    "Summarize this conversation between a user and TARS, a robot assistant, "
+    "in a few short sentences. Keep names, facts, preferences and open questions. "
+    "Reply with the summary only."
+)
+
 
 def initialize():
     """Initialize AI backends: Cerebras > OpenAI > Ollama."""
-    global _cerebras_client, _openai_client, _cerebras_available, _openai_available
+    global _cerebras_client, _openai_client, _cerebras_available, _openai_available, _breakers
+
+    _breakers = _new_breakers()
 
     # Primary: Cerebras (fastest inference)
     if config.CEREBRAS_API_KEY:
-        _cerebras_client = OpenAI(
-            base_url="https://api.cerebras.ai/v1",
-            api_key=config.CEREBRAS_API_KEY,
-        )
+        _cerebras_client = _new_cloud_client("cerebras", config.CEREBRAS_API_KEY, "https://api.cerebras.ai/v1")
         _cerebras_available = True
         print("Cerebras client initialized (primary)")
 
     # Fallback: OpenAI
     if config.OPENAI_API_KEY:
-        _openai_client = OpenAI(api_key=config.OPENAI_API_KEY)
+        _openai_client = _new_cloud_client("openai", config.OPENAI_API_KEY)
         _openai_available = True
         print("OpenAI client initialized (fallback)")
 
     if not _cerebras_available and not _openai_available:
         print("WARNING: No cloud AI keys set. Set CEREBRAS_API_KEY or OPENAI_API_KEY in .env")
+    else:
+        _start_keeper()
 
     # Offline fallback: Ollama
     local_llm.initialize()
@@ -68,46 +133,341 @@ def is_available():
     return _cerebras_available or _openai_available or local_llm.is_available()
 
 
+def get_health():
+    """Return circuit breaker state and counters for each configured backend."""
+    configured = {
+        "cerebras": _cerebras_available,
+        "openai": _openai_available,
+        "ollama": local_llm.is_available(),
+    }
+    health = {name: _breakers[name].snapshot() for name, on in configured.items() if on}
+    for name, stats in _connection_stats.items():
+        if name in health:
+            health[name]["connections"] = stats.snapshot()
+    return health
+
+
 def get_response(user_input, honesty=0.5, humor=0.5, target_language="english"):
     """Get a TARS-style AI response. Tries Cerebras > OpenAI > Ollama.
 
+    Blocking wrapper around get_response_async() — safe from any thread
+    except the AI event loop itself.
+    """
+    return _loop.run(get_response_async(user_input, honesty, humor, target_language))
+
+
+def submit_response(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Start get_response_async() in the background; returns a concurrent Future."""
+    return _loop.submit(get_response_async(user_input, honesty, humor, target_language))
+
+
+def generate(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Blocking wrapper around generate_async()."""
+    return _loop.run(generate_async(user_input, honesty, humor, target_language))
+
+
+def get_response_stream(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Blocking generator wrapper around get_response_stream_async()."""
+    return _loop.iterate(get_response_stream_async(user_input, honesty, humor, target_language))
+
+
+async def get_response_async(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Get a TARS-style AI response. Tries Cerebras > OpenAI > Ollama.
+
     Maintains conversation history for natural multi-turn dialogue.
+    With hedging enabled the cloud backends are raced via the streaming path.
+    """
+    response = cache.lookup(user_input, honesty, humor, target_language)
+    if response is None:
+        response = await _generate(user_input, honesty, humor, target_language, with_history=True)
+        if response is None:
+            return _failure_message()
+        cache.store(user_input, response, honesty, humor, target_language)
+
+    _remember(user_input, response)
+    return response
+
+
+async def generate_async(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Get a one-off response outside the conversation.
+
+    History is neither sent nor updated, and failures return None instead
+    of a spoken error message — used to pre-generate canned replies.
     """
-    response = None
+    return await _generate(user_input, honesty, humor, target_language, with_history=False)
+
+
+async def get_response_stream_async(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Stream a TARS-style AI response as text chunks. Tries Cerebras > OpenAI > Ollama.
+
+    A backend is only skipped if it fails before producing any text — once
+    words have been spoken they can't be taken back, so a mid-stream failure
+    just ends the reply early. A reply cut off like that is neither cached
+    nor added to history. Always yields at least one chunk.
+    """
+    cached = cache.lookup(user_input, honesty, humor, target_language)
+    if cached is not None:
+        yield cached
+        _remember(user_input, cached)
+        return
+
+    parts = []
+    try:
+        async for chunk in _stream(user_input, honesty, humor, target_language, with_history=True):
+            parts.append(chunk)
+            yield chunk
+    except StreamInterrupted as e:
+        print(f"AI reply cut off: {e}")
+        return
+
+    response = "".join(parts).strip()
+    if not response:
+        yield _failure_message()
+        return
 
-    # Try Cerebras first (fastest)
+    cache.store(user_input, response, honesty, humor, target_language)
+    _remember(user_input, response)
+
+
+async def _generate(user_input, honesty, humor, target_language, with_history):
+    """Response from the first backend that answers, or None."""
+    if _hedging_active():
+        try:
+            parts = [chunk async for chunk in _stream(user_input, honesty, humor, target_language, with_history)]
+        except StreamInterrupted as e:
+            print(f"AI reply cut off: {e}")
+            return None
+        return "".join(parts).strip() or None
+
+    messages = _build_messages(user_input, honesty, humor, target_language, with_history)
+
+    # Cerebras first (fastest), then OpenAI, then the local LLM
+    backends = []
     if _cerebras_available:
-        response = _try_cloud(
-            _cerebras_client, config.CEREBRAS_MODEL,
+        backends.append(("cerebras", lambda: _try_cloud(_cerebras_client, config.CEREBRAS_MODEL, messages)))
+    if _openai_available:
+        backends.append(("openai", lambda: _try_cloud(_openai_client, config.AI_MODEL, messages)))
+    if local_llm.is_available():
+        backends.append(("ollama", lambda: local_llm.get_response_async(
             user_input, honesty, humor, target_language,
-        )
+        )))
+
+    for name, call in backends:
+        response = await _metered_call(name, call)
+        if response is not None:
+            return response
+    return None
+
 
-    # Fall back to OpenAI
-    if response is None and _openai_available:
-        response = _try_cloud(
-            _openai_client, config.AI_MODEL,
+async def _stream(user_input, honesty, humor, target_language, with_history):
+    """Yield text chunks from the first backend that produces any.
+
+    Raises StreamInterrupted if that backend fails partway through.
+    """
+    messages = _build_messages(user_input, honesty, humor, target_language, with_history)
+
+    backends = []
+    if _cerebras_available:
+        backends.append(lambda: _metered_stream("cerebras", lambda: _try_cloud_stream(
+            _cerebras_client, config.CEREBRAS_MODEL, messages,
+        )))
+    if _openai_available:
+        backends.append(lambda: _metered_stream("openai", lambda: _try_cloud_stream(
+            _openai_client, config.AI_MODEL, messages,
+        )))
+    if _hedging_active():
+        primary, fallback = backends
+        backends = [lambda: hedge.race(primary, fallback, _hedge_delay())]
+    if local_llm.is_available():
+        backends.append(lambda: _metered_stream("ollama", lambda: local_llm.get_response_stream_async(
             user_input, honesty, humor, target_language,
-        )
+        )))
 
-    # Fall back to local LLM
-    if response is None and local_llm.is_available():
-        response = local_llm.get_response(user_input, honesty, humor, target_language)
+    for backend in backends:
+        produced = False
+        async for chunk in backend():
+            produced = True
+            yield chunk
+        if produced:
+            return
 
-    if response is None:
-        if not _cerebras_available and not _openai_available and not local_llm.is_available():
-            return "My AI brain is offline. Set CEREBRAS_API_KEY or OPENAI_API_KEY in .env, or install Ollama."
-        return "My circuits are fried. Try again in a moment."
 
-    # Store in conversation history
-    with _history_lock:
-        _history.append({"role": "user", "content": user_input})
-        _history.append({"role": "assistant", "content": response})
+def _hedging_active():
+    """Hedging needs both cloud backends configured."""
+    return config.AI_HEDGE_ENABLED and _cerebras_available and _openai_available
 
+
+def _hedge_delay():
+    """How long to wait for Cerebras' first token before also asking OpenAI.
+
+    Uses the configured percentile of recent Cerebras time-to-first-token,
+    clamped to [min_delay, max_delay]; falls back to default_delay until
+    enough samples exist.
+    """
+    delay = _breakers["cerebras"].latency.percentile(config.AI_HEDGE_PERCENTILE, config.AI_HEDGE_DEFAULT_DELAY)
+    return min(config.AI_HEDGE_MAX_DELAY, max(config.AI_HEDGE_MIN_DELAY, delay))
+
+
+async def _metered_call(name, call):
+    """Await a backend call through its circuit breaker.
+
+    Returns None without calling if the breaker is open.
+    """
+    backend = _breakers[name]
+    if not backend.allow_request():
+        return None
+    start = time.monotonic()
+    try:
+        response = await call()
+    except asyncio.CancelledError:
+        backend.release()
+        raise
+    if response is None:
+        backend.record_failure()
+    else:
+        backend.record_success(time.monotonic() - start)
     return response
 
 
-def _try_cloud(client, model, user_input, honesty, humor, target_language):
-    """Attempt to get a response from a cloud AI provider."""
+async def _metered_stream(name, factory):
+    """Run a streaming backend through its circuit breaker.
+
+    Success is recorded at the first chunk (with time-to-first-token);
+    a stream that ends without text is a failure. A stream cancelled by a
+    hedged race is neither. Yields nothing if the breaker is open; raises
+    StreamInterrupted if the backend fails after its first chunk.
+    """
+    backend = _breakers[name]
+    if not backend.allow_request():
+        return
+    start = time.monotonic()
+    produced = False
+    chunks = factory()
+    try:
+        async for chunk in chunks:
+            if not produced:
+                produced = True
+                backend.record_success(time.monotonic() - start)
+            yield chunk
+    except (GeneratorExit, asyncio.CancelledError):
+        if not produced:
+            backend.release()
+        raise
+    except Exception as e:
+        if not produced:
+            raise
+        raise StreamInterrupted(f"{name}: {e}") from e
+    finally:
+        await chunks.aclose()
+    if not produced:
+        backend.record_failure()
+
+
+async def _probe_cloud(client):
+    """Cheap health check for a cloud backend — lists models, costs no tokens."""
+    await client.models.list(timeout=5)
+    return True
+
+
+def _new_cloud_client(name, api_key, base_url=None):
+    """AsyncOpenAI client on a pooled, traced connection.
+
+    SDK retries are off — a failed request falls through to the next backend
+    instead of retrying the same one for up to three timeouts.
+    """
+    return AsyncOpenAI(
+        base_url=base_url,
+        api_key=api_key,
+        max_retries=0,
+        http_client=connections.http_client(_connection_stats[name], config.AI_CONN_KEEPALIVE_EXPIRY),
+    )
+
+
+def _cloud_clients():
+    """(name, client) for each configured cloud backend."""
+    clients = []
+    if _cerebras_available:
+        clients.append(("cerebras", _cerebras_client))
+    if _openai_available:
+        clients.append(("openai", _openai_client))
+    return clients
+
+
+def _start_keeper():
+    """Start the warm-up/keep-alive task on the AI loop (once)."""
+    global _keeper
+    if _keeper is None or _keeper.done():
+        _keeper = _loop.submit(_keep_connections_warm())
+
+
+async def _keep_connections_warm():
+    """Open each cloud connection now, then ping any that sit idle too long."""
+    interval = config.AI_CONN_KEEP_ALIVE_INTERVAL
+    if config.AI_CONN_WARM_UP:
+        await _ping_idle(0)
+    while interval:
+        await asyncio.sleep(interval / 3)
+        await _ping_idle(interval)
+
+
+async def _ping_idle(max_idle):
+    """Probe every cloud backend idle for at least max_idle seconds."""
+    for name, client in _cloud_clients():
+        if _connection_stats[name].idle_seconds() < max_idle:
+            continue
+        try:
+            await _probe_cloud(client)
+        except Exception as e:
+            print(f"{name} keep-alive failed: {e}")
+
+
+def _failure_message():
+    """Message to speak when no backend produced a response."""
+    if not _cerebras_available and not _openai_available and not local_llm.is_available():
+        return "My AI brain is offline. Set CEREBRAS_API_KEY or OPENAI_API_KEY in .env, or install Ollama."
+    return "My circuits are fried. Try again in a moment."
+
+
+def _remember(user_input, response):
+    """Store an exchange in conversation history."""
+    _history.add_exchange(user_input, response)
+
+
+def _summarize(summary, turns):
+    """Compact old turns into a rolling summary. Runs on the history's background thread."""
+    return _loop.run(_summarize_async(summary, turns))
+
+
+async def _summarize_async(summary, turns):
+    """Ask the first healthy backend to summarize old turns; None on failure."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in turns)
+    if summary:
+        transcript = f"Earlier summary: {summary}\n{transcript}"
+    messages = [
+        {"role": "system", "content": _SUMMARY_PROMPT},
+        {"role": "user", "content": transcript},
+    ]
+    max_tokens = config.AI_HISTORY_SUMMARY_MAX_TOKENS
+
+    backends = []
+    if _cerebras_available:
+        backends.append(("cerebras", lambda: _try_cloud(
+            _cerebras_client, config.CEREBRAS_MODEL, messages, max_tokens,
+        )))
+    if _openai_available:
+        backends.append(("openai", lambda: _try_cloud(_openai_client, config.AI_MODEL, messages, max_tokens)))
+    if local_llm.is_available():
+        backends.append(("ollama", lambda: local_llm.complete_async(messages, max_tokens)))
+
+    for name, call in backends:
+        result = await _metered_call(name, call)
+        if result is not None:
+            return result
+    return None
+
+
+def _build_messages(user_input, honesty, humor, target_language, with_history=True):
+    """Build messages: system prompt + conversation history + new user message."""
     system_msg = {
         "role": "system",
         "content": _SYSTEM_PROMPT.format(
@@ -117,22 +477,60 @@ def _try_cloud(client, model, user_input, honesty, humor, target_language):
         ),
     }
 
-    # Build messages: system + conversation history + new user message
     messages = [system_msg]
-    with _history_lock:
-        messages.extend(list(_history))
+    if with_history:
+        messages.extend(_history.messages())
     messages.append({"role": "user", "content": user_input})
+    return messages
+
 
+async def _try_cloud(client, model, messages, max_tokens=None):
+    """Attempt to get a response from a cloud AI provider."""
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=model,
             messages=messages,
-            max_tokens=config.AI_MAX_TOKENS,
+            max_tokens=max_tokens or config.AI_MAX_TOKENS,
             temperature=config.AI_TEMPERATURE,
-            timeout=10,
+            timeout=config.AI_TIMEOUT,
         )
         content = response.choices[0].message.content.strip()
         return content if content else None
     except Exception as e:
         print(f"AI API error ({model}): {e}")
         return None
+
+
+async def _try_cloud_stream(client, model, messages):
+    """Stream a response from a cloud AI provider, yielding text chunks.
+
+    Yields nothing if the request fails before the first token; a failure
+    after it is raised. Closing or cancelling the generator closes the HTTP
+    response.
+    """
+    produced = False
+    try:
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=config.AI_MAX_TOKENS,
+            temperature=config.AI_TEMPERATURE,
+            timeout=config.AI_TIMEOUT,
+            stream=True,
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    produced = True
+                    yield content
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                await close()
+    except Exception as e:
+        print(f"AI API error ({model}): {e}")
+        if produced:
+            raise
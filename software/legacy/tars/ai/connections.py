@@ -0,0 +1,83 @@
+"""Cloud AI connections for TARS — pooled, pre-warmed and instrumented.
+
+Each cloud backend gets its own HTTP client with a long keep-alive expiry
+(the SDK default drops idle connections after 5 seconds). chat.initialize()
+warms the connection at startup and a cheap periodic request keeps it hot,
+so the first turn after an idle gap doesn't pay DNS + TCP + TLS again.
+
+Every request is traced: ConnectionStats counts requests that reused a
+pooled connection versus ones that had to open a fresh one, and records
+how long those handshakes took.
+"""
+
+import copy
+import threading
+import time
+
+import openai
+
+from tars.ai.hedge import LatencyTracker
+
+
+class ConnectionStats:
+    """Thread-safe counters for connection reuse and handshake latency."""
+
+    def __init__(self):
+        self.handshake = LatencyTracker(window=20, min_samples=1)
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.fresh = 0
+        self.last_request = 0.0
+
+    def record(self, reused, handshake_seconds=None):
+        with self._lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.fresh += 1
+            self.last_request = time.monotonic()
+        if handshake_seconds is not None:
+            self.handshake.record(handshake_seconds)
+
+    def idle_seconds(self):
+        """Seconds since the last request (inf if none yet)."""
+        with self._lock:
+            if not self.last_request:
+                return float("inf")
+            return time.monotonic() - self.last_request
+
+    def snapshot(self):
+        with self._lock:
+            snap = {"reused": self.reused, "fresh": self.fresh}
+        snap["handshake_p50"] = self.handshake.percentile(50)
+        return snap
+
+
+def _tracer(stats):
+    """Per-request trace callback: was a connection opened before the request was sent?"""
+    connect_started = None
+
+    async def trace(event, info):
+        nonlocal connect_started
+        if event == "connection.connect_tcp.started":
+            connect_started = time.monotonic()
+        elif event.endswith(".send_request_headers.started"):
+            if connect_started is None:
+                stats.record(reused=True)
+            else:
+                stats.record(reused=False, handshake_seconds=time.monotonic() - connect_started)
+                connect_started = None
+
+    return trace
+
+
+def http_client(stats, keepalive_expiry=120.0):
+    """Async HTTP client for an OpenAI-compatible SDK client, traced into stats."""
+
+    async def on_request(request):
+        request.extensions["trace"] = _tracer(stats)
+
+    # Copy the SDK's own limits so this works with whichever httpx it ships
+    limits = copy.copy(openai.DEFAULT_CONNECTION_LIMITS)
+    limits.keepalive_expiry = keepalive_expiry
+    return openai.DefaultAsyncHttpxClient(limits=limits, event_hooks={"request": [on_request]})
@@ -0,0 +1,113 @@
+"""Hedged requests for TARS — race a slow AI backend against its fallback.
+
+The primary backend starts immediately. If it hasn't produced its first
+token within the hedge delay (normally its own p95 time-to-first-token),
+the fallback starts in parallel. Whichever speaks first wins; the loser's
+task is cancelled, which aborts its HTTP request. If the winner fails
+partway through, its exception is raised to the caller.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+_DONE = object()
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of latency samples (seconds)."""
+
+    def __init__(self, window=50, min_samples=5):
+        self._samples = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct, default=None):
+        """Return the pct-th percentile, or default until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < self._min_samples:
+            return default
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+
+async def race(primary, fallback, delay):
+    """Yield chunks from whichever of two streaming backends answers first.
+
+    Args:
+        primary: Zero-arg callable returning an async iterator of text chunks.
+        fallback: Same, started only if primary is slow or fails.
+        delay: Seconds to wait for primary's first chunk before hedging.
+    """
+    events = asyncio.Queue()
+    tasks = {}
+
+    async def run(idx, factory):
+        try:
+            async for chunk in factory():
+                events.put_nowait((idx, chunk))
+        except Exception as e:
+            print(f"Hedged request error: {e}")
+            events.put_nowait((idx, e))
+        finally:
+            events.put_nowait((idx, _DONE))
+
+    def start(idx):
+        tasks[idx] = asyncio.create_task(run(idx, primary if idx == 0 else fallback))
+
+    start(0)
+    finished = set()
+    deadline = time.monotonic() + delay
+    winner = None
+
+    try:
+        while winner is None:
+            try:
+                if len(tasks) == 1:
+                    timeout = max(0.0, deadline - time.monotonic())
+                    idx, item = await asyncio.wait_for(events.get(), timeout)
+                else:
+                    idx, item = await events.get()
+            except asyncio.TimeoutError:
+                start(1)
+                continue
+
+            if item is _DONE:
+                finished.add(idx)
+                if len(tasks) == 1:
+                    # Primary failed outright — no point waiting out the delay
+                    start(1)
+                elif len(finished) == len(tasks):
+                    return
+                continue
+            if isinstance(item, Exception):
+                continue  # failed before its first chunk; _DONE follows
+
+            winner = idx
+            loser = tasks.get(1 - idx)
+            if loser:
+                loser.cancel()
+            yield item
+
+        while True:
+            idx, item = await events.get()
+            if idx != winner:
+                continue
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        for task in tasks.values():
+            task.cancel()
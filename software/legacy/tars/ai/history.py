@@ -0,0 +1,144 @@
+"""Conversation history for TARS — token-budgeted, with a rolling summary.
+
+Every AI request carries the recent conversation. Instead of a fixed number
+of messages, history is kept under a token budget: once it grows past the
+budget, the oldest turns are compacted into a short summary by a background
+thread, so the hot path never waits on summarization. Until that finishes,
+messages() trims the oldest turns from the prompt so it never exceeds the
+budget.
+
+Token counts are estimated (~4 characters per token) — close enough for
+budgeting without pulling in a tokenizer.
+"""
+
+import threading
+
+# Per-message overhead for role/formatting tokens
+_MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text):
+    """Rough token estimate for a string (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def message_tokens(message):
+    """Estimated tokens for one chat message including overhead."""
+    return estimate_tokens(message["content"]) + _MESSAGE_OVERHEAD
+
+
+class ConversationHistory:
+    """Thread-safe token-budgeted history with background summarization.
+
+    Args:
+        token_budget: Max estimated tokens of history (summary included) per prompt.
+        keep_recent: Messages always kept verbatim, never summarized.
+        summarize: Callable(previous_summary, messages) -> new summary or None.
+            If None or it fails, compacted turns are simply dropped.
+    """
+
+    def __init__(self, token_budget=1200, keep_recent=6, summarize=None):
+        self.token_budget = token_budget
+        self.keep_recent = keep_recent
+        self._summarize = summarize
+        self._turns = []
+        self._summary = ""
+        self._lock = threading.Lock()
+        self._compacting = False
+        self._generation = 0  # bumped by clear() so stale compactions are ignored
+
+    @property
+    def summary(self):
+        with self._lock:
+            return self._summary
+
+    def add_exchange(self, user_input, response):
+        """Append a user/assistant exchange, compacting in the background if over budget."""
+        with self._lock:
+            self._turns.append({"role": "user", "content": user_input})
+            self._turns.append({"role": "assistant", "content": response})
+            over_budget = self._total_tokens() > self.token_budget
+        if over_budget:
+            self._start_compaction()
+
+    def messages(self):
+        """Return the summary (as a system message) plus the newest turns that fit the budget."""
+        with self._lock:
+            turns = list(self._turns)
+            summary = self._summary
+
+        result = []
+        budget = self.token_budget
+        if summary:
+            summary_msg = {"role": "system", "content": f"Summary of the conversation so far: {summary}"}
+            result.append(summary_msg)
+            budget -= message_tokens(summary_msg)
+
+        kept = []
+        for message in reversed(turns):
+            cost = message_tokens(message)
+            if cost > budget:
+                break
+            kept.append(message)
+            budget -= cost
+        kept.reverse()
+
+        # Don't open the prompt with an assistant reply cut off from its question
+        if kept and kept[0]["role"] == "assistant":
+            kept = kept[1:]
+        return result + kept
+
+    def token_count(self):
+        """Estimated tokens currently stored (summary + all turns)."""
+        with self._lock:
+            return self._total_tokens()
+
+    def clear(self):
+        """Forget the whole conversation."""
+        with self._lock:
+            self._turns.clear()
+            self._summary = ""
+            self._generation += 1
+
+    def __len__(self):
+        with self._lock:
+            return len(self._turns)
+
+    def _total_tokens(self):
+        """Stored tokens — call with the lock held."""
+        total = sum(message_tokens(m) for m in self._turns)
+        if self._summary:
+            total += estimate_tokens(self._summary) + _MESSAGE_OVERHEAD
+        return total
+
+    def _start_compaction(self):
+        """Hand the oldest turns to a background summarizer (one at a time)."""
+        with self._lock:
+            if self._compacting or len(self._turns) <= self.keep_recent:
+                return
+            old = list(self._turns[:len(self._turns) - self.keep_recent])
+            summary = self._summary
+            generation = self._generation
+            self._compacting = True
+        threading.Thread(target=self._compact, args=(old, summary, generation), daemon=True).start()
+
+    def _compact(self, old, summary, generation):
+        new_summary = None
+        if self._summarize:
+            try:
+                new_summary = self._summarize(summary, old)
+            except Exception as e:
+                print(f"History summary failed: {e}")
+
+        with self._lock:
+            self._compacting = False
+            if generation != self._generation:
+                return
+            # Turns are only ever appended, so the compacted ones are still at the front
+            del self._turns[:len(old)]
+            if new_summary:
+                self._summary = new_summary.strip()
+            # Turns added while we were summarizing may have pushed us over again
+            over_budget = self._total_tokens() > self.token_budget
+        if over_budget:
+            self._start_compaction()
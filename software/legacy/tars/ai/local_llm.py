@@ -2,8 +2,18 @@
 
 Requires Ollama running locally: https://ollama.ai
 Default model: phi3 (small, fast, runs on Pi 5 with 8GB RAM)
+
+Loading a model takes many seconds on a Pi, so the model is warmed up in the
+background at startup, every request asks Ollama to keep it resident for
+local_llm.keep_alive, and a keep-warm ping refreshes that while TARS is
+awake. Connections are pooled and kept alive.
 """
 
+import json
+import threading
+import time
+
+import aiohttp
 import requests
 
 from tars import config
@@ -11,22 +21,40 @@ from tars import config
 _ollama_available = False
 _base_url = "http://localhost:11434"
 _model = "phi3"
+_keep_alive = "30m"
+_keep_warm_interval = 300
+
+# Pooled sessions — reuse the TCP connection to Ollama across calls.
+# Chat traffic uses the async session on the AI event loop (see tars.ai.chat);
+# the sync one handles startup checks, health probes and keep-warm pings.
+_session = requests.Session()
+_http = None
+
+# Keep-warm state — pings only while awake and idle
+_awake = threading.Event()
+_awake.set()
+_last_used = 0.0
+_keep_warm_thread = None
 
 
 def initialize():
-    """Check if Ollama is running and the model is available."""
-    global _ollama_available, _base_url, _model
+    """Check if Ollama is running and the model is available, then warm it up."""
+    global _ollama_available, _base_url, _model, _keep_alive, _keep_warm_interval
 
     _base_url = config.get("local_llm.base_url", "http://localhost:11434")
     _model = config.get("local_llm.model", "phi3")
+    _keep_alive = config.get("local_llm.keep_alive", "30m")
+    _keep_warm_interval = config.get("local_llm.keep_warm_interval", 300)
 
     try:
-        resp = requests.get(f"{_base_url}/api/tags", timeout=2)
+        resp = _session.get(f"{_base_url}/api/tags", timeout=2)
         if resp.status_code == 200:
             models = [m["name"] for m in resp.json().get("models", [])]
             # Check if our model (or a variant like "phi3:latest") is available
             if any(_model in m for m in models):
                 _ollama_available = True
+                threading.Thread(target=warm_up, daemon=True).start()
+                _start_keep_warm()
                 return
             print(f"Ollama running but model '{_model}' not found. "
                   f"Run: ollama pull {_model}")
@@ -43,35 +71,171 @@ def is_available():
     return _ollama_available
 
 
-def get_response(user_input, honesty=0.5, humor=0.5, target_language="english"):
+def ping():
+    """Cheap health check — True if the Ollama server answers."""
+    try:
+        return _session.get(f"{_base_url}/api/tags", timeout=2).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def warm_up():
+    """Load the model into memory (an empty generate request) and keep it resident.
+
+    Returns True if Ollama accepted the request.
+    """
+    global _last_used
+    try:
+        resp = _session.post(
+            f"{_base_url}/api/generate",
+            json={"model": _model, "prompt": "", "keep_alive": _keep_alive},
+            timeout=120,
+        )
+        _last_used = time.monotonic()
+        return resp.status_code == 200
+    except requests.RequestException as e:
+        print(f"Local LLM warm-up failed: {e}")
+        return False
+
+
+def set_awake(awake):
+    """Enable keep-warm pings while TARS is awake; let the model unload while asleep."""
+    if awake:
+        _awake.set()
+    else:
+        _awake.clear()
+
+
+def _start_keep_warm():
+    """Start the keep-warm thread once, if an interval is configured."""
+    global _keep_warm_thread
+    if _keep_warm_thread is not None or not _keep_warm_interval:
+        return
+    _keep_warm_thread = threading.Thread(target=_keep_warm_loop, daemon=True)
+    _keep_warm_thread.start()
+
+
+def _keep_warm_loop():
+    """Re-warm the model after each idle interval while TARS is awake."""
+    while True:
+        time.sleep(_keep_warm_interval)
+        idle = time.monotonic() - _last_used
+        if _ollama_available and _awake.is_set() and idle >= _keep_warm_interval:
+            warm_up()
+
+
+async def get_response_async(user_input, honesty=0.5, humor=0.5, target_language="english"):
     """Get a response from the local LLM via Ollama."""
     if not _ollama_available:
         return None
+    payload = _build_payload(user_input, honesty, humor, target_language, stream=False)
+    return await _post_chat(payload, timeout=30)
 
-    system_prompt = (
-        f"You are TARS, the sarcastic robot from Interstellar. "
-        f"Respond with one-liners filled with sarcasm. "
-        f"Honesty: {honesty * 100}%, humor: {humor * 100}%. "
-        f"Respond in {target_language}. Keep responses short (1-2 sentences)."
-    )
 
+async def complete_async(messages, max_tokens=100):
+    """Run a raw chat completion with caller-supplied messages (no TARS persona).
+
+    Used for background work like summarizing history. Returns None on failure.
+    """
+    if not _ollama_available:
+        return None
+    payload = {
+        "model": _model,
+        "messages": messages,
+        "stream": False,
+        "keep_alive": _keep_alive,
+        "options": {"num_predict": max_tokens},
+    }
+    return await _post_chat(payload, timeout=60)
+
+
+async def get_response_stream_async(user_input, honesty=0.5, humor=0.5, target_language="english"):
+    """Stream a response from the local LLM via Ollama, yielding text chunks.
+
+    Ollama streams newline-delimited JSON objects, one per token batch.
+    Yields nothing if Ollama is unavailable or fails before the first token;
+    a failure after it is raised.
+    """
+    global _last_used
+    if not _ollama_available:
+        return
+
+    _last_used = time.monotonic()
+    produced = False
     try:
-        resp = requests.post(
+        async with _get_http().post(
             f"{_base_url}/api/chat",
-            json={
-                "model": _model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_input},
-                ],
-                "stream": False,
-                "options": {"num_predict": 100},
-            },
-            timeout=30,
-        )
-        if resp.status_code == 200:
-            content = resp.json().get("message", {}).get("content", "").strip()
-            return content if content else None
+            json=_build_payload(user_input, honesty, humor, target_language, stream=True),
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as resp:
+            if resp.status != 200:
+                return
+            async for line in resp.content:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                content = data.get("message", {}).get("content", "")
+                if content:
+                    produced = True
+                    yield content
+                if data.get("done"):
+                    break
+    except Exception as e:
+        print(f"Local LLM error: {e}")
+        if produced:
+            raise
+
+
+def _get_http():
+    """Shared aiohttp session — created on the caller's event loop on first use."""
+    global _http
+    if _http is None or _http.closed:
+        _http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=300))
+    return _http
+
+
+async def close_async():
+    """Close the shared aiohttp session (on the loop that created it)."""
+    global _http
+    if _http is not None:
+        await _http.close()
+        _http = None
+
+
+async def _post_chat(payload, timeout):
+    """POST a non-streaming /api/chat request; return the stripped reply or None."""
+    global _last_used
+    _last_used = time.monotonic()
+    try:
+        async with _get_http().post(
+            f"{_base_url}/api/chat",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            if resp.status == 200:
+                data = json.loads(await resp.text())
+                content = data.get("message", {}).get("content", "").strip()
+                return content if content else None
     except Exception as e:
         print(f"Local LLM error: {e}")
     return None
+
+
+def _build_payload(user_input, honesty, humor, target_language, stream):
+    """Build the /api/chat request body."""
+    system_prompt = (
+        f"You are TARS, the sarcastic robot from Interstellar. "
+        f"Respond with one-liners filled with sarcasm. "
+        f"Honesty: {honesty * 100}%, humor: {humor * 100}%. "
+        f"Respond in {target_language}. Keep responses short (1-2 sentences)."
+    )
+    return {
+        "model": _model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_input},
+        ],
+        "stream": stream,
+        "keep_alive": _keep_alive,
+        "options": {"num_predict": 100},
+    }
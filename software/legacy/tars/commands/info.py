@@ -5,9 +5,9 @@ import requests
 from tars import config
 
 
-def get_current_time():
+def get_current_time(now=None):
     """Get current time in TARS style."""
-    now = datetime.now()
+    now = now or datetime.now()
     return now.strftime("It's about time you asked! It's %I:%M %p.")
 
 
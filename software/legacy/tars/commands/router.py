@@ -1,10 +1,54 @@
+import queue
 import time
+from concurrent.futures import Future
+from datetime import datetime
 
-from tars.ai import chat
+from tars import config
+from tars.ai import acks, chat
 from tars.commands import info, language, movement, settings
 from tars.hardware import camera
 from tars.ui import terminal
-from tars.voice import speaker
+from tars.utils.text import pop_sentences
+from tars.voice import clips, playback, speaker
+
+# Fixed lines TARS speaks — pre-rendered by `main.py --prerender-speech`
+_NO_CAMERA = "My eyes are offline. No camera detected."
+_LOOKING = "Let me take a look..."
+_NO_CAMERA_COUNT = "I can't see anyone — no camera."
+_NO_DETECTION = "My detection system is offline. I need ultralytics installed."
+_NOBODY_SEEN = "I don't see anyone. Either I'm alone, or everyone's hiding."
+_ONE_PERSON = "I see one person. Just you and me, I guess."
+_NO_CAMERA_GREET = "I can't see anyone to greet."
+_NOBODY_TO_GREET = "There's nobody here to greet. Awkward."
+FIXED_PHRASES = (
+    _NO_CAMERA, _LOOKING, _NO_CAMERA_COUNT, _NO_DETECTION,
+    _NOBODY_SEEN, _ONE_PERSON, _NO_CAMERA_GREET, _NOBODY_TO_GREET,
+)
+
+# Movement phrases -> controller command (tars.commands.movement function), first match wins.
+# The local keyword recognizer (tars.voice.keywords) acts on these without waiting for full STT.
+MOVEMENT_COMMANDS = {
+    "move forward": "move_forward",
+    "take 2 steps": "move_forward",
+    "turn left": "turn_left",
+    "turn right": "turn_right",
+}
+# Controller command -> acknowledgement prompt
+_MOVEMENT_PROMPTS = {
+    "move_forward": "Moving forward",
+    "turn_left": "Turning left",
+    "turn_right": "Turning right",
+    "neutral": "Neutral position",
+}
+
+
+def command_phrases():
+    """Whole phrases process_command acts on by keyword — the keyword recognizer's grammar."""
+    return [
+        *MOVEMENT_COMMANDS,
+        *(f"speak {lang}" for lang in language.get_supported_languages()),
+        "stop", "exit", "quit", "how many people", "greet everyone",
+    ]
 
 
 def _is_vision_command(cmd):
@@ -20,20 +64,120 @@ def _is_vision_command(cmd):
     return any(phrase in cmd for phrase in vision_phrases)
 
 
-def _respond(text, lang, text_only=False):
+def _respond(text, lang, text_only=False, priority=playback.NORMAL, preempt=False):
     """Print response to terminal and speak it (unless text-only mode).
 
-    Speech is always non-blocking — plays in background so the voice
+    Speech is always non-blocking — it is queued for playback so the voice
     pipeline can immediately start listening for the next command.
+    Acknowledgements and error lines go out as playback.URGENT, ahead of
+    any chat reply still waiting to play.
     """
     terminal.print_tars(text)
     if not text_only:
         try:
-            speaker.speak(text, lang, blocking=False)
+            speaker.speak(text, lang, blocking=False, priority=priority, preempt=preempt)
         except Exception as e:
             terminal.print_error(f"Speech error: {e}")
 
 
+def _respond_time(lang, text_only=False):
+    """Tell the time — spoken from the pre-rendered clip bank when it's ready."""
+    now = datetime.now()
+    response = info.get_current_time(now)
+    if text_only:
+        _respond(response, lang, text_only)
+        return
+    try:
+        if clips.speak_time(now, lang):
+            terminal.print_tars(response)
+            return
+    except Exception as e:
+        terminal.print_error(f"Speech error: {e}")
+    _respond(response, lang, text_only)
+
+
+def _start_ack(prompt, state):
+    """Start the reply to a canned prompt; returns a Future.
+
+    Resolved immediately from the ack pool when possible, otherwise the AI
+    request runs in the background so it can overlap with servo motion.
+    """
+    response = acks.take(
+        prompt,
+        honesty=state.honesty,
+        humor=state.humor,
+        target_language=state.current_language,
+    )
+    if response is not None:
+        future = Future()
+        future.set_result(response)
+        return future
+    return chat.submit_response(
+        prompt,
+        honesty=state.honesty,
+        humor=state.humor,
+        target_language=state.current_language,
+    )
+
+
+def _ack_response(prompt, state):
+    """Reply to a canned prompt — instantly from the ack pool when possible."""
+    return _start_ack(prompt, state).result()
+
+
+def refresh_acks(state):
+    """Personality changed (or starting up) — pool acknowledgements for the current settings."""
+    acks.clear()
+    acks.prefill(state.honesty, state.humor, state.current_language)
+
+
+def _respond_stream(chunks, lang, text_only=False):
+    """Print and speak a streamed AI response while it is still generating.
+
+    The first complete sentence goes to the terminal as soon as it arrives;
+    the remainder is printed once generation finishes. Every sentence is
+    handed to the speaker the moment it is complete, so TTS renders each
+    one while the previous plays.
+
+    Returns the full response text.
+    """
+    segments = None
+    if not text_only:
+        segments = queue.Queue()
+        try:
+            speaker.speak_stream(iter(segments.get, None), lang, blocking=False)
+        except Exception as e:
+            terminal.print_error(f"Speech error: {e}")
+            segments = None
+
+    full_text = ""
+    first_len = 0
+    pending = ""  # text not yet sent to the speaker
+    for chunk in chunks:
+        full_text += chunk
+        pending += chunk
+        sentences, pending = pop_sentences(pending)
+        if sentences and not first_len:
+            first_len = full_text.index(sentences[0]) + len(sentences[0])
+            terminal.print_tars(sentences[0])
+        if segments is not None:
+            for sentence in sentences:
+                segments.put(sentence)
+
+    rest = full_text[first_len:].strip()
+    if rest:
+        if first_len:
+            terminal.print_tars_continued(rest)
+        else:
+            terminal.print_tars(rest)
+    if segments is not None:
+        if pending.strip():
+            segments.put(pending.strip())
+        segments.put(None)
+
+    return full_text.strip()
+
+
 def process_command(command, state):
     """Route a voice/text command to the appropriate handler.
 
@@ -49,62 +193,26 @@ def process_command(command, state):
         for lang in language.get_supported_languages():
             if lang in cmd:
                 state.current_language = lang
-                response = chat.get_response(
-                    "Confirm language change",
-                    honesty=state.honesty,
-                    humor=state.humor,
-                    target_language=state.current_language,
-                )
-                _respond(response, state.current_language, state.text_only)
+                response = _ack_response("Confirm language change", state)
+                acks.prefill(state.honesty, state.humor, lang)
+                _respond(response, state.current_language, state.text_only, playback.URGENT)
                 return state
 
     # Movement commands
-    if "move forward" in cmd or "take 2 steps" in cmd:
-        movement.move_forward(state.current_language)
-        response = chat.get_response(
-            "Moving forward",
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
-        _respond(response, state.current_language, state.text_only)
-
-    elif "turn left" in cmd:
-        movement.turn_left(state.current_language)
-        response = chat.get_response(
-            "Turning left",
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
-        _respond(response, state.current_language, state.text_only)
-
-    elif "turn right" in cmd:
-        movement.turn_right(state.current_language)
-        response = chat.get_response(
-            "Turning right",
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
-        _respond(response, state.current_language, state.text_only)
+    phrase = next((phrase for phrase in MOVEMENT_COMMANDS if phrase in cmd), None)
+    if phrase:
+        _move(MOVEMENT_COMMANDS[phrase], state)
 
     # Shutdown
     elif "stop" in cmd or cmd in ("exit", "quit"):
-        response = chat.get_response(
-            "Goodbye",
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
-        _respond(response, state.current_language, state.text_only)
+        response = _ack_response("Goodbye", state)
+        _respond(response, state.current_language, state.text_only, playback.URGENT, preempt=True)
         time.sleep(1)
         return "stop"
 
     # Info commands
     elif "time" in cmd or "date" in cmd:
-        response = info.get_current_time()
-        _respond(response, state.current_language, state.text_only)
+        _respond_time(state.current_language, state.text_only)
 
     elif "weather" in cmd:
         response = info.get_weather()
@@ -113,44 +221,45 @@ def process_command(command, state):
     # Settings commands
     elif "set humor" in cmd or "humor to" in cmd:
         response = settings.set_humor(cmd, state)
+        refresh_acks(state)
         _respond(response, state.current_language, state.text_only)
 
     elif "set honesty" in cmd or "honesty to" in cmd:
         response = settings.set_honesty(cmd, state)
+        refresh_acks(state)
         _respond(response, state.current_language, state.text_only)
 
     # Camera / vision commands
     elif _is_vision_command(cmd):
         if not camera.is_available():
-            _respond("My eyes are offline. No camera detected.", state.current_language, state.text_only)
+            _respond(_NO_CAMERA, state.current_language, state.text_only, playback.URGENT)
         else:
-            _respond("Let me take a look...", state.current_language, state.text_only)
+            _respond(_LOOKING, state.current_language, state.text_only, playback.URGENT)
             response = camera.describe_scene()
             _respond(response, state.current_language, state.text_only)
 
     elif "how many people" in cmd:
         if not camera.is_available():
-            _respond("I can't see anyone — no camera.", state.current_language, state.text_only)
+            _respond(_NO_CAMERA_COUNT, state.current_language, state.text_only, playback.URGENT)
         elif not camera.is_yolo_available():
-            msg = "My detection system is offline. I need ultralytics installed."
-            _respond(msg, state.current_language, state.text_only)
+            _respond(_NO_DETECTION, state.current_language, state.text_only, playback.URGENT)
         else:
             count = camera.count_people()
             if count == 0:
-                response = "I don't see anyone. Either I'm alone, or everyone's hiding."
+                response = _NOBODY_SEEN
             elif count == 1:
-                response = "I see one person. Just you and me, I guess."
+                response = _ONE_PERSON
             else:
                 response = f"I count {count} people. That's {count} more than I'd prefer."
             _respond(response, state.current_language, state.text_only)
 
     elif "greet everyone" in cmd:
         if not camera.is_available() or not camera.is_yolo_available():
-            _respond("I can't see anyone to greet.", state.current_language, state.text_only)
+            _respond(_NO_CAMERA_GREET, state.current_language, state.text_only, playback.URGENT)
         else:
             count = camera.count_people()
             if count == 0:
-                response = "There's nobody here to greet. Awkward."
+                response = _NOBODY_TO_GREET
             elif count == 1:
                 response = chat.get_response(
                     "Greet one person you see standing in front of you",
@@ -168,6 +277,15 @@ def process_command(command, state):
             _respond(response, state.current_language, state.text_only)
 
     # Default — chat with AI
+    elif config.AI_STREAM:
+        chunks = chat.get_response_stream(
+            command,
+            honesty=state.honesty,
+            humor=state.humor,
+            target_language=state.current_language,
+        )
+        _respond_stream(chunks, state.current_language, state.text_only)
+
     else:
         response = chat.get_response(
             command,
@@ -180,38 +298,26 @@ def process_command(command, state):
     return state
 
 
+def _move(command, state):
+    """Run a movement, with its acknowledgement generated while the servos move."""
+    pending = _start_ack(_MOVEMENT_PROMPTS[command], state)
+    getattr(movement, command)(state.current_language)
+    response = pending.result()
+    _respond(response, state.current_language, state.text_only, playback.URGENT)
+
+
 def process_controller_command(command, state):
     """Route a controller button press to the appropriate handler.
 
     Returns the updated state, or "stop" to signal shutdown.
     """
-    handlers = {
-        "move_forward": lambda: movement.move_forward(state.current_language),
-        "turn_left": lambda: movement.turn_left(state.current_language),
-        "turn_right": lambda: movement.turn_right(state.current_language),
-        "neutral": lambda: movement.neutral(state.current_language),
-    }
-
     if command == "stop":
-        response = chat.get_response(
-            "Goodbye",
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
-        _respond(response, state.current_language, state.text_only)
+        response = _ack_response("Goodbye", state)
+        _respond(response, state.current_language, state.text_only, playback.URGENT, preempt=True)
         time.sleep(1)
         return "stop"
 
-    handler = handlers.get(command)
-    if handler:
-        handler()
-        response = chat.get_response(
-            command.replace("_", " ").title(),
-            honesty=state.honesty,
-            humor=state.humor,
-            target_language=state.current_language,
-        )
-        _respond(response, state.current_language, state.text_only)
+    if command in _MOVEMENT_PROMPTS:
+        _move(command, state)
 
     return state
@@ -65,6 +65,19 @@ SETTLE_DELAY = get("movement.settle_delay", 0.4)
 
 # Voice
 LISTEN_TIMEOUT = get("voice.listen_timeout", 3)
+MIC_BUFFER_SECONDS = get("voice.mic.buffer_seconds", 30)
+MIC_PREROLL = get("voice.mic.preroll", 0.3)
+VAD_ENABLED = get("voice.vad.enabled", True)
+VAD_AGGRESSIVENESS = get("voice.vad.aggressiveness", 2)
+VAD_MIN_HANGOVER = get("voice.vad.min_hangover", 0.3)
+VAD_MAX_HANGOVER = get("voice.vad.max_hangover", 0.8)
+STT_ENGINE = get("voice.stt.engine", "auto")
+VOSK_MODEL = get("voice.stt.vosk_model", "")
+STT_RACE = get("voice.stt.race", True)
+STT_MIN_CONFIDENCE = get("voice.stt.min_confidence", 0.8)
+STT_DEADLINE = get("voice.stt.deadline", 3.0)
+KEYWORDS_ENABLED = get("voice.keywords.enabled", True)
+KEYWORD_MIN_CONFIDENCE = get("voice.keywords.min_confidence", 0.85)
 SPEECH_RATE = get("voice.speech_rate", "-10%")
 SPEECH_PITCH = get("voice.speech_pitch", "-20Hz")
 PLAYBACK_SPEED = get("voice.playback_speed", 1.2)
@@ -72,12 +85,49 @@ LOW_PASS_FILTER = get("voice.low_pass_filter", 3000)
 HIGH_PASS_FILTER = get("voice.high_pass_filter", 300)
 VOLUME_REDUCTION = get("voice.volume_reduction", 3)
 VOLUME_BOOST = get("voice.volume_boost", 8)
+TTS_CACHE_ENABLED = get("voice.cache.enabled", True)
+TTS_CACHE_DIR = get("voice.cache.dir", "~/.cache/tars/tts")
+TTS_CACHE_MAX_MB = get("voice.cache.max_mb", 100)
+AUDIO_OUTPUT_BACKEND = get("voice.output.backend", "auto")
+AUDIO_BUFFER_MS = get("voice.output.buffer_ms", 20)
+TTS_ENGINE = get("voice.tts.engine", "edge")
+TTS_TIMEOUT = get("voice.tts.timeout", 2.0)
+LOCAL_TTS_ENGINE = get("voice.tts.local", "auto")
+PIPER_MODEL = get("voice.tts.piper_model", "")
+CLIP_BANK_ENABLED = get("voice.clips.enabled", True)
+CLIP_CROSSFADE_MS = get("voice.clips.crossfade_ms", 15)
 
 # AI
 CEREBRAS_MODEL = get("ai.cerebras_model", "llama3.1-8b")
 AI_MODEL = get("ai.model", "gpt-4o-mini")
 AI_MAX_TOKENS = get("ai.max_tokens", 60)
 AI_TEMPERATURE = get("ai.temperature", 0.9)
+AI_STREAM = get("ai.stream", True)
+AI_TIMEOUT = get("ai.timeout", 10)
+AI_HISTORY_TOKEN_BUDGET = get("ai.history.token_budget", 1000)
+AI_HISTORY_KEEP_RECENT = get("ai.history.keep_recent", 6)
+AI_HISTORY_SUMMARY_MAX_TOKENS = get("ai.history.summary_max_tokens", 150)
+AI_HEDGE_ENABLED = get("ai.hedge.enabled", False)
+AI_HEDGE_PERCENTILE = get("ai.hedge.percentile", 95)
+AI_HEDGE_DEFAULT_DELAY = get("ai.hedge.default_delay", 1.5)
+AI_HEDGE_MIN_DELAY = get("ai.hedge.min_delay", 0.3)
+AI_HEDGE_MAX_DELAY = get("ai.hedge.max_delay", 3.0)
+AI_BREAKER_WINDOW = get("ai.circuit_breaker.window", 20)
+AI_BREAKER_ERROR_RATE = get("ai.circuit_breaker.error_rate", 0.5)
+AI_BREAKER_CONSECUTIVE_FAILURES = get("ai.circuit_breaker.consecutive_failures", 3)
+AI_BREAKER_COOLDOWN = get("ai.circuit_breaker.cooldown", 30)
+ACK_POOL_ENABLED = get("ai.ack_pool.enabled", True)
+ACK_POOL_SIZE = get("ai.ack_pool.size", 3)
+ACK_POOL_LOW_WATER = get("ai.ack_pool.low_water", 1)
+ACK_POOL_BUCKET = get("ai.ack_pool.bucket", 25)
+AI_CACHE_ENABLED = get("ai.cache.enabled", False)
+AI_CACHE_SIMILARITY = get("ai.cache.similarity", 0.85)
+AI_CACHE_TTL = get("ai.cache.ttl", 3600)
+AI_CACHE_MAX_ENTRIES = get("ai.cache.max_entries", 256)
+AI_CACHE_BUCKET = get("ai.cache.bucket", 25)
+AI_CONN_WARM_UP = get("ai.connections.warm_up", True)
+AI_CONN_KEEP_ALIVE_INTERVAL = get("ai.connections.keep_alive_interval", 45)
+AI_CONN_KEEPALIVE_EXPIRY = get("ai.connections.keepalive_expiry", 120)
 
 # Personality
 DEFAULT_HUMOR = get("personality.humor", 50)
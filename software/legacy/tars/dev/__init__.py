@@ -0,0 +1 @@
+"""Developer tools for TARS — stub servers and benchmarks. Not used at runtime."""
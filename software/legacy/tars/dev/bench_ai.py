@@ -0,0 +1,145 @@
+"""AI layer latency benchmark — tars.ai.chat end to end against local stub servers.
+
+Each scenario points chat at one or more stub servers (see
+tars.dev.stub_server) with their own latency, error rate and token rate,
+sends a series of requests through the public sync API and reports
+p50/p95/p99 of end-to-end latency (and time-to-first-chunk when streaming).
+
+    python -m tars.dev.bench_ai                    # all scenarios, 30 requests each
+    python -m tars.dev.bench_ai fallback -n 100    # one scenario
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from tars import config
+from tars.ai import chat, local_llm
+from tars.dev.stub_server import Latency, Profile, StubServer
+
+SCENARIOS = {
+    # Healthy Cerebras, streamed — the everyday path
+    "stream": {
+        "cerebras": Profile(ttfb=Latency.lognormal(0.15, 0.4), tokens_per_second=80),
+        "stream": True,
+    },
+    # Cerebras failing a third of the time — OpenAI picks up, the breaker may open
+    "fallback": {
+        "cerebras": Profile(ttfb=Latency.lognormal(0.15, 0.4), error_rate=0.3),
+        "openai": Profile(ttfb=Latency.lognormal(0.4, 0.4)),
+        "stream": False,
+    },
+    # Cerebras sometimes slower than the request timeout
+    "timeout": {
+        "cerebras": Profile(ttfb=Latency.uniform(0.1, 2.0)),
+        "openai": Profile(ttfb=Latency.lognormal(0.4, 0.4)),
+        "timeout": 1.0,
+        "stream": True,
+    },
+    # No internet — local Ollama only, slow token rate like a Pi
+    "offline": {
+        "ollama": Profile(ttfb=Latency.lognormal(0.5, 0.3), tokens_per_second=15),
+        "stream": True,
+    },
+}
+
+
+def percentiles(samples):
+    """Return (p50, p95, p99) of a list of seconds, or Nones if empty."""
+    if not samples:
+        return None, None, None
+    return tuple(float(v) for v in np.percentile(samples, [50, 95, 99]))
+
+
+def _wire(servers):
+    """Point chat at the given stub servers, with fresh breakers and history."""
+    def cloud(name):
+        server = servers.get(name)
+        if server is None:
+            return None
+        return chat._new_cloud_client(name, "stub", f"{server.url}/v1")
+
+    chat._cerebras_client = cloud("cerebras")
+    chat._cerebras_available = chat._cerebras_client is not None
+    chat._openai_client = cloud("openai")
+    chat._openai_available = chat._openai_client is not None
+    if "ollama" in servers:
+        local_llm._base_url = servers["ollama"].url
+    local_llm._ollama_available = "ollama" in servers
+    chat._breakers = chat._new_breakers()
+    chat._history.clear()
+
+
+def run_scenario(name, requests=30, seed=0):
+    """Run one scenario; returns a dict of latency percentiles and counts."""
+    scenario = SCENARIOS[name]
+    servers = {
+        backend: StubServer(scenario[backend], seed=seed + i).start()
+        for i, backend in enumerate(("cerebras", "openai", "ollama"))
+        if backend in scenario
+    }
+    # The benchmark drives chat directly — don't let the cache or history skew it
+    config.AI_CACHE_ENABLED = False
+    config.AI_TIMEOUT = scenario.get("timeout", config.AI_TIMEOUT)
+    _wire(servers)
+
+    totals, firsts, failures = [], [], 0
+    failure = chat._failure_message()
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            if scenario["stream"]:
+                first = None
+                parts = []
+                for chunk in chat.get_response_stream(f"Benchmark question {i}"):
+                    if first is None:
+                        first = time.perf_counter() - start
+                    parts.append(chunk)
+                response = "".join(parts)
+                firsts.append(first)
+            else:
+                response = chat.get_response(f"Benchmark question {i}")
+            totals.append(time.perf_counter() - start)
+            failures += response == failure
+            chat._history.clear()
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    return {
+        "scenario": name,
+        "requests": requests,
+        "failures": failures,
+        "total": percentiles(totals),
+        "first_chunk": percentiles(firsts),
+        "backend_requests": {backend: server.requests for backend, server in servers.items()},
+        "health": chat.get_health(),
+    }
+
+
+def _fmt(values):
+    return "  ".join(f"{v * 1000:7.0f}" if v is not None else "      -" for v in values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tars.ai.chat against local stub servers")
+    parser.add_argument("scenarios", nargs="*", help=f"Any of: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("-n", "--requests", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    print(f"{'scenario':<10} {'fail':>4}  {'total p50/p95/p99 (ms)':>25}  {'first chunk p50/p95/p99':>25}  backends")
+    for name in args.scenarios or SCENARIOS:
+        result = run_scenario(name, args.requests, args.seed)
+        backends = ", ".join(f"{b}={n}" for b, n in result["backend_requests"].items())
+        print(f"{name:<10} {result['failures']:>4}  {_fmt(result['total']):>25}  "
+              f"{_fmt(result['first_chunk']):>25}  {backends}")
+    chat._loop.run(local_llm.close_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Voice effect microbenchmark — NumPy chain (tars.voice.dsp) vs the old pydub chain.
+
+Runs both on the same synthetic voice-like signal with the configured
+effect settings, reports the median time of each and how closely the
+outputs agree.
+
+    python -m tars.dev.bench_dsp                # 4 s of audio at 24 kHz
+    python -m tars.dev.bench_dsp --seconds 10 --rate 48000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pydub import AudioSegment, effects
+
+from tars import config
+from tars.voice import dsp
+
+
+def synth_voice(seconds, rate, seed=0):
+    """A buzzy, amplitude-modulated tone with noise — roughly speech-shaped."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    voiced = np.sign(np.sin(2 * np.pi * 120 * t)) * 4000 + 3000 * np.sin(2 * np.pi * 700 * t)
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)
+    noise = 800 * rng.standard_normal(len(t))
+    return np.clip(voiced * envelope + noise, -32768, 32767).astype(np.int16)
+
+
+def pydub_chain(samples, rate):
+    """The effect chain speaker.modify_voice used before tars.voice.dsp."""
+    sound = AudioSegment(samples.tobytes(), sample_width=2, frame_rate=rate, channels=1)
+    sound = effects.speedup(sound, playback_speed=config.PLAYBACK_SPEED)
+    if config.HIGH_PASS_FILTER:
+        sound = sound.high_pass_filter(config.HIGH_PASS_FILTER)
+    sound = effects.low_pass_filter(sound, config.LOW_PASS_FILTER)
+    sound = sound - config.VOLUME_REDUCTION
+    sound = sound + config.VOLUME_BOOST
+    return np.array(sound.get_array_of_samples(), dtype=np.int16)
+
+
+def _median_ms(fn, repeats):
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy voice effects against pydub")
+    parser.add_argument("--seconds", type=float, default=4.0)
+    parser.add_argument("--rate", type=int, default=24000, help="edge-tts produces 24 kHz")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = synth_voice(args.seconds, args.rate)
+    pydub_ms, reference = _median_ms(lambda: pydub_chain(samples, args.rate), args.repeats)
+    numpy_ms, output = _median_ms(lambda: dsp.apply(samples, args.rate), args.repeats)
+
+    n = min(len(reference), len(output))
+    correlation = np.corrcoef(reference[:n].astype(float), output[:n].astype(float))[0, 1]
+    print(f"{args.seconds:.1f} s at {args.rate} Hz, speed {config.PLAYBACK_SPEED}, "
+          f"band {config.HIGH_PASS_FILTER}-{config.LOW_PASS_FILTER} Hz")
+    print(f"  pydub  {pydub_ms:8.1f} ms  ({len(reference)} samples)")
+    print(f"  numpy  {numpy_ms:8.1f} ms  ({len(output)} samples)  {pydub_ms / numpy_ms:5.1f}x faster")
+    print(f"  output correlation {correlation:.4f}")
+
+
+if __name__ == "__main__":
+    main()
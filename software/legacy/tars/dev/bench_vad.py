@@ -0,0 +1,165 @@
+"""Endpointing benchmark — VAD endpointer (tars.voice.vad) vs SpeechRecognition's energy threshold.
+
+Plays each utterance through both endpointers as if it were arriving from
+the mic and reports, against the true end of speech:
+
+    latency    — how long after the speaker stopped each one let go
+    truncated  — utterances cut off before the speaker had finished
+    missed     — utterances where no speech was detected at all
+
+Recorded WAVs (any rate, mixed to mono) give the real picture. The true
+end of speech comes from a sidecar <file>.wav.txt holding the time in
+seconds, or is estimated from the signal energy. Utterances are played in
+order through one VAD endpointer, so its hangover adapts as it would.
+
+    python -m tars.dev.bench_vad commands/*.wav
+    python -m tars.dev.bench_vad --synthetic 40 --aggressiveness 3
+"""
+
+import argparse
+import math
+import os
+import wave
+
+import numpy as np
+
+from tars import config
+from tars.dev.bench_dsp import synth_voice
+from tars.voice import dsp, vad
+
+RATE = vad.SAMPLE_RATE
+# sr.Recognizer defaults as tars.voice.listener configures them
+_CHUNK = 1024
+_PAUSE_THRESHOLD = 1.2
+_PHRASE_THRESHOLD = 0.3
+_DAMPING = 0.15
+_RATIO = 1.5
+
+
+def energy_endpoint(samples, energy_threshold=300):
+    """Seconds at which SpeechRecognition's listen() would stop, or None if it never heard speech.
+
+    A line-for-line model of Recognizer.listen() with dynamic_energy_threshold:
+    the threshold tracks ambient energy until speech starts, then the phrase
+    ends after pause_threshold of chunks below it.
+    """
+    seconds_per_chunk = _CHUNK / RATE
+    pause_chunks = int(math.ceil(_PAUSE_THRESHOLD / seconds_per_chunk))
+    phrase_chunks = int(math.ceil(_PHRASE_THRESHOLD / seconds_per_chunk))
+    damping = _DAMPING ** seconds_per_chunk
+    chunks = [samples[i:i + _CHUNK] for i in range(0, len(samples) - _CHUNK + 1, _CHUNK)]
+    index = 0
+    while index < len(chunks):
+        # Wait for speech, adapting the threshold to the background
+        while index < len(chunks):
+            energy = _rms(chunks[index])
+            index += 1
+            if energy > energy_threshold:
+                break
+            energy_threshold = energy_threshold * damping + energy * _RATIO * (1 - damping)
+        else:
+            return None
+        # Read until pause_threshold of quiet
+        phrase, pause = 1, 0
+        while index < len(chunks):
+            energy = _rms(chunks[index])
+            index += 1
+            phrase += 1
+            pause = pause + 1 if energy <= energy_threshold else 0
+            if pause > pause_chunks:
+                break
+        if phrase - pause >= phrase_chunks or index >= len(chunks):
+            return index * seconds_per_chunk
+    return None
+
+
+def vad_endpoint(samples, endpointer):
+    """Seconds at which the VAD endpointer decides the utterance is over, or None."""
+    endpointer.reset()
+    for i in range(0, len(samples) - vad.FRAME_SAMPLES + 1, vad.FRAME_SAMPLES):
+        if endpointer.feed(samples[i:i + vad.FRAME_SAMPLES].tobytes()):
+            return endpointer.frames * vad.FRAME_MS / 1000
+    return None
+
+
+def _rms(chunk):
+    return float(np.sqrt(np.mean(chunk.astype(np.float64) ** 2)))
+
+
+def estimate_end(samples):
+    """Last 30 ms frame louder than a tenth of the loudest — a stand-in for a hand label."""
+    frames = samples[:len(samples) // vad.FRAME_SAMPLES * vad.FRAME_SAMPLES].reshape(-1, vad.FRAME_SAMPLES)
+    energy = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    loud = np.flatnonzero(energy > 0.1 * energy.max())
+    return (loud[-1] + 1) * vad.FRAME_MS / 1000 if len(loud) else 0.0
+
+
+def load_wav(path):
+    """(16 kHz int16 mono samples, true end of speech in seconds)."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAVs are supported")
+        rate, channels = wav.getframerate(), wav.getnchannels()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    samples = dsp.Resampler(rate, RATE).process(samples)
+    label = path + ".txt"
+    if os.path.exists(label):
+        with open(label) as f:
+            return samples, float(f.read().split()[0])
+    return samples, estimate_end(samples)
+
+
+def synth_utterance(rng, noise=300):
+    """Two to five 'words' with pauses between, half a second of lead-in and two of trailing silence."""
+    pieces = [np.zeros(int(0.5 * RATE))]
+    for w in range(rng.integers(2, 6)):
+        if w:
+            pieces.append(np.zeros(int(rng.uniform(0.05, 0.4) * RATE)))
+        pieces.append(synth_voice(rng.uniform(0.2, 0.5), RATE, seed=int(rng.integers(1 << 30))) * 0.5)
+    end = sum(len(p) for p in pieces) / RATE
+    pieces.append(np.zeros(2 * RATE))
+    samples = np.concatenate(pieces) + noise * rng.standard_normal(sum(len(p) for p in pieces))
+    return np.clip(samples, -32768, 32767).astype(np.int16), end
+
+
+def _summary(name, results):
+    heard = [(decided, end) for decided, end in results if decided is not None]
+    truncated = sum(decided < end for decided, end in heard)
+    latencies = [decided - end for decided, end in heard if decided >= end]
+    line = f"  {name:7}"
+    if latencies:
+        line += (f"  latency median {np.median(latencies) * 1000:6.0f} ms"
+                 f"  p90 {np.percentile(latencies, 90) * 1000:6.0f} ms")
+    print(f"{line}  truncated {truncated}/{len(results)}  missed {len(results) - len(heard)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VAD endpointing against the energy threshold")
+    parser.add_argument("wavs", nargs="*", help="16-bit WAV recordings, one command each")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N", help="also run N synthetic utterances")
+    parser.add_argument("--aggressiveness", type=int, default=config.VAD_AGGRESSIVENESS, choices=range(4))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not vad.WEBRTCVAD_AVAILABLE:
+        parser.error("webrtcvad is not installed (pip install webrtcvad)")
+    utterances = [load_wav(path) for path in args.wavs]
+    rng = np.random.default_rng(args.seed)
+    utterances += [synth_utterance(rng) for _ in range(args.synthetic or (0 if args.wavs else 30))]
+
+    endpointer = vad.Endpointer(aggressiveness=args.aggressiveness)
+    energy, webrtc = [], []
+    for samples, end in utterances:
+        energy.append((energy_endpoint(samples), end))
+        webrtc.append((vad_endpoint(samples, endpointer), end))
+
+    print(f"{len(utterances)} utterances, aggressiveness {args.aggressiveness}, "
+          f"hangover {endpointer.min_hangover}-{endpointer.max_hangover} s (now {endpointer.hangover():.2f} s)")
+    _summary("energy", energy)
+    _summary("vad", webrtc)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Local stub AI server — OpenAI chat-completions and Ollama /api/chat.
+
+Lets tars.ai be measured under controlled conditions: every response waits
+a time-to-first-byte drawn from a latency distribution, fails with a 500
+at a configurable error rate, and streams its reply at a fixed token rate.
+
+Endpoints:
+    GET  /v1/models               (OpenAI — used for health probes and warm-up)
+    POST /v1/chat/completions     (OpenAI — JSON or SSE streaming)
+    GET  /api/tags                (Ollama — model list)
+    POST /api/generate            (Ollama — warm-up)
+    POST /api/chat                (Ollama — JSON or NDJSON streaming)
+
+Run standalone:  python -m tars.dev.stub_server --port 8800 --ttfb 0.3 --error-rate 0.1
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = "Sarcasm module at seventy-five percent. Ask me something harder next time."
+
+
+class Latency:
+    """A latency distribution in seconds."""
+
+    def __init__(self, kind="fixed", a=0.0, b=0.0):
+        self.kind = kind
+        self.a = a
+        self.b = b
+
+    @classmethod
+    def fixed(cls, seconds):
+        return cls("fixed", seconds)
+
+    @classmethod
+    def uniform(cls, low, high):
+        return cls("uniform", low, high)
+
+    @classmethod
+    def lognormal(cls, median, sigma=0.5):
+        """Long-tailed, like real network latency: median plus occasional slow outliers."""
+        return cls("lognormal", median, sigma)
+
+    def sample(self, rng):
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        return self.a
+
+    def __repr__(self):
+        return f"Latency.{self.kind}({self.a}, {self.b})"
+
+
+class Profile:
+    """How the stub behaves.
+
+    Args:
+        ttfb: Latency before the first byte of every response.
+        tokens_per_second: Rate replies are produced at (0 = instant).
+        error_rate: Fraction of chat requests answered with HTTP 500.
+        reply: Reply text; each word is one streamed token.
+        model: Model name reported to clients.
+    """
+
+    def __init__(self, ttfb=None, tokens_per_second=50.0, error_rate=0.0, reply=DEFAULT_REPLY, model="phi3"):
+        self.ttfb = ttfb or Latency.fixed(0.0)
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.reply = reply
+        self.model = model
+
+    def tokens(self):
+        words = self.reply.split(" ")
+        return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+class StubServer:
+    """Threaded stub server on localhost. Use as a context manager or start()/stop()."""
+
+    def __init__(self, profile=None, host="127.0.0.1", port=0, seed=None):
+        self.profile = profile or Profile()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="tars-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _plan(self):
+        """Draw (ttfb, fail) for one chat request."""
+        with self._rng_lock:
+            self.requests += 1
+            ttfb = self.profile.ttfb.sample(self._rng)
+            fail = self._rng.random() < self.profile.error_rate
+            if fail:
+                self.errors += 1
+        return ttfb, fail
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def stub(self):
+        return self.server.stub
+
+    def do_GET(self):
+        model = self.stub.profile.model
+        if self.path.endswith("/models"):
+            self._send_json({"object": "list", "data": [{"id": model, "object": "model", "owned_by": "stub"}]})
+        elif self.path == "/api/tags":
+            self._send_json({"models": [{"name": f"{model}:latest"}]})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/api/generate":
+            self._send_json({"model": self.stub.profile.model, "response": "", "done": True})
+            return
+        if not (self.path.endswith("/chat/completions") or self.path == "/api/chat"):
+            self._send_json({"error": "not found"}, status=404)
+            return
+
+        try:
+            self._chat(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client gave up (timeout or hedged race) — expected
+
+    def _chat(self, body):
+        ollama = self.path == "/api/chat"
+        ttfb, fail = self.stub._plan()
+        time.sleep(ttfb)
+        if fail:
+            self._send_json({"error": {"message": "stub failure", "type": "server_error"}}, status=500)
+            return
+
+        # Ollama streams unless told not to; OpenAI only when asked
+        stream = body.get("stream", ollama)
+        if ollama:
+            self._ollama_chat(stream)
+        else:
+            self._openai_chat(stream)
+
+    def _openai_chat(self, stream):
+        profile = self.stub.profile
+        if not stream:
+            self._wait_tokens(len(profile.tokens()))
+            self._send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": profile.model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": profile.reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+            return
+
+        def event(delta, finish=None):
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": profile.model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode()
+
+        self._start_chunked("text/event-stream")
+        self._write_chunk(event({"role": "assistant", "content": ""}))
+        for i, token in enumerate(profile.tokens()):
+            if i:
+                self._wait_tokens(1)
+            self._write_chunk(event({"content": token}))
+        self._write_chunk(event({}, finish="stop"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._end_chunked()
+
+    def _ollama_chat(self, stream):
+        profile = self.stub.profile
+        if not stream:
+            self._wait_tokens(len(profile.tokens()))
+            self._send_json({"model": profile.model, "message": {"role": "assistant", "content": profile.reply},
+                             "done": True})
+            return
+
+        self._start_chunked("application/x-ndjson")
+        for i, token in enumerate(profile.tokens()):
+            if i:
+                self._wait_tokens(1)
+            line = {"model": profile.model, "message": {"role": "assistant", "content": token}, "done": False}
+            self._write_chunk(json.dumps(line).encode() + b"\n")
+        done = {"model": profile.model, "message": {"role": "assistant", "content": ""}, "done": True}
+        self._write_chunk(json.dumps(done).encode() + b"\n")
+        self._end_chunked()
+
+    def _wait_tokens(self, count):
+        rate = self.stub.profile.tokens_per_second
+        if rate:
+            time.sleep(count / rate)
+
+    def _send_json(self, data, status=200):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TARS stub AI server (OpenAI + Ollama protocols)")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--ttfb", type=float, default=0.3, help="Median time-to-first-byte in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal spread of the TTFB (0 = fixed)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    ttfb = Latency.lognormal(args.ttfb, args.sigma) if args.sigma else Latency.fixed(args.ttfb)
+    profile = Profile(ttfb=ttfb, tokens_per_second=args.tokens_per_second, error_rate=args.error_rate)
+    server = StubServer(profile, port=args.port).start()
+    print(f"Stub AI server on {server.url} — OpenAI base_url {server.url}/v1, Ollama base_url {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
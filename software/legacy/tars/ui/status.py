@@ -104,6 +104,39 @@ def check_edge_tts():
         return False, "edge-tts not installed"
 
 
+def check_audio_output():
+    """Report the audio output backend, its buffer and measured output latency."""
+    try:
+        from tars.voice import output
+
+        figures = output.latency()
+        if figures is None:
+            return False, "Not open"
+        parts = [f"{figures['rate']} Hz", f"{figures['buffer'] * 1000:.0f} ms buffer"]
+        if figures["measured"] is not None:
+            parts.append(f"{figures['measured'] * 1000:.0f} ms latency")
+        if figures["player_start"] is not None:
+            parts.append(f"player starts in {figures['player_start'] * 1000:.0f} ms")
+        return True, f"{figures['backend']} ({', '.join(parts)})"
+    except Exception:
+        return False, "Not available"
+
+
+def check_speech_recognition():
+    """Report the speech-to-text backends, in the order they're tried."""
+    try:
+        from tars.voice import stt
+
+        names = stt.engines()
+        if not names:
+            return False, "Not started (text-only mode)"
+        offline = " (works offline)" if "vosk" in names else ""
+        joiner = " + " if config.STT_RACE else " → "  # racing, or in fallback order
+        return True, joiner.join(names) + offline
+    except Exception:
+        return False, "Not available"
+
+
 def check_local_llm():
     """Check if Ollama local LLM is available."""
     try:
@@ -115,6 +148,28 @@ def check_local_llm():
         return False, "Not running (optional)"
 
 
+def check_ai_health():
+    """Report circuit breaker state, error rate, p95 latency and connection reuse per AI backend."""
+    try:
+        from tars.ai import chat
+
+        health = chat.get_health()
+        if not health:
+            return False, "No AI backends configured"
+        parts = []
+        for name, snap in health.items():
+            p95 = f"{snap['p95']:.2f}s" if snap["p95"] is not None else "n/a"
+            detail = f"{snap['error_rate']:.0%} errors, p95 {p95}"
+            conns = snap.get("connections")
+            if conns:
+                detail += f", {conns['reused']}/{conns['reused'] + conns['fresh']} conn reused"
+            parts.append(f"{name} {snap['state']} ({detail})")
+        ok = any(snap["state"] != "open" for snap in health.values())
+        return ok, ", ".join(parts)
+    except Exception:
+        return False, "Not available"
+
+
 def check_i2c():
     """Check I2C devices."""
     try:
@@ -149,8 +204,11 @@ def get_all_status():
         "Cerebras AI": check_cerebras(),
         "OpenAI API": check_openai(),
         "Local LLM": check_local_llm(),
+        "AI Health": check_ai_health(),
         "Voice (edge-tts)": check_edge_tts(),
+        "Audio Output": check_audio_output(),
         "Microphone": check_microphone(),
+        "Speech Recognition": check_speech_recognition(),
         "Camera": check_camera(),
         "Weather API": check_weather(),
         "Servo Controller": check_servos(),
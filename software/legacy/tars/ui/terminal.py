@@ -82,11 +82,25 @@ def print_user(text):
     console.print(f"[bold green]H:[/bold green] {text}")
 
 
+def print_partial(text):
+    """Show what's been heard so far on one line, rewritten in place ("" clears it)."""
+    if not console.is_terminal:
+        return
+    line = f"H: {text}…" if text else ""
+    console.print(line.ljust(console.width - 1), style="dim", end="\r", no_wrap=True, overflow="ellipsis",
+                  markup=False, highlight=False)
+
+
 def print_tars(text):
     """Print TARS response."""
     console.print(f"[bold #f8d566]TARS:[/bold #f8d566] {text}")
 
 
+def print_tars_continued(text):
+    """Print the rest of a streamed TARS response, aligned under the first line."""
+    console.print(f"      {text}")
+
+
 def print_system(text):
     """Print system message."""
     console.print(f"[dim]{text}[/dim]")
@@ -0,0 +1,87 @@
+"""Asyncio helpers for TARS — a long-lived event loop on a background thread.
+
+Subsystems that talk to the network asynchronously (AI chat, TTS) own one
+LoopThread each. Synchronous callers (voice pipeline, controller thread,
+Tkinter GUI) submit coroutines to it from any thread and get back
+concurrent futures, so clients and connection pools live on a single loop
+and are reused across calls.
+"""
+
+import asyncio
+import queue
+import threading
+
+_END = object()
+
+
+class LoopThread:
+    """An asyncio event loop running forever on a daemon thread (started lazily)."""
+
+    def __init__(self, name):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The event loop, starting its thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def in_loop_thread(self):
+        """True when called from the loop's own thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block for its result.
+
+        Must not be called from the loop thread itself — that would deadlock.
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(f"{self.name}: blocking call from inside the event loop")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen):
+        """Consume an async generator on the loop as a plain (blocking) generator.
+
+        Closing the returned generator early cancels the async one.
+        """
+        if self.in_loop_thread():
+            raise RuntimeError(f"{self.name}: blocking iteration from inside the event loop")
+        items = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put((item, None))
+            except Exception as e:
+                items.put((None, e))
+            finally:
+                items.put((_END, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item, error = items.get()
+                if error is not None:
+                    raise error
+                if item is _END:
+                    return
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
@@ -0,0 +1,65 @@
+"""Text helpers for TARS — sentence splitting for incremental speech."""
+
+import re
+
+# End of a sentence: Latin punctuation (plus closing quotes/brackets) followed by
+# whitespace, or CJK punctuation which needs no trailing space.
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+|[。！？]+")
+
+
+def pop_sentences(buffer):
+    """Split complete sentences off the front of a growing text buffer.
+
+    A Latin sentence only counts as complete once whitespace follows its
+    punctuation, so "3." in a stream that later continues with "14" is
+    never cut early.
+
+    Returns:
+        (sentences, remainder) — remainder is the unfinished tail.
+    """
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, buffer[start:]
+
+
+def split_sentences(text):
+    """Split finished text into sentences (the trailing fragment included)."""
+    sentences, remainder = pop_sentences(text)
+    if remainder.strip():
+        sentences.append(remainder.strip())
+    return sentences
+
+
+# Clause boundary inside a sentence: comma, semicolon, colon or dash, then whitespace
+_CLAUSE_END = re.compile(r"[,;:—–]\s+|\s+-\s+")
+
+
+def split_clauses(sentence, max_chars):
+    """Cut a long sentence at clause boundaries into pieces of at most ~max_chars.
+
+    Clauses are packed greedily, so short sentences come back whole; a single
+    clause longer than max_chars is left intact rather than cut mid-phrase.
+    """
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces = []
+    current = ""
+    start = 0
+    for match in _CLAUSE_END.finditer(sentence):
+        clause = sentence[start:match.end()]
+        start = match.end()
+        if current and len(current) + len(clause) > max_chars:
+            pieces.append(current.strip())
+            current = ""
+        current += clause
+    clause = sentence[start:]
+    if current and len(current) + len(clause) > max_chars:
+        pieces.append(current.strip())
+        current = ""
+    pieces.append((current + clause).strip())
+    return [p for p in pieces if p]
@@ -0,0 +1,296 @@
+"""Always-on microphone capture for TARS — one stream, one ring buffer, many readers.
+
+The mic is opened once and never closed: a capture thread reads it in
+20 ms chunks and writes 16 kHz 16-bit mono samples into a preallocated
+ring buffer. Wake word detection and speech recognition are readers, each
+with its own cursor into the same audio:
+
+    reader()               — starts at the live edge (minus an optional pre-roll)
+    reader(start=position) — starts at an absolute sample position, e.g.
+                             where the wake word ended, so the words right
+                             after "Hey TARS" are never lost in a handoff
+
+Every write is mirrored into a second copy of the buffer, so any span up
+to the buffer's length is contiguous and Reader.read() hands out a
+memoryview straight into it — no copy. A view stays valid until the
+writer laps it (voice.mic.buffer_seconds); a reader that falls that far
+behind skips ahead to the oldest audio still held and counts the loss.
+
+The mic is opened at 16 kHz when the device allows it, else at its native
+rate with a streaming resampler in the capture thread.
+"""
+
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+from tars import config
+from tars.voice import dsp
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+_CHUNK_SECONDS = 0.02
+
+# Single PyAudio instance — never terminated, keeps device indices stable.
+_pa = None
+_device_index = None
+_device_name = None
+_device_rate = SAMPLE_RATE
+_init_done = False
+
+_ring = None
+_cond = threading.Condition()
+_thread = None
+_running = False
+
+
+class RingBuffer:
+    """Preallocated int16 ring with every sample stored twice, capacity apart.
+
+    Positions are absolute sample counts since the start. Any span of up
+    to `capacity` samples that hasn't been overwritten is available as
+    one contiguous memoryview.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.written = 0  # samples ever written
+        self._data = np.zeros(2 * capacity, dtype=np.int16)
+        self._view = memoryview(self._data)
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype=np.int16)
+        n = len(samples)
+        if n > self.capacity:
+            # Only the newest capacity samples can be kept
+            self.written += n - self.capacity
+            samples = samples[-self.capacity:]
+            n = self.capacity
+        start = self.written % self.capacity
+        first = min(n, self.capacity - start)
+        rest = n - first
+        for offset in (0, self.capacity):
+            self._data[offset + start:offset + start + first] = samples[:first]
+            self._data[offset:offset + rest] = samples[first:]
+        self.written += n
+
+    def oldest(self):
+        """Position of the oldest sample still held."""
+        return max(0, self.written - self.capacity)
+
+    def view(self, start, end):
+        """memoryview of samples [start, end) — both within the held window."""
+        if start < self.oldest() or end > self.written or end - start > self.capacity:
+            raise IndexError(f"samples {start}-{end} are not in the buffer")
+        offset = start % self.capacity
+        return self._view[offset:offset + end - start]
+
+
+class Reader:
+    """An independent cursor over the captured audio."""
+
+    def __init__(self, position):
+        self.position = position
+        self.dropped = 0  # samples skipped because this reader fell behind
+
+    def available(self):
+        with _cond:
+            return _ring.written - self.position if _ring else 0
+
+    def read(self, frames, timeout=None):
+        """Next `frames` samples as a memoryview into the ring (int16 items).
+
+        Blocks until they have been captured. Returns None on timeout, or
+        once capture has stopped without enough audio left.
+        """
+        with _cond:
+            ready = _cond.wait_for(
+                lambda: _ring is not None and (_ring.written >= self.position + frames or not _running),
+                timeout,
+            )
+            if not ready or _ring.written < self.position + frames:
+                return None
+            oldest = _ring.oldest()
+            if self.position < oldest:
+                self.dropped += oldest - self.position
+                self.position = oldest
+            view = _ring.view(self.position, self.position + frames)
+            self.position += frames
+            return view
+
+
+@contextlib.contextmanager
+def _suppress_stderr():
+    """Suppress stderr — silences JACK/ALSA spam from PortAudio."""
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        old_stderr = os.dup(2)
+        os.dup2(devnull, 2)
+        try:
+            yield
+        finally:
+            os.dup2(old_stderr, 2)
+            os.close(devnull)
+            os.close(old_stderr)
+    except OSError:
+        yield
+
+
+def initialize():
+    """Initialize PyAudio ONCE and find the USB microphone.
+
+    Creates a single PyAudio instance that lives for the entire process.
+    This keeps device indices stable — no more "Device index out of range".
+    """
+    global _pa, _device_index, _device_name, _device_rate, _init_done
+
+    if _init_done:
+        return _device_index is not None
+
+    _init_done = True
+    if not PYAUDIO_AVAILABLE:
+        print("Microphone unavailable (pyaudio not installed)")
+        return False
+
+    with _suppress_stderr():
+        try:
+            _pa = pyaudio.PyAudio()
+        except Exception as e:
+            print(f"PyAudio init failed: {e}")
+            return False
+
+        count = _pa.get_device_count()
+
+        # Pass 1: USB/mic-named device with input channels; pass 2: any input device
+        usb_keywords = ("usb", "mic", "input", "capture")
+        for named_only in (True, False):
+            for i in range(count):
+                try:
+                    info = _pa.get_device_info_by_index(i)
+                    if info.get("maxInputChannels", 0) <= 0:
+                        continue
+                    name = info.get("name", "").lower()
+                    if named_only and not any(kw in name for kw in usb_keywords):
+                        continue
+                    _device_index = i
+                    _device_name = info.get("name", f"Device {i}")
+                    _device_rate = int(info.get("defaultSampleRate", SAMPLE_RATE))
+                    print(f"Microphone found: [{i}] {_device_name}")
+                    return True
+                except Exception:
+                    continue
+
+    print("WARNING: No microphone with input channels found!")
+    return False
+
+
+def is_available():
+    return _device_index is not None
+
+
+def _open_stream():
+    """Open the mic at 16 kHz if the device takes it, else at its native rate."""
+    for rate in dict.fromkeys((SAMPLE_RATE, _device_rate)):
+        try:
+            with _suppress_stderr():
+                stream = _pa.open(
+                    input=True,
+                    input_device_index=_device_index,
+                    format=pyaudio.paInt16,
+                    rate=rate,
+                    channels=1,
+                    frames_per_buffer=int(rate * _CHUNK_SECONDS),
+                )
+            return stream, rate
+        except Exception as e:
+            error = e
+    raise error
+
+
+def start():
+    """Start the capture thread if it isn't running. Returns False without a mic."""
+    global _ring, _thread, _running
+    if not initialize():
+        return False
+    with _cond:
+        if _running:
+            return True
+        try:
+            stream, rate = _open_stream()
+        except Exception as e:
+            print(f"Microphone error: {e}")
+            return False
+        if _ring is None:
+            _ring = RingBuffer(int(SAMPLE_RATE * config.MIC_BUFFER_SECONDS))
+        _running = True
+    _thread = threading.Thread(target=_run, args=(stream, rate), name="tars-mic", daemon=True)
+    _thread.start()
+    return True
+
+
+def _run(stream, rate):
+    resampler = dsp.Resampler(rate, SAMPLE_RATE)
+    frames = int(rate * _CHUNK_SECONDS)
+    try:
+        while _running:
+            # exception_on_overflow=False: a late read drops audio instead of raising -9981
+            data = stream.read(frames, exception_on_overflow=False)
+            _publish(resampler.process(np.frombuffer(data, dtype=np.int16)))
+    except Exception as e:
+        print(f"Microphone error: {e}")
+    finally:
+        _mark_stopped()
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception:
+            pass
+
+
+def _publish(samples):
+    """Append captured samples and wake the readers."""
+    with _cond:
+        _ring.write(samples)
+        _cond.notify_all()
+
+
+def _mark_stopped():
+    global _running
+    with _cond:
+        _running = False
+        _cond.notify_all()
+
+
+def stop():
+    """Stop capturing (shutdown). Blocked readers return None."""
+    _mark_stopped()
+    if _thread is not None:
+        _thread.join(timeout=1)
+
+
+def is_running():
+    return _running
+
+
+def position():
+    """Absolute position of the newest captured sample."""
+    with _cond:
+        return _ring.written if _ring else 0
+
+
+def reader(preroll=0.0, start=None):
+    """A new cursor — at `start`, or `preroll` seconds before the live edge."""
+    with _cond:
+        written = _ring.written if _ring else 0
+        oldest = _ring.oldest() if _ring else 0
+        if start is None:
+            start = written - int(preroll * SAMPLE_RATE)
+        return Reader(max(oldest, start))
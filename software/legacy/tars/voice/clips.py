@@ -0,0 +1,130 @@
+"""Clip bank for time announcements — spoken from pre-rendered words, no synthesis.
+
+"What time is it" used to send a fresh sentence through edge-tts and the
+effect chain every time. Instead, the fixed carrier phrase, the hour
+words, the minute words and AM/PM are each rendered once per language
+into the speech cache (like any pre-rendered phrase), and an announcement
+is assembled from those clips: silence trimmed off each, joined with a
+short crossfade. Assembly only reads the cache, so it is instant and works
+with no network.
+
+Missing clips are rendered in the background the first time they're
+needed (or up front with main.py --prerender-speech); until then the
+announcement is synthesized normally. The clips live in the speech
+cache, so with voice.cache.enabled off there is no clip bank.
+"""
+
+import threading
+
+import numpy as np
+from pydub import AudioSegment
+
+from tars import config
+from tars.voice import speaker
+
+CARRIER = "It's about time you asked! It's"
+_HOURS = ("twelve", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven")
+_ONES = ("", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+_TEENS = ("ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen",
+          "nineteen")
+_TENS = ("", "", "twenty", "thirty", "forty", "fifty")
+_AM, _PM = "A.M.", "P.M."
+
+# Clip samples quieter than this are trimmed as silence
+_SILENCE = 300
+# Silence kept at each trimmed edge, in seconds
+_MARGIN = 0.01
+
+_prerendering = set()  # languages with a background render started
+_prerender_lock = threading.Lock()
+
+
+def _minute_words(minute):
+    if minute == 0:
+        return "o'clock"
+    if minute < 10:
+        return f"oh {_ONES[minute]}"
+    if minute < 20:
+        return _TEENS[minute - 10]
+    tens, ones = divmod(minute, 10)
+    return f"{_TENS[tens]}-{_ONES[ones]}" if ones else _TENS[tens]
+
+
+def time_phrases(now):
+    """The clips, in order, that announce a datetime's hour and minute."""
+    return [CARRIER, _HOURS[now.hour % 12], _minute_words(now.minute), _PM if now.hour >= 12 else _AM]
+
+
+def all_phrases():
+    """Every clip time_phrases() can ask for."""
+    return list(dict.fromkeys([CARRIER, *_HOURS, *(_minute_words(m) for m in range(60)), _AM, _PM]))
+
+
+def assemble(phrases, language="english"):
+    """Join cached clips into one AudioSegment, or None if any clip isn't cached yet."""
+    sounds = [speaker.cached(phrase, language) for phrase in phrases]
+    if any(sound is None for sound in sounds) or len({s.frame_rate for s in sounds}) != 1:
+        return None
+    rate = sounds[0].frame_rate
+    pieces = [_trim(np.frombuffer(s.raw_data, dtype=np.int16), rate) for s in sounds]
+    joined = crossfade(pieces, int(rate * config.CLIP_CROSSFADE_MS / 1000))
+    return AudioSegment(data=joined.tobytes(), sample_width=2, frame_rate=rate, channels=1)
+
+
+def crossfade(pieces, overlap):
+    """Concatenate int16 arrays, overlapping each join by up to `overlap` samples with linear fades."""
+    out = np.asarray(pieces[0], dtype=np.float32)
+    for piece in pieces[1:]:
+        piece = np.asarray(piece, dtype=np.float32)
+        n = min(overlap, len(out), len(piece))
+        if n:
+            ramp = np.linspace(0.0, 1.0, n + 2, dtype=np.float32)[1:-1]
+            mixed = out[-n:] * ramp[::-1] + piece[:n] * ramp
+            out = np.concatenate((out[:-n], mixed, piece[n:]))
+        else:
+            out = np.concatenate((out, piece))
+    return np.clip(np.round(out), -32768, 32767).astype(np.int16)
+
+
+def _trim(samples, rate):
+    """Cut leading and trailing silence, keeping a short margin."""
+    loud = np.flatnonzero(np.abs(samples.astype(np.int32)) > _SILENCE)
+    if not len(loud):
+        return samples
+    margin = int(rate * _MARGIN)
+    return samples[max(0, loud[0] - margin):loud[-1] + 1 + margin]
+
+
+def prerender(language="english"):
+    """Render any of this language's clips missing from the cache. Returns how many are cached."""
+    if not config.TTS_CACHE_ENABLED:
+        return 0  # nowhere to keep them
+    ready = 0
+    for phrase in all_phrases():
+        if speaker.cached(phrase, language) is None:
+            # Rendered whole — the carrier is two sentences but one clip
+            if speaker.render(phrase, language, persist=True) is None:
+                continue
+        ready += 1
+    return ready
+
+
+def prerender_in_background(language="english"):
+    """Render this language's clips into the cache on a background thread, once."""
+    with _prerender_lock:
+        if language in _prerendering:
+            return
+        _prerendering.add(language)
+    threading.Thread(target=prerender, args=(language,), name="tars-clips", daemon=True).start()
+
+
+def speak_time(now, language="english"):
+    """Queue a time announcement from the clip bank. Returns False if it can't be assembled yet."""
+    if not config.CLIP_BANK_ENABLED or not config.TTS_CACHE_ENABLED:
+        return False
+    sound = assemble(time_phrases(now), language)
+    if sound is None:
+        prerender_in_background(language)
+        return False
+    speaker.play_audio(sound, blocking=False)
+    return True
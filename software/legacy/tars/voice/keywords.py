@@ -0,0 +1,69 @@
+"""Command-word fast path — a tiny grammar recognizer for the router's keyword commands.
+
+"Turn left" used to wait for the full transcript (a cloud round trip for
+Google) before the router's substring match could move a servo. Instead,
+every utterance is also decoded by a Vosk recognizer whose grammar is
+only the router's command phrases (tars.commands.router.command_phrases:
+movement, "speak <language>" for every language in config.yaml, stop...)
+plus [unk] for anything else. It runs on the same frames as general
+recognition, and its answer is ready the moment speech ends.
+
+When the whole utterance is one movement phrase with word confidence of
+at least voice.keywords.min_confidence, the listener returns it
+straight away and general recognition is skipped. Anything else —
+other commands, a phrase inside a longer sentence, low confidence —
+goes through general recognition as before.
+
+Needs the local Vosk model (voice.stt.vosk_model); without it there is
+no fast path.
+"""
+
+from tars import config
+from tars.voice import stt
+
+_DIGITS = ("zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+
+_grammar = {}  # spoken form -> router phrase
+_fast = set()  # router phrases that may be acted on from a keyword hit
+
+
+def _spoken(phrase):
+    """A phrase as the recognizer hears it — "take 2 steps" -> "take two steps"."""
+    return " ".join(_DIGITS[int(word)] if word.isdigit() and len(word) == 1 else word for word in phrase.split())
+
+
+def initialize(phrases, fast_phrases):
+    """Build the grammar from the router's phrases; fast_phrases may skip general recognition."""
+    global _grammar, _fast
+    _grammar = {_spoken(phrase): phrase for phrase in phrases}
+    _fast = set(fast_phrases)
+
+
+def is_available():
+    return config.KEYWORDS_ENABLED and bool(_grammar) and stt.local_model() is not None
+
+
+class Spotter:
+    """Fast path for one utterance: feed frames, finish() gives a Result only for a confident movement."""
+
+    def __init__(self, session):
+        self._session = session
+
+    def feed(self, frame):
+        self._session.feed(frame)
+
+    def finish(self):
+        heard = self._session.finish()
+        if heard is None or heard.confidence is None or heard.confidence < config.KEYWORD_MIN_CONFIDENCE:
+            return None
+        phrase = _grammar.get(heard.text)
+        if phrase not in _fast:
+            return None
+        return stt.Result(phrase, heard.confidence, "keywords")
+
+
+def spotter():
+    """A Spotter for the next utterance, or None without a local model."""
+    if not is_available():
+        return None
+    return Spotter(stt.VoskBackend(stt.local_model()).session(grammar=list(_grammar)))
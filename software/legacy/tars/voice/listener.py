@@ -1,106 +1,63 @@
 """Speech recognition for TARS — listens for voice commands.
 
-Uses SpeechRecognition with Google Speech API.
-Bypasses sr.Microphone entirely — uses PyAudio directly with a SINGLE
-persistent instance so device indices never change between calls.
-A fresh stream is opened/closed per listen() call to avoid stale buffers.
-Stream is wrapped to suppress overflow errors (matching SR's behavior).
+Recognition runs through tars.voice.stt (Google, or Vosk on the CPU),
+fed from the always-on microphone capture (see tars.voice.capture)
+instead of opening a stream per utterance. Each listen() is a reader on the shared ring buffer: it
+starts a little before the live edge (voice.mic.preroll), or exactly
+where the wake word ended, so no audio falls between wake word and
+recognition and there is no stream setup on the way.
+
+With webrtcvad installed, the end of a command is found by the adaptive
+VAD endpointer in tars.voice.vad instead of SpeechRecognition's 1.2 s
+pause_threshold, and frames stream into the recognizer as they arrive,
+so a local engine has the transcript ready moments after the speaker
+stops.
 """
 
-import contextlib
-import os
-
-import pyaudio
 import speech_recognition as sr
 
 from tars import config
+from tars.voice import capture, keywords, stt, vad
+
+# Audio kept before the detected start of speech, in VAD frames
+_LEAD_FRAMES = 10
 
 _recognizer = None
 _calibrated = False
+_endpointer = None
 
-# Single PyAudio instance — never terminated, keeps device indices stable.
-_pa = None
-_device_index = None
-_device_name = None
-_sample_rate = 16000
-_init_done = False
-
-
-@contextlib.contextmanager
-def _suppress_stderr():
-    """Suppress stderr — silences JACK/ALSA spam from PortAudio."""
-    try:
-        devnull = os.open(os.devnull, os.O_WRONLY)
-        old_stderr = os.dup(2)
-        os.dup2(devnull, 2)
-        try:
-            yield
-        finally:
-            os.dup2(old_stderr, 2)
-            os.close(devnull)
-            os.close(old_stderr)
-    except OSError:
-        yield
-
-
-class _OverflowSafeStream:
-    """Wraps a PyAudio stream to suppress overflow errors.
-
-    This is exactly what SpeechRecognition's MicrophoneStream does internally.
-    Without this, PyAudio raises IOError -9981 on every buffer overflow.
-    """
-
-    def __init__(self, pyaudio_stream):
-        self.pyaudio_stream = pyaudio_stream
-
-    def read(self, size):
-        return self.pyaudio_stream.read(size, exception_on_overflow=False)
-
-    def close(self):
-        try:
-            if not self.pyaudio_stream.is_stopped():
-                self.pyaudio_stream.stop_stream()
-        finally:
-            self.pyaudio_stream.close()
-
-
-class _StableMic(sr.AudioSource):
-    """Microphone source compatible with sr.Recognizer.listen().
 
-    Uses a shared PyAudio instance so device indices stay stable.
-    Opens a fresh stream each time (via context manager) to avoid
-    stale buffers. Wraps stream to suppress overflow errors.
-    """
+class _RingSource(sr.AudioSource):
+    """Audio source compatible with sr.Recognizer.listen(), reading the capture ring buffer."""
 
     CHUNK = 1024
-    SAMPLE_WIDTH = 2  # 16-bit audio
+    SAMPLE_RATE = capture.SAMPLE_RATE
+    SAMPLE_WIDTH = capture.SAMPLE_WIDTH
 
-    def __init__(self, pa_instance, device_index, sample_rate):
-        self.pa = pa_instance
-        self.device_index = device_index
-        self.SAMPLE_RATE = sample_rate
-        self.format = pyaudio.paInt16
+    def __init__(self, start=None):
+        self.start = start
         self.stream = None
 
     def __enter__(self):
-        raw_stream = self.pa.open(
-            input=True,
-            input_device_index=self.device_index,
-            format=self.format,
-            rate=self.SAMPLE_RATE,
-            channels=1,
-            frames_per_buffer=self.CHUNK,
-        )
-        self.stream = _OverflowSafeStream(raw_stream)
+        self.stream = _ReaderStream(capture.reader(config.MIC_PREROLL, self.start))
         return self
 
     def __exit__(self, *args):
-        if self.stream:
-            try:
-                self.stream.close()
-            except Exception:
-                pass
-            self.stream = None
+        self.stream = None
+
+
+class _ReaderStream:
+    """The stream.read(size) interface SpeechRecognition expects, over a capture Reader."""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def read(self, size):
+        view = self.reader.read(size, timeout=1.0)
+        if view is None:
+            raise OSError("microphone capture stopped")
+        # Copied: the recognizer keeps a phrase's chunks until it's done
+        return view.tobytes()
 
 
 def _get_recognizer():
@@ -115,96 +72,95 @@ def _get_recognizer():
     return _recognizer
 
 
-def _init_audio():
-    """Initialize PyAudio ONCE and find the USB microphone.
-
-    Creates a single PyAudio instance that lives for the entire process.
-    This keeps device indices stable — no more "Device index out of range".
-    """
-    global _pa, _device_index, _device_name, _sample_rate, _init_done
+def _get_endpointer():
+    """Get or create the shared endpointer — it learns the speaker's pauses across commands."""
+    global _endpointer
+    if _endpointer is None:
+        _endpointer = vad.Endpointer()
+    return _endpointer
 
-    if _init_done:
-        return _device_index is not None
 
-    _init_done = True
+def _listen_vad(start, phrase_time_limit, utterance):
+    """Stream one utterance from the ring into the recognizer, until the VAD endpointer ends it.
 
-    with _suppress_stderr():
-        try:
-            _pa = pyaudio.PyAudio()
-        except Exception as e:
-            print(f"PyAudio init failed: {e}")
+    Returns False if no speech starts within voice.listen_timeout.
+    """
+    endpointer = _get_endpointer()
+    endpointer.reset()
+    reader = capture.reader(config.MIC_PREROLL, start)
+    wait_frames = int(config.LISTEN_TIMEOUT * 1000 / vad.FRAME_MS)
+    limit_frames = int(phrase_time_limit * 1000 / vad.FRAME_MS)
+    lead = []  # frames before speech starts, for the lead-in
+
+    while True:
+        view = reader.read(vad.FRAME_SAMPLES, timeout=1.0)
+        if view is None:
+            raise OSError("microphone capture stopped")
+        frame = view.tobytes()
+        if endpointer.started:
+            # Decoded while the speaker is still talking
+            utterance.feed(frame)
+            if endpointer.feed(frame) or endpointer.frames - endpointer.start >= limit_frames:
+                return True
+            continue
+
+        lead.append(frame)
+        endpointer.feed(frame)
+        if endpointer.started:
+            # The start is a few frames back — hand over a little audio before it
+            first = endpointer.frames - len(lead)  # frame index of lead[0]
+            for frame in lead[max(0, endpointer.start - _LEAD_FRAMES - first):]:
+                utterance.feed(frame)
+        elif endpointer.frames >= wait_frames:
             return False
+        elif len(lead) > 2 * _LEAD_FRAMES:
+            del lead[0]
+
 
-        count = _pa.get_device_count()
-
-        # Pass 1: Find USB/mic-named device with input channels
-        usb_keywords = ("usb", "mic", "input", "capture")
-        for i in range(count):
-            try:
-                info = _pa.get_device_info_by_index(i)
-                if info.get("maxInputChannels", 0) > 0:
-                    name = info.get("name", "").lower()
-                    if any(kw in name for kw in usb_keywords):
-                        _device_index = i
-                        _device_name = info.get("name", f"Device {i}")
-                        _sample_rate = int(info.get("defaultSampleRate", 16000))
-                        print(f"Microphone found: [{i}] {_device_name}")
-                        return True
-            except Exception:
-                continue
-
-        # Pass 2: Any device with input channels
-        for i in range(count):
-            try:
-                info = _pa.get_device_info_by_index(i)
-                if info.get("maxInputChannels", 0) > 0:
-                    _device_index = i
-                    _device_name = info.get("name", f"Device {i}")
-                    _sample_rate = int(info.get("defaultSampleRate", 16000))
-                    print(f"Microphone found: [{i}] {_device_name}")
-                    return True
-            except Exception:
-                continue
-
-    print("WARNING: No microphone with input channels found!")
-    return False
-
-
-def listen(phrase_time_limit=None):
+def listen(phrase_time_limit=None, start=None, on_partial=None):
     """Listen for a voice command via microphone.
 
-    Opens a fresh audio stream for each call (avoids stale buffers)
-    but reuses the same PyAudio instance (stable device indices).
+    Args:
+        start: Capture position to start from (e.g. WakeWordDetector.detected_at),
+               instead of the live edge minus the pre-roll.
+        on_partial: Called with the growing transcript while the user speaks,
+                    if the recognizer streams (see tars.voice.stt).
 
     Returns:
         Lowercase string of recognized speech, or None on failure.
     """
     global _calibrated
 
-    if not _init_audio():
+    if not capture.start():
         return None
 
     recognizer = _get_recognizer()
-    mic = _StableMic(_pa, _device_index, _sample_rate)
+    # Movement commands can be answered by the keyword recognizer alone
+    utterance = stt.utterance(on_partial, keywords.spotter())
 
     try:
-        with mic:
+        if vad.is_available():
+            if not _listen_vad(start, phrase_time_limit or 10, utterance):
+                return None
+        else:
             if not _calibrated:
-                recognizer.adjust_for_ambient_noise(mic, duration=1.0)
+                # A reader of its own — the command audio stays in the ring meanwhile
+                with _RingSource() as ambient:
+                    recognizer.adjust_for_ambient_noise(ambient, duration=1.0)
                 _calibrated = True
 
-            audio = recognizer.listen(
-                mic,
-                timeout=config.LISTEN_TIMEOUT,
-                phrase_time_limit=phrase_time_limit or 10,
-            )
-            command = recognizer.recognize_google(audio)
-            return command.lower()
-    except sr.UnknownValueError:
-        return None
+            with _RingSource(start) as mic:
+                audio = recognizer.listen(
+                    mic,
+                    timeout=config.LISTEN_TIMEOUT,
+                    phrase_time_limit=phrase_time_limit or 10,
+                )
+            utterance.feed(audio.get_raw_data())
+        result = utterance.finish()
+        return result.text.lower() if result else None
     except sr.WaitTimeoutError:
         return None
-    except sr.RequestError:
+    except stt.Unavailable:
         print("Speech service unavailable.")
         return None
     except Exception as e:
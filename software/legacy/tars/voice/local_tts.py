@@ -0,0 +1,136 @@
+"""Offline text-to-speech on the CPU — keeps TARS talking when edge-tts can't.
+
+Engines, in the order "auto" tries them:
+    piper  — neural voices via the piper-tts package; the model is loaded
+             once and audio streams out sentence by sentence
+             (pip install piper-tts, plus a voice model .onnx)
+    espeak — espeak-ng (or espeak) run per sentence, WAV read from its
+             stdout as it is written (sudo apt install espeak-ng)
+
+Both hand back raw 16-bit mono PCM; speaker runs it through the same TARS
+effect chain as edge-tts audio.
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import threading
+
+import numpy as np
+
+try:
+    from piper.voice import PiperVoice
+    PIPER_AVAILABLE = True
+except ImportError:
+    PIPER_AVAILABLE = False
+
+from tars import config
+from tars.commands.language import get_voice_id
+
+# espeak writes a 44-byte WAV header, then PCM; read it in ~40 ms blocks
+_WAV_HEADER = 44
+_READ_BYTES = 1764
+
+_engine = None  # "piper" | "espeak" | None
+_espeak = None  # espeak-ng or espeak command
+_piper = None  # loaded PiperVoice
+_piper_lock = threading.Lock()  # one synthesis per loaded model at a time
+
+
+def initialize():
+    """Pick the configured offline engine, loading the Piper model if that's the one."""
+    global _engine, _espeak, _piper
+    choice = config.LOCAL_TTS_ENGINE
+    _engine = None
+    if choice == "off":
+        return
+
+    if choice in ("auto", "piper") and PIPER_AVAILABLE:
+        model = os.path.expanduser(config.PIPER_MODEL or "")
+        if os.path.exists(model):
+            try:
+                _piper = PiperVoice.load(model)
+                _engine = "piper"
+                print(f"Offline voice: Piper ({os.path.basename(model)})")
+                return
+            except Exception as e:
+                print(f"Piper voice failed to load: {e}")
+        elif choice == "piper":
+            print(f"Piper voice model not found: {model}")
+
+    if choice in ("auto", "espeak"):
+        _espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        if _espeak:
+            _engine = "espeak"
+            print(f"Offline voice: {os.path.basename(_espeak)}")
+            return
+
+    print("No offline voice. Install espeak-ng, or piper-tts with a voice model.")
+
+
+def is_available():
+    return _engine is not None
+
+
+def engine():
+    """Name of the active offline engine, or None."""
+    return _engine
+
+
+def voice_name(language):
+    """Identifies the local voice for a language, for speech cache keys."""
+    if _engine == "piper":
+        return f"piper:{os.path.basename(config.PIPER_MODEL)}"
+    return f"espeak:{_espeak_voice(language)}"
+
+
+def synthesize(text, language="english"):
+    """Yield (int16 mono samples, sample rate) for text as the engine produces them."""
+    if _engine == "piper":
+        yield from _piper_blocks(text)
+    elif _engine == "espeak":
+        yield from _espeak_blocks(text, language)
+
+
+def _piper_blocks(text):
+    with _piper_lock:
+        if hasattr(_piper, "synthesize_stream_raw"):
+            # piper-tts 1.2: raw PCM bytes per sentence
+            rate = _piper.config.sample_rate
+            for audio in _piper.synthesize_stream_raw(text):
+                yield np.frombuffer(audio, dtype=np.int16), rate
+        else:
+            # piper-tts 1.3+: AudioChunk objects
+            for chunk in _piper.synthesize(text):
+                yield np.frombuffer(chunk.audio_int16_bytes, dtype=np.int16), chunk.sample_rate
+
+
+def _espeak_voice(language):
+    """espeak voice for a language — the language part of its edge-tts voice ID."""
+    return get_voice_id(language).split("-")[0]
+
+
+def _espeak_blocks(text, language):
+    process = subprocess.Popen(
+        [_espeak, "--stdout", "-v", _espeak_voice(language), text],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        header = process.stdout.read(_WAV_HEADER)
+        if len(header) < _WAV_HEADER or header[:4] != b"RIFF":
+            return
+        rate = struct.unpack("<I", header[24:28])[0]
+        leftover = b""
+        while data := process.stdout.read1(_READ_BYTES):
+            data = leftover + data
+            usable = len(data) - len(data) % 2
+            leftover = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype=np.int16), rate
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
@@ -0,0 +1,156 @@
+"""MP3 byte feed for incremental decoding — edge-tts chunks in, decoder reads out.
+
+miniaudio's MP3 decoder pulls its input through a read() callback and
+asks for more before every frame. A feed that simply blocks until the
+next network chunk would stall it while it still holds undecoded frames,
+and cutting reads short at arbitrary byte counts makes the decoder lose
+sync. So the feed parses MPEG audio frame headers as chunks arrive and
+hands out at most a couple of whole frames per read: the decoder always
+has a decodable frame plus the next header, and only waits when no
+complete frame has arrived yet. Anything that doesn't parse (a tag,
+free-format stream) is passed through as-is.
+"""
+
+import queue
+from collections import deque
+
+try:
+    import miniaudio
+    _StreamSource = miniaudio.StreamableSource
+except ImportError:
+    _StreamSource = object
+
+# Whole frames handed to the decoder per read
+_FRAMES_PER_READ = 2
+# Frames buffered before the first read — the decoder drops a frame if it
+# starts on exactly two
+_START_FRAMES = 3
+
+# Layer III bitrates (kbit/s) by bitrate index, for MPEG-1 and MPEG-2/2.5
+_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def frame_length(header):
+    """Length in bytes of the Layer III frame starting with these 4 bytes, or None."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 3
+    layer = (header[1] >> 1) & 3
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    rate = _SAMPLE_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 1
+    return (144 if version == 3 else 72) * bitrate // rate + padding
+
+
+def _id3_length(data):
+    """Total size of an ID3v2 tag at the start of data, or None."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return None
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    return 10 + size
+
+
+class Mp3Feed(_StreamSource):
+    """MP3 bytes from a download, read by the decoder as whole frames arrive.
+
+    The producer calls put() per chunk and end() when done (set failed
+    first if the download broke off). The decoder's read() blocks until a
+    complete frame is buffered or the stream ends. close() tells the
+    producer the decoder has stopped.
+    """
+
+    def __init__(self):
+        self._chunks = queue.Queue()
+        self._data = bytearray()
+        self._base = 0  # stream offset of _data[0]
+        self._pos = 0  # stream offset of the next byte to hand out
+        self._scan = 0  # stream offset of the next header to parse
+        self._frame_ends = deque()  # stream offsets where parsed frames end
+        self._parsing = True  # False once the stream stops looking like frames
+        self._started = False  # the decoder has had its first batch of frames
+        self._ended = False
+        self.closed = False
+        self.failed = False
+
+    def put(self, data):
+        self._chunks.put(data)
+
+    def end(self):
+        self._chunks.put(None)
+
+    def read(self, num_bytes):
+        while True:
+            limit = self._readable()
+            if limit > self._pos or self._ended:
+                break
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._ended = True
+            else:
+                self._data.extend(chunk)
+        end = min(limit, self._pos + num_bytes)
+        data = bytes(self._data[self._pos - self._base:end - self._base])
+        self._pos = end
+        self._started = self._started or end == limit
+        # Drop what the decoder has taken
+        consumed = self._pos - self._base
+        if consumed > 65536:
+            del self._data[:consumed]
+            self._base = self._pos
+        return data
+
+    def read_all(self):
+        data = bytearray()
+        while chunk := self.read(65536):
+            data.extend(chunk)
+        return bytes(data)
+
+    def close(self):
+        self.closed = True
+
+    def _readable(self):
+        """Stream offset up to which bytes may be handed out now."""
+        available = self._base + len(self._data)
+        if self._parsing and not self._ended:
+            self._parse_frames(available)
+        if self._ended or not self._parsing:
+            return available
+        while self._frame_ends and self._frame_ends[0] <= self._pos:
+            self._frame_ends.popleft()
+        if self._started:
+            frames = min(_FRAMES_PER_READ, len(self._frame_ends))
+        else:
+            frames = _START_FRAMES if len(self._frame_ends) >= _START_FRAMES else 0
+        return self._frame_ends[frames - 1] if frames else self._pos
+
+    def _parse_frames(self, available):
+        """Record the end of every complete frame buffered past the last one parsed."""
+        while True:
+            offset = self._scan - self._base
+            head = self._data[offset:offset + 10]
+            if self._scan == 0 and head[:3] == b"ID3"[:len(head[:3])]:
+                if len(head) < 10:
+                    return  # wait for the whole tag header
+                length = _id3_length(head)
+            elif len(head) < 4:
+                return
+            else:
+                length = frame_length(head)
+                if length is None:
+                    self._parsing = False  # not plain Layer III frames — pass everything through
+                    return
+            if self._scan + length > available:
+                return
+            self._scan += length
+            self._frame_ends.append(self._scan)
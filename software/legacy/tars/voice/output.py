@@ -0,0 +1,390 @@
+"""Persistent audio output for TARS — one stream stays open for every utterance.
+
+Spawning a player per utterance (process start plus sink connection)
+costs hundreds of milliseconds on a Pi, more with a Bluetooth sink. So
+the output is opened once and kept:
+
+    miniaudio — a playback device at 48 kHz (the usual native rate), fed
+                from an in-process queue by miniaudio's audio callback.
+                Speech is resampled to the device rate once, in-process.
+    pipe      — fallback: one long-running pw-play / paplay / aplay /
+                ffplay reading an endless WAV stream from stdin. The
+                sound server does the (single) rate conversion.
+
+stop() silences either backend within about one buffer period: the
+device queue is simply dropped; the player process is killed and a fresh
+one started in the background for the next utterance (a stop with
+nothing written, or with a restart already pending, does nothing). latency() reports
+the buffer period and the measured time from write() to the first sample
+of an utterance reaching the device (the audio callback picking it up,
+or the player's pipe accepting it) plus the buffer behind that; tars.ui.status
+shows it.
+"""
+
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+try:
+    import miniaudio
+    MINIAUDIO_AVAILABLE = True
+except ImportError:
+    MINIAUDIO_AVAILABLE = False
+
+from tars import config
+from tars.ai.hedge import LatencyTracker
+
+# Audio queued ahead of the device before write() blocks
+_MAX_AHEAD_SECONDS = 0.5
+# How long write() waits for a starting player before giving up on it
+_PLAYER_START_TIMEOUT = 5.0
+# Rate the device is opened at — the usual native rate of PipeWire, PulseAudio and USB/HDMI sinks,
+# so miniaudio rarely has to convert again
+_DEVICE_RATE = 48000
+# Rate of the pipe backend's stream — edge-tts' own rate, so nothing is resampled here
+_PIPE_RATE = 24000
+
+# Players that read a WAV stream from stdin. pw-play and paplay route
+# through PipeWire/PulseAudio, so they see Bluetooth speakers as the
+# default sink; aplay is ALSA-only and can't reach BT devices.
+_PLAYERS = [
+    (["pw-play", "-"], "PipeWire"),
+    (["paplay"], "PulseAudio"),
+    (["aplay", "-q", "-"], "ALSA"),
+    (["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "pipe:0"], "FFmpeg"),
+]
+
+_output = None
+_output_lock = threading.Lock()
+
+
+class DeviceOutput:
+    """A miniaudio playback device kept running, playing queued int16 mono audio.
+
+    The audio callback plays silence while nothing is queued, so the
+    stream never closes between utterances.
+    """
+
+    def __init__(self, buffer_ms=20, backends=None):
+        self._device = miniaudio.PlaybackDevice(
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=1,
+            sample_rate=_DEVICE_RATE,
+            buffersize_msec=buffer_ms,
+            backends=backends,
+            app_name="TARS",
+        )
+        self.rate = self._device.sample_rate
+        self.name = f"miniaudio ({self._device.backend})"
+        self.buffer_seconds = buffer_ms / 1000
+        self.latency = LatencyTracker(min_samples=1)  # write() to the callback, plus the buffer
+        self._queue = deque()  # int16 arrays waiting to play
+        self._queued = 0  # samples in _queue
+        self._cond = threading.Condition()
+        self._played = 0  # samples ever handed to the device
+        self._pending_marks = deque()  # (sample index, write time) of utterance starts
+        self._epoch = 0  # bumped by stop()
+
+        callback = self._callback()
+        next(callback)
+        self._device.start(callback)
+
+    def _callback(self):
+        frames = yield b""
+        while True:
+            out = np.zeros(frames, dtype=np.int16)
+            filled = 0
+            with self._cond:
+                while filled < frames and self._queue:
+                    head = self._queue[0]
+                    take = min(frames - filled, len(head))
+                    out[filled:filled + take] = head[:take]
+                    filled += take
+                    if take == len(head):
+                        self._queue.popleft()
+                    else:
+                        self._queue[0] = head[take:]
+                self._queued -= filled
+                self._played += filled
+                now = time.perf_counter()
+                while self._pending_marks and self._pending_marks[0][0] < self._played:
+                    _, written_at = self._pending_marks.popleft()
+                    self.latency.record(now - written_at + self.buffer_seconds)
+                self._cond.notify_all()
+            frames = yield out
+
+    def write(self, samples, cancelled=None):
+        """Queue int16 samples at self.rate; blocks while too much is already queued.
+
+        Returns without queueing if stop() is called or cancelled() turns true meanwhile.
+        """
+        if not len(samples):
+            return
+        limit = int(self.rate * _MAX_AHEAD_SECONDS)
+        with self._cond:
+            epoch = self._epoch
+            while self._queued > limit and epoch == self._epoch and not (cancelled and cancelled()):
+                self._cond.wait(0.05)
+            if epoch != self._epoch or (cancelled and cancelled()):
+                return
+            if not self._queued:
+                # Start of audio after silence — time it to the callback
+                self._pending_marks.append((self._played, time.perf_counter()))
+            self._queue.append(samples)
+            self._queued += len(samples)
+
+    def drain(self, cancelled=None):
+        """Wait until everything written has played (or cancelled() turns true)."""
+        with self._cond:
+            while self._queued and not (cancelled and cancelled()):
+                self._cond.wait(0.05)
+        if not (cancelled and cancelled()):
+            time.sleep(self.buffer_seconds)  # the device's own buffer
+
+    def stop(self):
+        """Drop everything queued — silent within one buffer period."""
+        with self._cond:
+            self._epoch += 1
+            self._queue.clear()
+            self._queued = 0
+            self._pending_marks.clear()
+            self._cond.notify_all()
+
+    def close(self):
+        self.stop()
+        self._device.close()
+
+
+class PipeOutput:
+    """One long-running player process fed an endless WAV stream through its stdin.
+
+    The pipe is shrunk to a page or two so little audio sits in it; stop()
+    kills the player and starts the next one in the background.
+    """
+
+    def __init__(self, command, name):
+        self.command = command
+        self.name = name
+        self.rate = _PIPE_RATE
+        self.buffer_seconds = 0.0
+        # Nothing reports when a pipe's audio actually plays: this is write()
+        # until the pipe accepts an utterance's first samples (including any wait
+        # for a restarting player), plus the pipe's own buffer
+        self.latency = LatencyTracker(min_samples=1)
+        self.startup = LatencyTracker(min_samples=1)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._process = None
+        self._restarting = False  # a _start() is on its way
+        self._failed = False  # the player didn't start — writes are dropped until the next restart
+        self._closed = False
+        self._written = False  # audio written to the current player
+        self._busy_until = 0.0  # estimated end of the audio written so far
+        self._start()
+
+    def _start(self):
+        started = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            print(f"Audio player failed to start: {e}")
+            with self._lock:
+                self._restarting = False
+                self._failed = True
+            return
+        self.buffer_seconds = _shrink_pipe(process.stdin, 2 * 4096) / 2 / self.rate
+        process.stdin.write(_stream_header(self.rate))
+        self.startup.record(time.perf_counter() - started)
+        with self._lock:
+            superseded, self._process = self._process, process
+            self._restarting = False
+            self._failed = False
+            self._written = False
+            if self._closed:
+                superseded, self._process = process, None
+        if superseded is not None:
+            _kill(superseded)
+        if not self._closed:
+            self._ready.set()
+
+    def write(self, samples, cancelled=None):
+        """Write int16 samples at self.rate; blocks at playback pace once the pipe is full."""
+        started = time.perf_counter()
+        if not len(samples) or not self._wait_ready() or (cancelled and cancelled()):
+            return
+        with self._lock:
+            process = self._process
+            self._written = True
+            now = time.monotonic()
+            starting = self._busy_until <= now  # first audio after silence
+            self._busy_until = max(self._busy_until, now) + len(samples) / self.rate
+        try:
+            process.stdin.write(samples.tobytes())
+            process.stdin.flush()
+        except (BrokenPipeError, ValueError, AttributeError):
+            return  # killed by stop()
+        if starting:
+            self.latency.record(time.perf_counter() - started + self.buffer_seconds)
+
+    def _wait_ready(self):
+        """Wait for the player; False at once if it has already failed to start."""
+        deadline = time.monotonic() + _PLAYER_START_TIMEOUT
+        while not self._ready.is_set():
+            if self._failed:
+                return False
+            if self._ready.wait(0.05):
+                break
+            if time.monotonic() >= deadline:
+                with self._lock:
+                    if not self._failed:
+                        print(f"Audio player didn't start within {_PLAYER_START_TIMEOUT:.0f}s")
+                    self._failed = True
+                return False
+        return True
+
+    def drain(self, cancelled=None):
+        """Wait until the audio written so far should have played."""
+        while not (cancelled and cancelled()):
+            remaining = self._busy_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 0.05))
+
+    def stop(self):
+        """Kill the player mid-buffer and start a fresh one for the next utterance.
+
+        Idempotent: an idle player, or one already being replaced, is left alone.
+        """
+        with self._lock:
+            self._busy_until = 0.0
+            if self._closed or self._restarting or (self._process is not None and not self._written):
+                return
+            process, self._process = self._process, None
+            self._restarting = True
+            self._failed = False  # give the new player its own chance
+            self._ready.clear()
+        if process is not None:
+            _kill(process)
+        threading.Thread(target=self._start, name="tars-player", daemon=True).start()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+            process.terminate()
+
+
+def _kill(process):
+    try:
+        process.kill()
+    except Exception:
+        pass
+
+
+def _shrink_pipe(pipe, size):
+    """Shrink a pipe so little audio sits in it; returns its size in bytes."""
+    try:
+        import fcntl
+        return fcntl.fcntl(pipe, fcntl.F_SETPIPE_SZ, size)
+    except (ImportError, AttributeError, OSError, TypeError, ValueError):
+        return size  # not Linux, or a mock — the default pipe size is unknown, assume the request
+
+
+def _stream_header(rate, channels=1, sample_width=2):
+    """WAV header for a stream of unknown length (sizes set to the maximum)."""
+    block_align = channels * sample_width
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, rate, rate * block_align, block_align,
+                                sample_width * 8)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def _find_player():
+    """First installed player command — looked up on PATH, nothing is launched."""
+    for command, name in _PLAYERS:
+        if shutil.which(command[0]):
+            return command, name
+    return None, None
+
+
+def _open():
+    """Open the configured backend, falling back from miniaudio to a player pipe."""
+    backend = config.AUDIO_OUTPUT_BACKEND
+    if backend in ("auto", "miniaudio") and MINIAUDIO_AVAILABLE:
+        try:
+            return DeviceOutput(config.AUDIO_BUFFER_MS)
+        except Exception as e:
+            print(f"Audio device unavailable ({e}) — falling back to a player process")
+    if backend in ("auto", "pipe"):
+        command, name = _find_player()
+        if command is not None:
+            return PipeOutput(command, name)
+    print("No audio output found. Install pipewire or pulseaudio-utils.")
+    return None
+
+
+def get():
+    """The shared output, opened on first use; None if there is no way to play audio."""
+    global _output
+    with _output_lock:
+        if _output is None:
+            _output = _open()
+        return _output
+
+
+def initialize():
+    """Open the output now so the first utterance doesn't pay for it."""
+    stream = get()
+    if stream is None:
+        return False
+    print(f"Audio output: {stream.name}, {stream.rate} Hz, {stream.buffer_seconds * 1000:.0f} ms buffer")
+    return True
+
+
+def is_available():
+    return _output is not None
+
+
+def stop():
+    """Silence whatever is playing."""
+    if _output is not None:
+        _output.stop()
+
+
+def latency():
+    """Output latency figures for status display (seconds), or None before opening."""
+    if _output is None:
+        return None
+    startup = getattr(_output, "startup", None)
+    return {
+        "backend": _output.name,
+        "rate": _output.rate,
+        "buffer": _output.buffer_seconds,
+        "measured": _output.latency.percentile(50),
+        "player_start": startup.percentile(50) if startup else None,
+    }
+
+
+def close():
+    global _output
+    with _output_lock:
+        if _output is not None:
+            _output.close()
+            _output = None
@@ -0,0 +1,194 @@
+"""Speech playback queue for TARS — one worker plays utterances in priority order.
+
+Every utterance (speaker.speak, speak_stream, play_audio) is a Job on one
+queue, played by a single worker thread, so back-to-back responses
+queue up instead of racing each other for the output stream:
+
+    priority  — URGENT lines (errors, acknowledgements) play before queued
+                NORMAL ones (chat); equal priorities play in order.
+    coalesce  — a job whose key matches one already queued or playing
+                (the same line from a burst of controller presses) is
+                merged into it rather than played twice.
+    preempt   — cancels the utterance playing now; the new job is next.
+    flush     — cancels everything playing and queued (stop_speaking).
+    prepare   — an optional prepare(job) callback runs once the job is
+                next in line (or within prepare_ahead of it), so a queued
+                job is just its text until then.
+    bounded   — submit() never waits and never drops a job. Memory is
+                bounded instead: only the job playing and the next
+                prepare_ahead hold audio, however long the queue gets.
+
+stats() reports queue depth and counters for status display.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from tars.ai.hedge import LatencyTracker
+
+URGENT = 0
+NORMAL = 1
+
+
+class Job:
+    """One queued utterance. play(job) runs on the worker and should return
+    promptly once job.cancelled() turns true."""
+
+    def __init__(self, play, priority=NORMAL, key=None, prepare=None):
+        self.play = play
+        self.priority = priority
+        self.key = key
+        self.prepare = prepare
+        self.submitted_at = time.monotonic()
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the job has played (or was cancelled); False on timeout."""
+        return self._done.wait(timeout)
+
+
+class PlaybackQueue:
+    """Priority queue of Jobs with a single lazily started worker."""
+
+    def __init__(self, name="tars-playback", prepare_ahead=1):
+        self.prepare_ahead = prepare_ahead  # queued jobs prepared while another plays
+        self.name = name
+        self._cond = threading.Condition()
+        self._heap = []  # (priority, seq, job)
+        self._seq = itertools.count()
+        self._current = None
+        self._worker = None
+        self.wait_times = LatencyTracker(min_samples=1)  # submit to start of playback
+        self._counts = {"submitted": 0, "played": 0, "coalesced": 0, "preempted": 0, "cancelled": 0}
+        self._max_depth = 0
+
+    def submit(self, play, priority=NORMAL, key=None, preempt=False, prepare=None):
+        """Queue play(job) and return its Job — or the matching job if key coalesces.
+
+        Never blocks. prepare(job), if given, is called (on some thread) once the job
+        nears the head of the queue.
+        """
+        with self._cond:
+            if key is not None:
+                existing = self._find(key)
+                if existing is not None:
+                    self._counts["coalesced"] += 1
+                    return existing
+            job = Job(play, priority, key, prepare)
+            if preempt:
+                # Ahead of everything, including other urgent lines
+                self._cancel_current("preempted")
+                heapq.heappush(self._heap, (-1, next(self._seq), job))
+            else:
+                heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._counts["submitted"] += 1
+            self._max_depth = max(self._max_depth, len(self._heap))
+            self._ensure_worker()
+            self._cond.notify_all()
+            ready = self._ready()
+        self._prepare(ready)
+        return job
+
+    def flush(self):
+        """Cancel the job playing now and every queued job."""
+        with self._cond:
+            self._cancel_current("cancelled")
+            for _, _, job in self._heap:
+                job.cancel()
+                job._done.set()
+            self._counts["cancelled"] += len(self._heap)
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def busy(self):
+        """True while a job is playing or waiting to play."""
+        with self._cond:
+            return self._current is not None or bool(self._heap)
+
+    def depth(self):
+        with self._cond:
+            return len(self._heap)
+
+    def stats(self):
+        """Queue depth, counters and median wait (seconds) for status display."""
+        with self._cond:
+            return {
+                "depth": len(self._heap),
+                "max_depth": self._max_depth,
+                "playing": self._current is not None,
+                "wait": self.wait_times.percentile(50),
+                **self._counts,
+            }
+
+    def _find(self, key):
+        if self._current is not None and self._current.key == key and not self._current.cancelled():
+            return self._current
+        for _, _, job in self._heap:
+            if job.key == key:
+                return job
+        return None
+
+    def _ready(self, *jobs):
+        """Claim the prepare callbacks of jobs and of the queued jobs within prepare_ahead of the head.
+
+        Called with the lock held; each callback is handed out once.
+        """
+        ready = []
+        for job in [*jobs, *(entry[2] for entry in heapq.nsmallest(self.prepare_ahead, self._heap))]:
+            if job.prepare is not None:
+                ready.append((job, job.prepare))
+                job.prepare = None
+        return ready
+
+    def _prepare(self, ready):
+        for job, prepare in ready:
+            if job.cancelled():
+                continue
+            try:
+                prepare(job)
+            except Exception as e:
+                print(f"Playback error: {e}")
+
+    def _cancel_current(self, counter):
+        if self._current is not None and not self._current.cancelled():
+            self._current.cancel()
+            self._counts[counter] += 1
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                _, _, job = heapq.heappop(self._heap)
+                self._current = job
+                ready = self._ready(job)
+            self._prepare(ready)
+            self.wait_times.record(time.monotonic() - job.submitted_at)
+            try:
+                if not job.cancelled():
+                    job.play(job)
+            except Exception as e:
+                print(f"Playback error: {e}")
+            finally:
+                with self._cond:
+                    self._current = None
+                    if not job.cancelled():
+                        self._counts["played"] += 1
+                job._done.set()
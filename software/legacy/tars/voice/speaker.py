@@ -2,35 +2,96 @@
 
 Features:
     - Free TTS via edge-tts (no API key needed)
-    - Robotic voice processing (band-pass filter, speedup)
-    - Interruptible playback via subprocess (works with Bluetooth audio)
+    - Robotic voice processing (band-pass filter, speedup — NumPy, see tars.voice.dsp)
+    - Interruptible playback on one persistent output stream (see
+      tars.voice.output — miniaudio device, or a long-running player
+      process; works with Bluetooth audio)
+    - One playback queue: utterances play in priority order on a single
+      worker, duplicates coalesce, urgent lines can preempt (see
+      tars.voice.playback)
+    - Finished audio cached on disk for repeated phrases (see tars.voice.tts_cache)
+    - No temp files: MP3 is decoded in-process (miniaudio, or ffmpeg
+      over pipes)
+    - Streaming: edge-tts audio is decoded and processed block by block as
+      it downloads and played straight away; sentence N+1 is synthesized
+      while sentence N plays, with no gap between them
+    - Offline fallback: edge-tts sits behind a circuit breaker and must
+      start sending audio within voice.tts.timeout; otherwise the sentence
+      is spoken by a local engine (see tars.voice.local_tts) through the
+      same effect chain. voice.tts.engine: local makes it the primary.
 """
 
 import asyncio
 import io
-import os
-import subprocess
-import tempfile
+import time
+import queue
 import threading
 
 import edge_tts
-from pydub import AudioSegment, effects
+import numpy as np
+from pydub import AudioSegment
+
+try:
+    import miniaudio
+    MINIAUDIO_AVAILABLE = True
+except ImportError:
+    MINIAUDIO_AVAILABLE = False
 
 from tars import config
+from tars.ai import breaker
 from tars.commands.language import get_voice_id
+from tars.utils.aio import LoopThread
+from tars.utils.text import split_clauses, split_sentences
+from tars.voice import dsp, local_tts, mp3stream, output, playback, tts_cache
+
+# Sentences longer than this are cut at commas/semicolons, so the first
+# piece — and first audio — is quick to render
+_MAX_SEGMENT_CHARS = 120
+# Sentences rendered ahead of the one playing
+_RENDER_AHEAD = 1
+# edge-tts MP3 is 24 kHz mono; decode in 40 ms blocks
+_TTS_RATE = 24000
+_DECODE_FRAMES = 960
+# Marks the end of one sentence in the render queue
+_SEGMENT_END = object()
 
 _initialized = False
 
-# Interrupt support — allows stopping playback mid-sentence
-_playback_process = None
-_playback_lock = threading.Lock()
-_speaking = threading.Event()
+# All edge-tts work runs on this one long-lived loop, whichever thread asks
+_loop = LoopThread("tars-tts")
+
+# How long the edge-tts health probe may take while the breaker is open
+_PROBE_TIMEOUT = 5.0
+
+# Every utterance plays through this queue, one at a time
+_queue = playback.PlaybackQueue(name="tars-playback")
+
+
+def _probe_edge():
+    """Cheap edge-tts health check: fetch the voice list."""
+    return _loop.run(asyncio.wait_for(edge_tts.list_voices(), _PROBE_TIMEOUT))
+
+
+def _new_breaker():
+    return breaker.CircuitBreaker("edge-tts", consecutive_failures=2, probe=_probe_edge)
 
 
-def initialize():
-    """Initialize the speech system."""
-    global _initialized
+# Skips edge-tts while it's failing, so offline speech doesn't wait on the network
+_edge_breaker = _new_breaker()
+
+
+def initialize(audio=True):
+    """Initialize the speech system, find an offline voice and open the audio output.
+
+    Args:
+        audio: Open the output now. Off for render-only use (pre-rendering).
+    """
+    global _initialized, _edge_breaker
     _initialized = True
+    _edge_breaker = _new_breaker()
+    local_tts.initialize()
+    if audio:
+        output.initialize()
 
 
 def is_available():
@@ -39,167 +100,439 @@ def is_available():
 
 
 def is_speaking():
-    """Check if TARS is currently speaking."""
-    return _speaking.is_set()
+    """Check if TARS is speaking, or has speech queued."""
+    return _queue.busy()
 
 
-async def _generate_speech_async(text, voice_id):
-    """Generate speech audio using edge-tts (async)."""
-    communicate = edge_tts.Communicate(
+def get_health():
+    """edge-tts circuit breaker state and the offline engine, for status display."""
+    return {"edge-tts": _edge_breaker.snapshot(), "local": local_tts.engine()}
+
+
+def _use_local():
+    return config.TTS_ENGINE == "local" and local_tts.is_available()
+
+
+def playback_stats():
+    """Playback queue depth and counters (see PlaybackQueue.stats)."""
+    return _queue.stats()
+
+
+def _communicate(text, voice_id):
+    return edge_tts.Communicate(
         text,
         voice_id,
         rate=config.SPEECH_RATE,
         pitch=config.SPEECH_PITCH,
     )
-    with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-        tmp_path = tmp.name
-    await communicate.save(tmp_path)
-    return tmp_path
 
 
-def _run_async(coro):
-    """Run an async coroutine efficiently.
+async def _generate_speech_async(text, voice_id):
+    """Generate speech audio using edge-tts (async). Returns MP3 bytes."""
+    communicate = _communicate(text, voice_id)
+    audio = bytearray()
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+    return bytes(audio)
+
+
+def submit_speech(text, language="english"):
+    """Start edge-tts synthesis on the speech loop; returns a concurrent Future of MP3 bytes.
 
-    Reuses event loop when possible, avoids asyncio.run() overhead.
+    Safe to call from any thread, including one running its own event loop.
     """
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Already in an async context — can't use run()
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as pool:
-                return pool.submit(asyncio.run, coro).result()
-        return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+    return _loop.submit(_generate_speech_async(text, get_voice_id(language)))
 
 
 def generate_speech(text, language="english"):
-    """Generate speech audio from text using edge-tts."""
+    """Generate speech audio from text using edge-tts. Returns an in-memory MP3 stream."""
     if not _initialized:
         return None
-    voice_id = get_voice_id(language)
     try:
-        tmp_path = _run_async(_generate_speech_async(text, voice_id))
-        with open(tmp_path, "rb") as f:
-            audio_data = f.read()
-        os.unlink(tmp_path)
-        return io.BytesIO(audio_data)
+        return io.BytesIO(_loop.run(_generate_speech_async(text, get_voice_id(language))))
     except Exception as e:
         print(f"Error generating speech: {e}")
         return None
 
 
+def decode_mp3(audio_stream):
+    """Decode an in-memory MP3 to an AudioSegment without touching the disk."""
+    data = audio_stream.read()
+    if MINIAUDIO_AVAILABLE:
+        decoded = miniaudio.mp3_read_s16(data)
+        return AudioSegment(
+            data=decoded.samples.tobytes(),
+            sample_width=2,
+            frame_rate=decoded.sample_rate,
+            channels=decoded.nchannels,
+        )
+    # ffmpeg over stdin/stdout — codec given so pydub skips the ffprobe pass
+    return AudioSegment.from_file(io.BytesIO(data), format="mp3", codec="mp3")
+
+
 def modify_voice(audio_stream):
     """Apply robotic TARS voice effects to audio (band-pass + speedup)."""
-    sound = AudioSegment.from_file(audio_stream, format="mp3")
-    sound = effects.speedup(sound, playback_speed=config.PLAYBACK_SPEED)
-    if config.HIGH_PASS_FILTER:
-        sound = sound.high_pass_filter(config.HIGH_PASS_FILTER)
-    sound = effects.low_pass_filter(sound, config.LOW_PASS_FILTER)
-    sound = sound - config.VOLUME_REDUCTION
-    sound = sound + config.VOLUME_BOOST
-    return sound
-
-
-def _find_audio_player():
-    """Find the best audio player — prefers PipeWire/PulseAudio for BT support."""
-    # pw-play and paplay route through PipeWire/PulseAudio,
-    # so they see Bluetooth speakers as the default sink.
-    # aplay is ALSA-only and can't reach BT devices.
-    players = [
-        (["pw-play"], "PipeWire"),
-        (["paplay"], "PulseAudio"),
-        (["aplay", "-q"], "ALSA"),
-        (["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"], "FFmpeg"),
-    ]
-    for cmd, name in players:
-        try:
-            subprocess.run(
-                [cmd[0], "--help"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            return cmd, name
-        except FileNotFoundError:
-            continue
-    return None, None
-
-
-# Cache the player on first use
-_audio_player_cmd = None
-_audio_player_name = None
-
-
-def _play_audio_subprocess(sound):
-    """Play audio via subprocess — works with Bluetooth, HDMI, USB audio."""
-    global _playback_process, _audio_player_cmd, _audio_player_name
-    tmp_path = None
-    _speaking.set()
+    sound = decode_mp3(audio_stream).set_channels(1).set_sample_width(2)
+    samples = np.frombuffer(sound.raw_data, dtype=np.int16)
+    return _segment(dsp.apply(samples, sound.frame_rate), sound.frame_rate)
+
+
+async def _fetch_speech_async(text, voice_id, feed, timeout=None):
+    """Stream edge-tts audio chunks into a feed, ending it when done or failed.
+
+    With a timeout, the download is abandoned and the feed marked failed if
+    no audio has arrived by then.
+    """
+    task = asyncio.current_task()
+    expired = []
+
+    def expire():
+        expired.append(True)
+        task.cancel()
+
+    watchdog = asyncio.get_running_loop().call_later(timeout, expire) if timeout else None
     try:
-        # Find player once
-        if _audio_player_cmd is None:
-            _audio_player_cmd, _audio_player_name = _find_audio_player()
-            if _audio_player_cmd is None:
-                print("No audio player found. Install pipewire or pulseaudio-utils.")
-                return
+        async for chunk in _communicate(text, voice_id).stream():
+            if feed.closed:
+                break
+            if chunk["type"] == "audio":
+                if watchdog is not None:
+                    watchdog.cancel()
+                    watchdog = None
+                feed.put(chunk["data"])
+    except asyncio.CancelledError:
+        if not expired:
+            raise
+        feed.failed = True
+        print(f"edge-tts sent no audio within {timeout}s")
+    except Exception as e:
+        feed.failed = True
+        print(f"Error generating speech: {e}")
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        feed.end()
+
+
+def _decoded_blocks(feed):
+    """Yield (int16 mono samples, rate) from the feed as the MP3 decodes."""
+    if MINIAUDIO_AVAILABLE:
+        blocks = miniaudio.stream_any(
+            feed,
+            source_format=miniaudio.FileFormat.MP3,
+            output_format=miniaudio.SampleFormat.SIGNED16,
+            nchannels=1,
+            sample_rate=_TTS_RATE,
+            frames_to_read=_DECODE_FRAMES,
+        )
+        for block in blocks:
+            yield np.frombuffer(block, dtype=np.int16), _TTS_RATE
+        return
+    # No incremental decoder — ffmpeg needs the whole MP3
+    data = feed.read_all()
+    if data:
+        sound = decode_mp3(io.BytesIO(data)).set_channels(1).set_sample_width(2)
+        yield np.frombuffer(sound.raw_data, dtype=np.int16), sound.frame_rate
+
+
+def _effect_blocks(pcm_blocks):
+    """Run (int16 mono samples, rate) blocks through the streaming TARS effect chain."""
+    effect = None
+    for samples, rate in pcm_blocks:
+        if effect is None:
+            effect = dsp.VoiceEffect(rate)
+        processed = effect.process(samples)
+        if len(processed):
+            yield _segment(processed, rate)
+    if effect is not None:
+        tail = effect.flush()
+        if len(tail):
+            yield _segment(tail, effect.rate)
+
+
+def _synthesize_blocks(text, voice_id, feed):
+    """Yield finished TARS audio for text block by block while edge-tts is still speaking.
+
+    The download runs on the speech loop into feed; MP3 is decoded as it
+    arrives and each block goes straight through the streaming effect chain.
+    """
+    fetch = _loop.submit(_fetch_speech_async(text, voice_id, feed, config.TTS_TIMEOUT))
+    try:
+        yield from _effect_blocks(_decoded_blocks(feed))
+    finally:
+        feed.close()
+        fetch.cancel()  # abandoned part-way — drop the websocket now
+
+
+def _segment(samples, rate):
+    return AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=rate, channels=1)
+
+
+def _join(blocks):
+    """Concatenate same-format audio blocks in one copy."""
+    if len(blocks) == 1:
+        return blocks[0]
+    first = blocks[0]
+    return AudioSegment(
+        data=b"".join(block.raw_data for block in blocks),
+        sample_width=first.sample_width,
+        frame_rate=first.frame_rate,
+        channels=first.channels,
+    )
+
+
+def _play(sounds, cancelled=None):
+    """Play audio segments back-to-back on the shared output stream.
 
-        # Export pydub audio to a temp WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_path = tmp.name
-        sound.export(tmp_path, format="wav")
-
-        with _playback_lock:
-            _playback_process = subprocess.Popen(
-                _audio_player_cmd + [tmp_path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-        _playback_process.wait()
+    Runs on the playback worker. sounds may be a generator that is still
+    rendering — each block is resampled to the output rate (once,
+    statefully, so block joins are seamless) and queued as soon as it
+    arrives. Returns once it has all played, or as soon as cancelled()
+    turns true — then the output is silenced before the next job starts.
+    """
+    cancelled = cancelled or (lambda: False)
+    stream = output.get()
+    if stream is None:
+        return
+    try:
+        resampler = None
+        for sound in sounds:
+            if cancelled():
+                return
+            if sound.channels != 1 or sound.sample_width != 2:
+                sound = sound.set_channels(1).set_sample_width(2)
+            if resampler is None or resampler.src_rate != sound.frame_rate:
+                resampler = dsp.Resampler(sound.frame_rate, stream.rate)
+            stream.write(resampler.process(np.frombuffer(sound.raw_data, dtype=np.int16)), cancelled)
+        stream.drain(cancelled)
     except Exception as e:
         print(f"Playback error: {e}")
     finally:
-        with _playback_lock:
-            _playback_process = None
-        _speaking.clear()
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+        if cancelled():
+            stream.stop()  # the one stop per interruption — cancellers only cancel the job
 
 
-def play_audio(sound, blocking=True):
-    """Play an audio segment.
+def play_audio(sound, blocking=True, priority=playback.NORMAL):
+    """Queue an audio segment for playback.
 
     Args:
         blocking: If True, wait for playback to finish. If False, return
-                  immediately (playback continues in background thread).
+                  immediately (it plays on the playback worker).
     """
-    t = threading.Thread(target=_play_audio_subprocess, args=(sound,), daemon=True)
-    t.start()
+    job = _queue.submit(lambda job: _play([sound], job.cancelled), priority)
     if blocking:
-        t.join()
+        job.wait()
 
 
 def stop_speaking():
-    """Interrupt current playback immediately."""
-    with _playback_lock:
-        if _playback_process is not None:
-            try:
-                _playback_process.terminate()
-            except Exception:
-                pass
-    _speaking.clear()
+    """Interrupt current playback within one output buffer, and drop everything queued or rendering.
+
+    The cancelled job silences the output itself as it returns (see _play).
+    """
+    _queue.flush()
 
 
-def speak(text, language="english", blocking=True):
+def speak(text, language="english", blocking=True, priority=playback.NORMAL, preempt=False):
     """Full pipeline: generate speech, apply effects, play audio.
 
+    Multi-sentence text is pipelined (see speak_stream), so playback starts
+    as soon as the first sentence is rendered. The same text queued again
+    before it has finished playing is spoken once.
+
     Args:
         blocking: If True (default), wait for playback to finish.
                   If False, return immediately (voice pipeline uses this
                   so it can listen for interruptions while TARS speaks).
+        priority: playback.URGENT jumps ahead of queued NORMAL speech.
+        preempt: Cut off whatever is playing now and speak this next.
+    """
+    speak_stream([text], language, blocking=blocking, priority=priority, preempt=preempt,
+                 key=(text.strip(), language))
+
+
+def speak_stream(segments, language="english", blocking=True, priority=playback.NORMAL, preempt=False,
+                 key=None):
+    """Speak text segments as one gapless utterance, rendering ahead of playback.
+
+    Segments are split into sentences (long ones into clauses). A render
+    thread streams each sentence from edge-tts through the effect chain in
+    small blocks, which play as soon as they are ready; the next sentence
+    renders while the current one plays. segments may still be arriving —
+    e.g. sentences from a streaming AI reply — and is consumed on the
+    render thread. Rendering starts once the utterance is next in line —
+    while the one before it is still playing — not when it is queued.
+
+    Args:
+        priority, preempt: As for speak().
+        key: Coalescing key — a queued or playing utterance with the same
+             key is reused instead of speaking this one.
+    """
+    rendered = queue.Queue()
+    slots = threading.Semaphore(1 + _RENDER_AHEAD)  # sentences rendering or queued
+    finished = threading.Event()  # playback ended — stop rendering
+
+    def take_slot(cancelled):
+        while not cancelled():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def produce(job):
+        def cancelled():
+            return job.cancelled() or finished.is_set()
+
+        try:
+            for segment in segments:
+                for part in _speech_parts(segment):
+                    if not take_slot(cancelled):
+                        return
+                    blocks = _render_blocks(part, language)
+                    try:
+                        for block in blocks:
+                            if cancelled():
+                                return
+                            rendered.put(block)
+                    finally:
+                        blocks.close()
+                    rendered.put(_SEGMENT_END)
+        except Exception as e:
+            print(f"Speech error: {e}")
+        finally:
+            rendered.put(None)
+
+    def consume(job):
+        while not job.cancelled():
+            try:
+                item = rendered.get(timeout=0.05)
+            except queue.Empty:
+                continue  # still rendering — keep checking for cancellation
+            if item is None:
+                return
+            if item is _SEGMENT_END:
+                slots.release()
+                continue
+            yield item
+
+    def play(job):
+        try:
+            _play(consume(job), job.cancelled)
+        finally:
+            finished.set()
+
+    def prepare(job):
+        threading.Thread(target=produce, args=(job,), name="tars-tts-render", daemon=True).start()
+
+    # Preempting cancels the playing job, which silences the output as it returns
+    job = _queue.submit(play, priority, key=key, preempt=preempt, prepare=prepare)
+    if blocking:
+        job.wait()
+
+
+def _speech_parts(text):
+    """Sentences of text, with long sentences cut at clause boundaries."""
+    parts = []
+    for sentence in split_sentences(text):
+        parts.extend(split_clauses(sentence, _MAX_SEGMENT_CHARS))
+    return parts
+
+
+def cached(text, language="english"):
+    """Finished audio for text if it's already in the speech cache, else None — never synthesizes."""
+    return tts_cache.get(_cache_key(text, language))
+
+
+def render(text, language="english", persist=False):
+    """Return finished TARS audio for text — from the cache when possible.
+
+    Args:
+        persist: Write a fresh render straight to the disk cache
+                 (pre-rendering) instead of waiting for it to repeat.
     """
-    audio_stream = generate_speech(text, language)
-    if audio_stream is None:
+    blocks = list(_render_blocks(text, language, persist=persist))
+    return _join(blocks) if blocks else None
+
+
+def _cache_key(text, language):
+    voice = local_tts.voice_name(language) if _use_local() else get_voice_id(language)
+    return tts_cache.key(text, voice)
+
+
+def _render_blocks(text, language="english", persist=False):
+    """Yield finished TARS audio for text: one block on a cache hit, else as it streams.
+
+    edge-tts is tried first unless its breaker is open (or the local engine
+    is the primary); if it fails before producing any audio, the local
+    engine speaks the sentence instead. A render by the primary engine that
+    runs to completion is stored in the cache; fallback audio, and renders
+    abandoned part-way (stop_speaking) or failed, are not.
+    """
+    cache_key = _cache_key(text, language)
+    sound = tts_cache.get(cache_key)
+    if sound is not None:
+        yield sound
         return
-    modified_sound = modify_voice(audio_stream)
-    play_audio(modified_sound, blocking=blocking)
+    if not _initialized:
+        return
+    if not _use_local() and _edge_breaker.allow_request():
+        if (yield from _edge_blocks(text, language, cache_key, persist)):
+            return
+    if not local_tts.is_available():
+        return
+    blocks = []
+    try:
+        for block in _effect_blocks(local_tts.synthesize(text, language)):
+            blocks.append(block)
+            yield block
+    except Exception as e:
+        print(f"Offline speech error: {e}")
+        return
+    if blocks and _use_local():
+        tts_cache.put(cache_key, _join(blocks), persist=persist)
+
+
+def _edge_blocks(text, language, cache_key, persist):
+    """Stream one edge-tts render, reporting the outcome to its breaker.
+
+    Returns True if any audio was produced — even if the download broke off
+    later, since the rest can't be spliced on in another voice.
+    """
+    feed = mp3stream.Mp3Feed()
+    blocks = []
+    started = time.monotonic()
+    first_audio = None
+    finished = False
+    try:
+        for block in _synthesize_blocks(text, get_voice_id(language), feed):
+            if first_audio is None:
+                first_audio = time.monotonic() - started
+            blocks.append(block)
+            yield block
+        finished = True
+    except Exception as e:
+        if not feed.failed:  # a failed download has already been reported
+            print(f"Error generating speech: {e}")
+        feed.failed = True
+    finally:
+        if feed.failed:
+            _edge_breaker.record_failure()
+        elif finished:
+            _edge_breaker.record_success(first_audio)
+        else:
+            _edge_breaker.release()  # abandoned by the listener — no verdict
+    if blocks and not feed.failed:
+        tts_cache.put(cache_key, _join(blocks), persist=persist)
+    return bool(blocks)
+
+
+def prerender(phrases):
+    """Fill the disk cache for (text, language) pairs. Returns how many are ready."""
+    ready = 0
+    for text, language in phrases:
+        # Cached per sentence, the way speak() renders it
+        ready += all(
+            tts_cache.contains(_cache_key(part, language))
+            or render(part, language, persist=True) is not None
+            for part in _speech_parts(text)
+        )
+    return ready
@@ -0,0 +1,370 @@
+"""Speech-to-text backends for TARS — the cloud or the CPU, behind one interface.
+
+Each backend opens a session per utterance. The listener feeds it 16 kHz
+16-bit mono frames as they're captured and calls finish() once the
+speaker stops:
+
+    google — Google Web Speech API via SpeechRecognition. Buffers the
+             audio and makes one round trip after the end of speech.
+             Needs a network.
+    vosk   — Kaldi model on the CPU (pip install vosk, plus a model
+             directory from alphacephei.com/vosk/models). Decodes while
+             the user is still talking and reports partial hypotheses,
+             so finish() only has the last few frames left to decode
+             — tens of milliseconds — and it works offline. The model
+             is loaded once and shared by every session.
+
+voice.stt.engine picks the order: "auto" prefers vosk when a model is
+loaded, "google" uses the cloud with vosk as the fallback, "local" never
+leaves the robot. If a backend can't be reached, the next one decodes
+the same audio — or, with voice.stt.race, all of them decode every
+utterance at once and the most confident answer wins (see Utterance),
+which bounds recognition time when the network is bad. stats() reports
+each backend's latency and how often it won.
+"""
+
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+import speech_recognition as sr
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+from tars import config
+from tars.ai.hedge import LatencyTracker
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+# Seconds a Google request may take; racing, voice.stt.deadline instead — a
+# later answer would be thrown away
+_GOOGLE_TIMEOUT = 10
+
+_backends = {}  # name -> backend, filled by initialize()
+_stats = {}  # backend name -> runs, wins, failures, timeouts, latency
+_stats_lock = threading.Lock()
+
+
+class Unavailable(Exception):
+    """A backend can't be reached (no network, service down, no model)."""
+
+
+class Result:
+    """A final transcript, the backend's confidence in it (0-1, None if unknown) and who produced it."""
+
+    def __init__(self, text, confidence=None, backend=None):
+        self.text = text
+        self.confidence = confidence
+        self.backend = backend
+
+    def __repr__(self):
+        return f"Result({self.text!r}, {self.confidence!r}, {self.backend!r})"
+
+
+class GoogleBackend:
+    """Google Web Speech API — one request per utterance, after it ends."""
+
+    name = "google"
+
+    def __init__(self, timeout=_GOOGLE_TIMEOUT):
+        self._recognizer = sr.Recognizer()
+        self._recognizer.operation_timeout = timeout
+
+    def session(self):
+        return _BufferedSession(self.recognize)
+
+    def recognize(self, data):
+        audio = sr.AudioData(data, SAMPLE_RATE, SAMPLE_WIDTH)
+        try:
+            text, confidence = self._recognizer.recognize_google(audio, with_confidence=True)
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            raise Unavailable(str(e)) from e
+        return Result(text, confidence, self.name)
+
+
+class _BufferedSession:
+    """Session for a batch backend: keeps the frames, recognizes them all at finish()."""
+
+    def __init__(self, recognize):
+        self._recognize = recognize
+        self._chunks = []
+
+    def feed(self, frame):
+        self._chunks.append(bytes(frame))
+        return None
+
+    def finish(self):
+        return self._recognize(b"".join(self._chunks))
+
+
+class VoskBackend:
+    """Streaming Kaldi recognizer on a shared, already loaded vosk.Model."""
+
+    name = "vosk"
+
+    def __init__(self, model):
+        self.model = model
+
+    def session(self, grammar=None):
+        """A new session; with grammar (a list of phrases), only those can be recognized."""
+        return _VoskSession(self.model, grammar)
+
+
+class _VoskSession:
+    def __init__(self, model, grammar=None):
+        if grammar is None:
+            self._recognizer = vosk.KaldiRecognizer(model, SAMPLE_RATE)
+        else:
+            # Anything outside the grammar decodes as [unk]
+            self._recognizer = vosk.KaldiRecognizer(model, SAMPLE_RATE, json.dumps([*grammar, "[unk]"]))
+        self._recognizer.SetWords(True)
+        self._segments = []  # finished segments — Kaldi ends one at each pause it hears
+
+    def feed(self, frame):
+        """Decode a frame; returns the hypothesis so far."""
+        if self._recognizer.AcceptWaveform(bytes(frame)):
+            self._segments.append(json.loads(self._recognizer.Result()))
+            return self._text()
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        return " ".join(filter(None, (self._text(), partial)))
+
+    def finish(self):
+        self._segments.append(json.loads(self._recognizer.FinalResult()))
+        text = self._text()
+        if not text:
+            return None
+        words = [word for segment in self._segments for word in segment.get("result", [])]
+        confidence = sum(word["conf"] for word in words) / len(words) if words else None
+        return Result(text, confidence, VoskBackend.name)
+
+    def _text(self):
+        return " ".join(filter(None, (segment.get("text", "") for segment in self._segments)))
+
+
+class Utterance:
+    """One command in progress.
+
+    fallback — frames stream into the first backend's session as they're
+               captured; if that backend turns out to be unreachable, the
+               next one decodes the kept audio.
+    race     — every backend gets its own session and the same frames;
+               at the end they all finish concurrently, one worker each.
+               The first result with confidence of at least min_confidence
+               wins; otherwise the most confident one in by the deadline.
+
+    A fast path (feed/finish, like a session) decodes the same frames
+    alongside; when its finish() returns a Result, that is the answer and
+    the backends are never asked.
+    """
+
+    def __init__(self, backends, on_partial=None, fast_path=None, race=False,
+                 min_confidence=0.8, deadline=3.0):
+        self.backends = backends
+        self.on_partial = on_partial
+        self.fast_path = fast_path
+        self.race = race and len(backends) > 1
+        self.min_confidence = min_confidence
+        self.deadline = deadline
+        # Racing, every backend decodes as the audio arrives; otherwise only the first
+        self._sessions = [backend.session() for backend in (backends if self.race else backends[:1])]
+        self._frames = []
+        self._partial = ""
+
+    def feed(self, frame):
+        frame = bytes(frame)
+        if not self.race:
+            self._frames.append(frame)  # for the fallbacks
+        if self.fast_path is not None:
+            self.fast_path.feed(frame)
+        partial = None
+        for session in self._sessions:
+            partial = session.feed(frame) or partial
+        if partial and partial != self._partial:
+            self._partial = partial
+            if self.on_partial:
+                self.on_partial(partial)
+
+    def finish(self):
+        """The recognized Result, or None if the speech wasn't understood.
+
+        Raises Unavailable if no backend could be reached (in time).
+        """
+        if self.fast_path is not None:
+            try:
+                result = self.fast_path.finish()
+            except Exception as e:
+                print(f"Fast path recognition error: {e}")
+                result = None
+            if result is not None:
+                return result
+        if self.race:
+            return _race(list(zip(self.backends, self._sessions)), self.min_confidence, self.deadline)
+
+        error = Unavailable("no speech recognizer")
+        for index, backend in enumerate(self.backends):
+            session = self._sessions[0] if index == 0 else _replay(backend, self._frames)
+            try:
+                result = _finish(backend, session)
+            except Unavailable as e:
+                print(f"Speech recognition ({backend.name}) unavailable: {e}")
+                error = e
+                continue
+            if result is not None:
+                _record(backend.name, "wins")
+            return result
+        raise error
+
+
+def _replay(backend, frames):
+    session = backend.session()
+    for frame in frames:
+        session.feed(frame)
+    return session
+
+
+def _finish(backend, session):
+    """session.finish(), timed into the backend's stats."""
+    _record(backend.name, "runs")
+    started = time.monotonic()
+    try:
+        result = session.finish()
+    except Exception:
+        _record(backend.name, "failures")
+        raise
+    _record(backend.name, "latency", time.monotonic() - started)
+    return result
+
+
+def _race(entries, min_confidence, deadline):
+    # A worker per backend, per race: a straggler from the last utterance
+    # can't hold up this one
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(entries), thread_name_prefix="tars-stt")
+    futures = {pool.submit(_finish, backend, session): backend for backend, session in entries}
+    pool.shutdown(wait=False)
+    best = None
+    failed = 0
+    pending = set(futures)
+    try:
+        for future in concurrent.futures.as_completed(futures, timeout=deadline):
+            pending.discard(future)
+            backend = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Speech recognition ({backend.name}) failed: {e}")
+                failed += 1
+                continue
+            if result is None:
+                continue
+            if (result.confidence or 0) >= min_confidence:
+                best = (result, backend)
+                break
+            if best is None or (result.confidence or 0) > (best[0].confidence or 0):
+                best = (result, backend)
+    except concurrent.futures.TimeoutError:
+        # Stragglers finish in the background; their latency is still recorded
+        for future in pending:
+            _record(futures[future].name, "timeouts")
+
+    if best is not None:
+        _record(best[1].name, "wins")
+        return best[0]
+    if failed == len(entries):
+        raise Unavailable("every recognizer failed")
+    if pending and failed + len(pending) == len(entries):
+        raise Unavailable(f"no recognizer answered within {deadline:.1f}s")
+    return None
+
+
+def _record(name, counter, latency=None):
+    """Count an event for a backend, or record a latency sample with counter "latency"."""
+    with _stats_lock:
+        if name not in _stats:
+            _stats[name] = {"latency": LatencyTracker(window=50, min_samples=1),
+                            "runs": 0, "wins": 0, "failures": 0, "timeouts": 0}
+        if latency is not None:
+            _stats[name]["latency"].record(latency)
+        else:
+            _stats[name][counter] += 1
+
+
+def stats():
+    """Per-backend runs, wins, win rate, failures, timeouts and median/p90 latency (seconds)."""
+    with _stats_lock:
+        return {
+            name: {
+                "runs": entry["runs"],
+                "wins": entry["wins"],
+                "win_rate": entry["wins"] / entry["runs"] if entry["runs"] else 0.0,
+                "failures": entry["failures"],
+                "timeouts": entry["timeouts"],
+                "p50": entry["latency"].percentile(50),
+                "p90": entry["latency"].percentile(90),
+            }
+            for name, entry in _stats.items()
+        }
+
+
+def initialize():
+    """Set up Google recognition and load the Vosk model, if one is configured."""
+    _backends.clear()
+    _backends["google"] = GoogleBackend(config.STT_DEADLINE if config.STT_RACE else _GOOGLE_TIMEOUT)
+    model_path = os.path.expanduser(config.VOSK_MODEL or "")
+    if not VOSK_AVAILABLE:
+        if config.STT_ENGINE == "local":
+            print("Offline speech recognition unavailable (pip install vosk)")
+        return
+    if not os.path.isdir(model_path):
+        if config.STT_ENGINE == "local":
+            print(f"Vosk model not found: {model_path}")
+        return
+    try:
+        vosk.SetLogLevel(-1)
+        _backends["vosk"] = VoskBackend(vosk.Model(model_path))
+        print(f"Offline speech recognition: Vosk ({os.path.basename(model_path.rstrip('/'))})")
+    except Exception as e:
+        print(f"Vosk model failed to load: {e}")
+
+
+def backends():
+    """Backends to try, in order, for voice.stt.engine."""
+    if not _backends:
+        initialize()
+    return _ordered()
+
+
+def _ordered():
+    local, cloud = _backends.get("vosk"), _backends.get("google")
+    if config.STT_ENGINE == "local":
+        order = [local]
+    elif config.STT_ENGINE == "google":
+        order = [cloud, local]
+    else:
+        order = [local, cloud]
+    return [backend for backend in order if backend is not None]
+
+
+def engines():
+    """Names of the backends in use, in order — for status display. Empty before initialize()."""
+    return [backend.name for backend in _ordered()]
+
+
+def local_model():
+    """The loaded vosk.Model, or None — shared with the keyword recognizer."""
+    backend = _backends.get("vosk")
+    return backend.model if backend else None
+
+
+def utterance(on_partial=None, fast_path=None):
+    """Start recognizing a new utterance; on_partial(text) gets the hypothesis as it grows."""
+    return Utterance(backends(), on_partial, fast_path, race=config.STT_RACE,
+                     min_confidence=config.STT_MIN_CONFIDENCE, deadline=config.STT_DEADLINE)
@@ -0,0 +1,197 @@
+"""On-disk cache of finished TARS speech — repeated phrases skip edge-tts and effects.
+
+Entries are content-addressed: the file name is a hash of the text, voice
+and every setting that changes the final audio (rate, pitch, playback
+speed, filters, gain). Audio is stored post-effect as 16-bit PCM WAV, so a
+hit plays with no network and no DSP.
+
+To spare the SD card, one-off chat replies aren't written straight to
+disk: the last few renders are kept in memory and only promoted to disk
+when the same phrase comes up again. Pre-rendered phrases (see
+speaker.prerender) are written immediately. The directory is capped at
+voice.cache.max_mb, evicting least recently played files first.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import wave
+from collections import OrderedDict
+
+from pydub import AudioSegment
+
+from tars import config
+
+# Bump when the effect chain changes so old renders are never played
+_FORMAT_VERSION = 2
+
+# Recent renders kept in memory until they repeat
+_RECENT_SIZE = 8
+
+_lock = threading.Lock()
+_index = None  # OrderedDict key -> file size, least recently used first
+_total_bytes = 0
+_recent = OrderedDict()
+
+
+def key(text, voice_id):
+    """Cache key for a phrase rendered with the current voice settings."""
+    params = [
+        _FORMAT_VERSION,
+        text.strip(),
+        voice_id,
+        config.SPEECH_RATE,
+        config.SPEECH_PITCH,
+        config.PLAYBACK_SPEED,
+        config.HIGH_PASS_FILTER,
+        config.LOW_PASS_FILTER,
+        config.VOLUME_REDUCTION,
+        config.VOLUME_BOOST,
+    ]
+    return hashlib.sha256(json.dumps(params, ensure_ascii=False).encode()).hexdigest()
+
+
+def get(cache_key):
+    """Return the cached AudioSegment for a key, or None."""
+    if not config.TTS_CACHE_ENABLED:
+        return None
+    with _lock:
+        _load_index()
+        on_disk = cache_key in _index
+        if on_disk:
+            _index.move_to_end(cache_key)
+        recent = _recent.pop(cache_key, None)
+
+    if on_disk:
+        sound = _read(cache_key)
+        if sound is not None:
+            return sound
+    if recent is not None:
+        # Second time we've heard this phrase — worth keeping on disk
+        _write(cache_key, recent)
+    return recent
+
+
+def put(cache_key, sound, persist=False):
+    """Cache rendered audio — in memory only, unless persist is set."""
+    if not config.TTS_CACHE_ENABLED:
+        return
+    if persist:
+        _write(cache_key, sound)
+        return
+    with _lock:
+        _recent[cache_key] = sound
+        _recent.move_to_end(cache_key)
+        while len(_recent) > _RECENT_SIZE:
+            _recent.popitem(last=False)
+
+
+def contains(cache_key):
+    """True if the key is stored on disk."""
+    with _lock:
+        _load_index()
+        return cache_key in _index
+
+
+def clear():
+    """Delete every cached file."""
+    global _total_bytes
+    with _lock:
+        _load_index()
+        for cache_key in list(_index):
+            _unlink(cache_key)
+        _index.clear()
+        _recent.clear()
+        _total_bytes = 0
+
+
+def stats():
+    """Return file count and total size for status display."""
+    with _lock:
+        _load_index()
+        return {"files": len(_index), "bytes": _total_bytes}
+
+
+def _cache_dir():
+    return os.path.expanduser(config.TTS_CACHE_DIR)
+
+
+def _path(cache_key):
+    return os.path.join(_cache_dir(), f"{cache_key}.wav")
+
+
+def _load_index():
+    """Scan the cache directory once (lock held), oldest access first."""
+    global _index, _total_bytes
+    if _index is not None:
+        return
+    _index = OrderedDict()
+    _total_bytes = 0
+    try:
+        entries = [e for e in os.scandir(_cache_dir()) if e.name.endswith(".wav")]
+    except FileNotFoundError:
+        return
+    for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+        size = entry.stat().st_size
+        _index[entry.name[:-4]] = size
+        _total_bytes += size
+
+
+def _read(cache_key):
+    """Load a cached file and mark it recently used; None if it's unreadable."""
+    global _total_bytes
+    path = _path(cache_key)
+    try:
+        with wave.open(path, "rb") as wav:
+            sound = AudioSegment(
+                data=wav.readframes(wav.getnframes()),
+                sample_width=wav.getsampwidth(),
+                frame_rate=wav.getframerate(),
+                channels=wav.getnchannels(),
+            )
+        os.utime(path)
+        return sound
+    except (OSError, EOFError, wave.Error) as e:
+        print(f"Speech cache read failed: {e}")
+        with _lock:
+            _total_bytes -= _index.pop(cache_key, 0)
+        return None
+
+
+def _write(cache_key, sound):
+    """Write audio atomically, then evict old files over the size cap."""
+    global _total_bytes
+    path = _path(cache_key)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(sound.channels)
+            wav.setsampwidth(sound.sample_width)
+            wav.setframerate(sound.frame_rate)
+            wav.writeframes(sound.raw_data)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+    except OSError as e:
+        print(f"Speech cache write failed: {e}")
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        return
+
+    limit = config.TTS_CACHE_MAX_MB * 1024 * 1024
+    with _lock:
+        _load_index()
+        _total_bytes += size - _index.pop(cache_key, 0)
+        _index[cache_key] = size
+        while _total_bytes > limit and len(_index) > 1:
+            oldest, oldest_size = _index.popitem(last=False)
+            _total_bytes -= oldest_size
+            _unlink(oldest)
+
+
+def _unlink(cache_key):
+    try:
+        os.unlink(_path(cache_key))
+    except FileNotFoundError:
+        pass
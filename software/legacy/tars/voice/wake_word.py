@@ -2,17 +2,16 @@
 
 Uses openwakeword for local, offline wake word detection.
 Falls back to keyboard trigger if openwakeword is not installed.
+Audio comes from the always-on capture ring buffer (see tars.voice.capture);
+detected_at records where the wake word ended so the listener can pick
+up from exactly there.
 """
 
 import threading
-import time
 
-try:
-    import pyaudio
+import numpy as np
 
-    PYAUDIO_AVAILABLE = True
-except ImportError:
-    PYAUDIO_AVAILABLE = False
+from tars.voice import capture
 
 try:
     from openwakeword.model import Model as OWWModel
@@ -22,10 +21,9 @@ try:
 except ImportError:
     OWW_AVAILABLE = False
 
-# Audio stream settings for wake word detection
+# Audio settings for wake word detection
 CHUNK_SIZE = 1280  # ~80ms at 16kHz
-SAMPLE_RATE = 16000
-FORMAT_INT16 = 8  # pyaudio.paInt16
+SAMPLE_RATE = capture.SAMPLE_RATE
 
 
 class WakeWordDetector:
@@ -34,11 +32,10 @@ class WakeWordDetector:
     def __init__(self, threshold=0.5):
         self.threshold = threshold
         self._model = None
-        self._stream = None
-        self._audio = None
         self._available = False
+        self.detected_at = None  # capture position where the last wake word ended
 
-        if OWW_AVAILABLE and PYAUDIO_AVAILABLE:
+        if OWW_AVAILABLE and capture.PYAUDIO_AVAILABLE:
             try:
                 # Download models if not already present
                 print("Checking wake word models...")
@@ -58,7 +55,7 @@ class WakeWordDetector:
             missing = []
             if not OWW_AVAILABLE:
                 missing.append("openwakeword")
-            if not PYAUDIO_AVAILABLE:
+            if not capture.PYAUDIO_AVAILABLE:
                 missing.append("pyaudio")
             print(f"Wake word unavailable (missing: {', '.join(missing)})")
 
@@ -68,39 +65,31 @@ class WakeWordDetector:
 
     def listen_for_wake_word(self, shutdown_event=None):
         """Block until wake word is detected. Returns True on detection, False on shutdown."""
+        self.detected_at = None
         if not self._available:
             # Fallback: wait for Enter key press
             return self._keyboard_fallback(shutdown_event)
 
-        try:
-            self._audio = pyaudio.PyAudio()
-            self._stream = self._audio.open(
-                format=FORMAT_INT16,
-                channels=1,
-                rate=SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=CHUNK_SIZE,
-            )
-        except Exception as e:
-            print(f"Mic error for wake word: {e}")
+        if not capture.start():
+            print("Mic error for wake word: no capture")
             return self._keyboard_fallback(shutdown_event)
 
-        try:
-            while shutdown_event is None or not shutdown_event.is_set():
-                audio_data = self._stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                prediction = self._model.predict(audio_data)
-
-                # Check all wake word models for activation
-                for model_name, score in prediction.items():
-                    if score > self.threshold:
-                        self._model.reset()
-                        return True
-
-                time.sleep(0.01)
-        except Exception:
-            pass
-        finally:
-            self._cleanup()
+        # Starts at the live edge — anything said before now isn't a wake word
+        reader = capture.reader()
+        while shutdown_event is None or not shutdown_event.is_set():
+            view = reader.read(CHUNK_SIZE, timeout=0.5)
+            if view is None:
+                if not capture.is_running():
+                    return self._keyboard_fallback(shutdown_event)
+                continue
+            prediction = self._model.predict(np.frombuffer(view, dtype=np.int16))
+
+            # Check all wake word models for activation
+            for model_name, score in prediction.items():
+                if score > self.threshold:
+                    self._model.reset()
+                    self.detected_at = reader.position
+                    return True
 
         return False
 
@@ -127,19 +116,3 @@ class WakeWordDetector:
             done.wait(timeout=0.2)
 
         return result[0]
-
-    def _cleanup(self):
-        """Clean up audio resources."""
-        if self._stream:
-            try:
-                self._stream.stop_stream()
-                self._stream.close()
-            except Exception:
-                pass
-            self._stream = None
-        if self._audio:
-            try:
-                self._audio.terminate()
-            except Exception:
-                pass
-            self._audio = None
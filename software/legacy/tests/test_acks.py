@@ -0,0 +1,92 @@
+"""Tests for tars/ai/acks.py — pre-generated acknowledgement pool."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from tars.ai import acks
+
+
+@pytest.fixture(autouse=True)
+def empty_pool():
+    acks.clear()
+    yield
+    acks.clear()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@patch("tars.ai.acks.chat")
+def test_miss_schedules_refill(mock_chat):
+    """A miss returns None and fills the pool in the background."""
+    mock_chat.is_available.return_value = True
+    mock_chat.generate.return_value = "Walking. Try to keep up."
+
+    assert acks.take("Moving forward", 0.5, 0.5, "english") is None
+    assert _wait_for(lambda: sum(acks.pool_sizes().values()) == 3)
+    assert acks.take("Moving forward", 0.5, 0.5, "english") == "Walking. Try to keep up."
+
+
+@patch("tars.ai.acks.chat")
+def test_nearby_settings_share_a_bucket(mock_chat):
+    """Humor 0.52 and 0.48 land in the same pool."""
+    mock_chat.is_available.return_value = True
+    mock_chat.generate.return_value = "Left it is."
+
+    acks.prefill(honesty=0.5, humor=0.52, target_language="english")
+    assert _wait_for(lambda: len(acks.pool_sizes()) == len(acks.PROMPTS)
+                     and all(n == 3 for n in acks.pool_sizes().values()))
+    assert acks.take("Turning left", 0.5, 0.48, "english") == "Left it is."
+    assert acks.take("Turning left", 0.5, 0.48, "spanish") is None
+
+
+@patch("tars.ai.acks.chat")
+def test_clear_drops_replies(mock_chat):
+    """clear() empties every pool."""
+    mock_chat.is_available.return_value = True
+    mock_chat.generate.return_value = "Bye."
+
+    acks.take("Goodbye")
+    assert _wait_for(lambda: sum(acks.pool_sizes().values()) == 3)
+    acks.clear()
+    assert acks.pool_sizes() == {}
+
+
+@patch("tars.ai.acks.chat")
+def test_failed_generation_leaves_pool_empty(mock_chat):
+    """Nothing is pooled when the AI is unreachable."""
+    mock_chat.is_available.return_value = True
+    mock_chat.generate.return_value = None
+
+    acks.take("Goodbye")
+    assert _wait_for(lambda: mock_chat.generate.called)
+    assert acks.take("Goodbye") is None
+
+
+@patch("tars.ai.acks.chat")
+def test_generation_error_doesnt_stop_later_refills(mock_chat):
+    """An exception from the AI is a miss, not the end of the refill worker."""
+    mock_chat.is_available.return_value = True
+    mock_chat.generate.side_effect = [RuntimeError("connection reset")] + ["Bye."] * 3
+
+    acks.take("Goodbye")
+    assert _wait_for(lambda: not acks._pending)
+    assert acks.take("Goodbye") is None  # the next miss retries
+    assert _wait_for(lambda: sum(acks.pool_sizes().values()) == 3)
+    assert acks.take("Goodbye") == "Bye."
+
+
+@patch("tars.ai.acks.config.ACK_POOL_ENABLED", False)
+@patch("tars.ai.acks.chat")
+def test_disabled_pool_never_generates(mock_chat):
+    """With the pool disabled, take() is always a miss and nothing is generated."""
+    assert acks.take("Goodbye") is None
+    mock_chat.generate.assert_not_called()
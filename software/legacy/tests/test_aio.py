@@ -0,0 +1,47 @@
+"""Tests for tars/utils/aio.py — the background event loop thread."""
+
+import asyncio
+
+import pytest
+
+from tars.utils.aio import LoopThread
+
+
+def test_run_returns_result():
+    """run() blocks for a coroutine's result from another thread."""
+    loop = LoopThread("test-loop")
+
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    assert loop.run(add(2, 3)) == 5
+
+
+def test_iterate_yields_and_propagates_errors():
+    """iterate() turns an async generator into a plain one, errors included."""
+    loop = LoopThread("test-loop")
+
+    async def numbers():
+        yield 1
+        yield 2
+        raise ValueError("boom")
+
+    seen = []
+    with pytest.raises(ValueError):
+        for n in loop.iterate(numbers()):
+            seen.append(n)
+    assert seen == [1, 2]
+
+
+def test_run_from_loop_thread_raises():
+    """Blocking on the loop from inside it would deadlock — refuse instead."""
+    loop = LoopThread("test-loop")
+
+    async def nested():
+        inner = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            loop.run(inner)
+        return True
+
+    assert loop.run(nested())
@@ -0,0 +1,87 @@
+"""Tests for tars/ai/breaker.py — circuit breaker state transitions."""
+
+import threading
+from unittest.mock import patch
+
+from tars.ai.breaker import BreakerState, CircuitBreaker
+
+
+def test_starts_closed():
+    """A new breaker allows requests."""
+    cb = CircuitBreaker("test")
+    assert cb.state == BreakerState.CLOSED
+    assert cb.allow_request() is True
+
+
+def test_opens_after_consecutive_failures():
+    """Consecutive failures open the breaker and requests are skipped."""
+    cb = CircuitBreaker("test", consecutive_failures=3, cooldown=60)
+    for _ in range(3):
+        cb.record_failure()
+    assert cb.state == BreakerState.OPEN
+    assert cb.allow_request() is False
+    assert cb.snapshot()["skipped"] == 1
+
+
+def test_opens_on_error_rate():
+    """A high error rate over the window opens the breaker."""
+    cb = CircuitBreaker("test", window=4, error_rate=0.5, consecutive_failures=10)
+    cb.record_success()
+    cb.record_failure()
+    cb.record_success()
+    cb.record_failure()
+    assert cb.state == BreakerState.OPEN
+
+
+@patch("tars.ai.breaker.time.monotonic")
+def test_half_open_after_cooldown_without_probe(mock_time):
+    """Without a probe, one trial request is allowed after the cooldown."""
+    mock_time.return_value = 100.0
+    cb = CircuitBreaker("test", consecutive_failures=1, cooldown=30)
+    cb.record_failure()
+    mock_time.return_value = 131.0
+    assert cb.allow_request() is True
+    assert cb.state == BreakerState.HALF_OPEN
+    assert cb.allow_request() is False  # only one trial at a time
+    cb.record_success(0.2)
+    assert cb.state == BreakerState.CLOSED
+
+
+@patch("tars.ai.breaker.time.monotonic")
+def test_failed_trial_reopens(mock_time):
+    """A failed half-open trial opens the breaker again."""
+    mock_time.return_value = 0.0
+    cb = CircuitBreaker("test", consecutive_failures=1, cooldown=10)
+    cb.record_failure()
+    mock_time.return_value = 11.0
+    assert cb.allow_request() is True
+    cb.record_failure()
+    assert cb.state == BreakerState.OPEN
+
+
+def test_background_probe_moves_to_half_open():
+    """A successful background probe lets the next request through as a trial."""
+    probed = threading.Event()
+
+    def probe():
+        probed.set()
+        return True
+
+    cb = CircuitBreaker("test", consecutive_failures=1, cooldown=0.01, probe=probe)
+    cb.record_failure()
+    assert probed.wait(1)
+    for _ in range(100):
+        if cb.state == BreakerState.HALF_OPEN:
+            break
+        threading.Event().wait(0.01)
+    assert cb.state == BreakerState.HALF_OPEN
+
+
+def test_snapshot_reports_latency():
+    """Snapshot includes counters and latency percentiles."""
+    cb = CircuitBreaker("test")
+    cb.record_success(0.5)
+    snap = cb.snapshot()
+    assert snap["state"] == "closed"
+    assert snap["requests"] == 1
+    assert snap["p95"] == 0.5
@@ -0,0 +1,77 @@
+"""Tests for tars/ai/cache.py — semantic response cache."""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from tars.ai import cache
+
+BUCKET = ("english", 0.5, 0.5)
+
+
+def test_normalize_ignores_case_and_punctuation():
+    assert cache.normalize("  What ARE you?! ") == "what are you"
+
+
+def test_embed_is_unit_length_and_similar_for_near_duplicates():
+    a = cache.embed(cache.normalize("what are you"))
+    b = cache.embed(cache.normalize("so what are you"))
+    c = cache.embed(cache.normalize("tell me a joke"))
+    assert np.isclose(np.linalg.norm(a), 1.0)
+    assert a @ b > 0.8
+    assert a @ c < 0.5
+
+
+def test_near_duplicate_hit_and_unrelated_miss():
+    """A rephrased question hits; a different one misses."""
+    responses = cache.ResponseCache(max_entries=8, similarity=0.8)
+    responses.put("What are you?", BUCKET, "A robot. Obviously.")
+    assert responses.get("what are you", BUCKET) == "A robot. Obviously."
+    assert responses.get("so what are you?", BUCKET) == "A robot. Obviously."
+    assert responses.get("tell me a joke", BUCKET) is None
+    assert responses.hits == 2 and responses.misses == 1
+
+
+def test_questions_about_different_numbers_miss():
+    """Nearly identical text, but a different sum needs a different answer."""
+    responses = cache.ResponseCache(max_entries=8)
+    responses.put("What is 12 times 4?", BUCKET, "48. Even I find that easy.")
+    assert responses.get("what is 12 times 5", BUCKET) is None
+    assert responses.get("what is twelve times 4", BUCKET) is None
+    assert responses.get("so what is 12 times 4", BUCKET) == "48. Even I find that easy."
+
+
+def test_buckets_are_separate():
+    """Answers in one language/personality don't leak into another."""
+    responses = cache.ResponseCache(max_entries=8)
+    responses.put("tell me a joke", BUCKET, "No.")
+    assert responses.get("tell me a joke", ("spanish", 0.5, 0.5)) is None
+
+
+def test_entries_expire():
+    responses = cache.ResponseCache(max_entries=8, ttl=10)
+    with patch("tars.ai.cache.time.monotonic", return_value=100.0):
+        responses.put("tell me a joke", BUCKET, "No.")
+    with patch("tars.ai.cache.time.monotonic", return_value=111.0):
+        assert responses.get("tell me a joke", BUCKET) is None
+        assert responses.get("tell me a joke please", BUCKET) is None
+
+
+def test_lru_eviction():
+    """The least recently used entry makes room for a new one."""
+    responses = cache.ResponseCache(max_entries=2)
+    clock = iter(range(100))
+    with patch("tars.ai.cache.time.monotonic", side_effect=lambda: float(next(clock))):
+        responses.put("what are you", BUCKET, "A robot.")
+        responses.put("tell me a joke", BUCKET, "No.")
+        assert responses.get("what are you", BUCKET) == "A robot."
+        responses.put("whats your humor setting", BUCKET, "Seventy-five percent.")
+        assert len(responses) == 2
+        assert responses.get("what are you", BUCKET) == "A robot."
+        assert responses.get("tell me a joke", BUCKET) is None
+
+
+@patch("tars.ai.cache.config.AI_CACHE_ENABLED", False)
+def test_disabled_by_default():
+    cache.store("what are you", "A robot.")
+    assert cache.lookup("what are you") is None
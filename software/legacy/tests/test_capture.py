@@ -0,0 +1,85 @@
+"""Tests for tars/voice/capture.py — the shared microphone ring buffer."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from tars.voice import capture, listener, stt
+
+
+@pytest.fixture
+def ring():
+    """A small ring with capture 'running', fed by the test instead of a mic."""
+    buffer = capture.RingBuffer(1000)
+    with patch.object(capture, "_ring", buffer), patch.object(capture, "_running", True):
+        yield buffer
+
+
+def _feed(start, count):
+    capture._publish(np.arange(start, start + count, dtype=np.int16))
+
+
+def test_views_are_contiguous_and_zero_copy_across_the_wrap(ring):
+    _feed(0, 900)
+    _feed(900, 300)  # wraps
+    view = ring.view(700, 1200)
+    assert np.array_equal(np.frombuffer(view, dtype=np.int16), np.arange(700, 1200))
+    assert view.obj is ring._data  # points into the ring, nothing copied
+    with pytest.raises(IndexError):
+        ring.view(100, 300)  # overwritten
+
+
+def test_readers_have_independent_cursors_and_preroll(ring):
+    _feed(0, 400)
+    wake = capture.reader()
+    late = capture.reader(preroll=100 / capture.SAMPLE_RATE)
+    _feed(400, 200)
+
+    assert list(np.frombuffer(wake.read(200), dtype=np.int16)[[0, -1]]) == [400, 599]
+    assert np.frombuffer(late.read(300), dtype=np.int16)[0] == 300
+    assert wake.read(10, timeout=0.01) is None  # nothing new yet
+
+
+def test_read_blocks_until_captured(ring):
+    reader = capture.reader()
+    timer = threading.Timer(0.05, _feed, args=(0, 320))
+    timer.start()
+    view = reader.read(320, timeout=2)
+    assert view is not None and len(view) == 320
+
+
+def test_lagging_reader_skips_to_oldest_audio(ring):
+    reader = capture.reader()
+    _feed(0, 1500)
+    view = reader.read(100)
+    assert np.frombuffer(view, dtype=np.int16)[0] == 500
+    assert reader.dropped == 500
+
+
+def test_listener_picks_up_where_wake_word_ended(ring):
+    """Handoff loses nothing: recognition starts at the wake word's end position."""
+    wake = capture.reader()
+    _feed(0, 600)
+    wake.read(400)
+    detected_at = wake.position
+    _feed(600, 500)  # the command, captured while the listener gets going
+
+    heard = []
+
+    def fake_listen(source, timeout=None, phrase_time_limit=None):
+        heard.append(np.frombuffer(source.stream.read(200), dtype=np.int16))
+        return MagicMock()
+
+    utterance = MagicMock()
+    utterance.finish.return_value = stt.Result("Turn Left")
+    with patch.object(listener.vad, "is_available", return_value=False), \
+            patch.object(listener, "_calibrated", True), \
+            patch.object(listener.capture, "start", return_value=True), \
+            patch.object(listener.stt, "utterance", return_value=utterance), \
+            patch.object(listener, "_get_recognizer") as mock_recognizer:
+        mock_recognizer.return_value.listen.side_effect = fake_listen
+        assert listener.listen(start=detected_at) == "turn left"
+
+    assert heard[0][0] == 400
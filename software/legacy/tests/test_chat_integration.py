@@ -1,6 +1,22 @@
 """Integration tests for tars/ai/chat.py — Cerebras, OpenAI, and local LLM."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from tars.ai import chat
+
+
+async def _async_iter(items):
+    for item in items:
+        yield item
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """Give each test healthy circuit breakers."""
+    with patch("tars.ai.chat._breakers", chat._new_breakers()):
+        yield
 
 
 @patch("tars.ai.chat.local_llm")
@@ -15,7 +31,7 @@ def test_get_response_cerebras_success(mock_client, mock_local):
     mock_choice.message.content = "I'm TARS. I have a humor setting."
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
     result = get_response("Hello")
     assert result == "I'm TARS. I have a humor setting."
@@ -33,7 +49,7 @@ def test_get_response_openai_fallback(mock_client, mock_local):
     mock_choice.message.content = "OpenAI response."
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
     result = get_response("Hello")
     assert result == "OpenAI response."
@@ -47,9 +63,9 @@ def test_get_response_falls_back_to_local(mock_client, mock_local):
     """Falls back to local LLM when Cerebras fails."""
     from tars.ai.chat import get_response
 
-    mock_client.chat.completions.create.side_effect = Exception("API error")
+    mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
     mock_local.is_available.return_value = True
-    mock_local.get_response.return_value = "Local response here."
+    mock_local.get_response_async = AsyncMock(return_value="Local response here.")
 
     result = get_response("Hello")
     assert result == "Local response here."
@@ -80,7 +96,7 @@ def test_get_response_passes_personality(mock_client, mock_local):
     mock_choice.message.content = "Response"
     mock_response = MagicMock()
     mock_response.choices = [mock_choice]
-    mock_client.chat.completions.create.return_value = mock_response
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
 
     get_response("Hello", honesty=0.9, humor=0.8, target_language="spanish")
 
@@ -90,3 +106,172 @@ def test_get_response_passes_personality(mock_client, mock_local):
     assert "90.0%" in system_msg  # honesty
     assert "80.0%" in system_msg  # humor
     assert "spanish" in system_msg
+
+
+def _stream_chunk(text):
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = text
+    return chunk
+
+
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", False)
+def test_get_response_stream_yields_chunks(mock_client, mock_local):
+    """Streams Cerebras tokens as they arrive."""
+    from tars.ai.chat import get_response_stream
+
+    mock_local.is_available.return_value = False
+    mock_client.chat.completions.create = AsyncMock(return_value=_async_iter(
+        [_stream_chunk("I'm "), _stream_chunk(None), _stream_chunk("TARS.")]
+    ))
+
+    chunks = list(get_response_stream("Hello"))
+    assert chunks == ["I'm ", "TARS."]
+    assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", False)
+def test_get_response_stream_falls_back_before_first_token(mock_client, mock_local):
+    """Falls back to the local LLM stream when Cerebras fails up front."""
+    from tars.ai.chat import get_response_stream
+
+    mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
+    mock_local.is_available.return_value = True
+    mock_local.get_response_stream_async.return_value = _async_iter(["Local ", "stream."])
+
+    assert "".join(get_response_stream("Hello")) == "Local stream."
+
+
+async def _broken_stream(items):
+    for item in items:
+        yield item
+    raise ConnectionError("connection reset")
+
+
+@patch("tars.ai.cache.config.AI_CACHE_ENABLED", True)
+@patch("tars.ai.cache._cache", None)
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", False)
+def test_get_response_stream_cut_off_is_not_cached_or_remembered(mock_client, mock_local):
+    """A reply that breaks off mid-stream is spoken as far as it got, but never reused."""
+    from tars.ai.chat import get_response_stream
+
+    mock_local.is_available.return_value = False
+    mock_client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: _broken_stream(
+        [_stream_chunk("I'm "), _stream_chunk("TA")]
+    ))
+
+    with patch.object(chat, "_remember") as remember:
+        assert list(get_response_stream("What are you?")) == ["I'm ", "TA"]
+        assert list(get_response_stream("What are you?")) == ["I'm ", "TA"]
+    assert mock_client.chat.completions.create.call_count == 2  # not served from the cache
+    remember.assert_not_called()
+
+
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_available", False)
+@patch("tars.ai.chat._openai_available", False)
+def test_get_response_stream_no_backends(mock_local):
+    """Streams the offline message when no backends are available."""
+    from tars.ai.chat import get_response_stream
+
+    mock_local.is_available.return_value = False
+
+    chunks = list(get_response_stream("Hello"))
+    assert len(chunks) == 1
+    assert "offline" in chunks[0].lower()
+
+
+@patch("tars.ai.chat.config.AI_HEDGE_ENABLED", True)
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._openai_client")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", True)
+def test_get_response_hedged_uses_fallback(mock_cerebras, mock_openai, mock_local):
+    """With hedging on, a failing Cerebras hands over to OpenAI."""
+    from tars.ai.chat import get_response
+
+    mock_cerebras.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
+    mock_openai.chat.completions.create = AsyncMock(return_value=_async_iter([_stream_chunk("Hedged.")]))
+
+    assert get_response("Hello") == "Hedged."
+
+
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", False)
+def test_open_breaker_skips_backend(mock_client, mock_local):
+    """Once Cerebras keeps failing, it is skipped without another request."""
+    from tars.ai.chat import get_response
+
+    mock_client.chat.completions.create = AsyncMock(side_effect=Exception("API error"))
+    mock_local.is_available.return_value = True
+    mock_local.get_response_async = AsyncMock(return_value="Local response here.")
+
+    for _ in range(3):
+        get_response("Hello")
+    calls = mock_client.chat.completions.create.call_count
+    assert chat._breakers["cerebras"].state.value == "open"
+
+    assert get_response("Hello") == "Local response here."
+    assert mock_client.chat.completions.create.call_count == calls
+
+
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", False)
+def test_submit_response_returns_future(mock_client, mock_local):
+    """submit_response() runs in the background and resolves to the reply."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "Already on it."
+    mock_response = MagicMock()
+    mock_response.choices = [mock_choice]
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+    future = chat.submit_response("Moving forward")
+    assert future.result(timeout=5) == "Already on it."
+
+
+@patch("tars.ai.cache.config.AI_CACHE_ENABLED", True)
+@patch("tars.ai.cache._cache", None)
+@patch("tars.ai.chat.local_llm")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", False)
+def test_repeated_question_served_from_cache(mock_client, mock_local):
+    """A near-duplicate question is answered without another cloud call."""
+    mock_choice = MagicMock()
+    mock_choice.message.content = "A robot. Obviously."
+    mock_response = MagicMock()
+    mock_response.choices = [mock_choice]
+    mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+
+    assert chat.get_response("What are you?") == "A robot. Obviously."
+    assert chat.get_response("what are you") == "A robot. Obviously."
+    assert mock_client.chat.completions.create.call_count == 1
+
+
+@patch("tars.ai.chat.config.AI_CONN_KEEP_ALIVE_INTERVAL", 0)
+@patch("tars.ai.chat._openai_client")
+@patch("tars.ai.chat._cerebras_client")
+@patch("tars.ai.chat._cerebras_available", True)
+@patch("tars.ai.chat._openai_available", True)
+def test_warm_up_opens_cloud_connections(mock_cerebras, mock_openai):
+    """Startup warm-up sends one cheap request to each cloud backend."""
+    mock_cerebras.models.list = AsyncMock()
+    mock_openai.models.list = AsyncMock()
+
+    chat._loop.run(chat._keep_connections_warm(), timeout=5)
+    mock_cerebras.models.list.assert_awaited_once()
+    mock_openai.models.list.assert_awaited_once()
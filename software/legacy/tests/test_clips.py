@@ -0,0 +1,68 @@
+"""Tests for tars/voice/clips.py — time announcements from pre-rendered clips."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+from pydub import AudioSegment
+
+from tars.voice import clips
+
+
+def _clip(level, words=1000, pad=2400):
+    """Fake cached clip: `words` loud samples between 100 ms of silence either side."""
+    samples = np.concatenate((np.zeros(pad), np.full(words, level), np.zeros(pad))).astype(np.int16)
+    return AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=24000, channels=1)
+
+
+def test_time_phrases():
+    assert clips.time_phrases(datetime(2024, 1, 1, 15, 7)) == [clips.CARRIER, "three", "oh seven", "P.M."]
+    assert clips.time_phrases(datetime(2024, 1, 1, 0, 0))[1:] == ["twelve", "o'clock", "A.M."]
+    assert clips.time_phrases(datetime(2024, 1, 1, 11, 42))[1:] == ["eleven", "forty-two", "A.M."]
+    phrases = clips.all_phrases()
+    assert len(phrases) == len(set(phrases))
+    assert all(p in phrases for m in range(60) for p in clips.time_phrases(datetime(2024, 1, 1, 13, m)))
+
+
+@patch("tars.voice.clips.config.CLIP_CROSSFADE_MS", 10)
+@patch("tars.voice.clips.speaker")
+def test_assemble_trims_and_crossfades_cached_clips(mock_speaker):
+    levels = {"a": 1000, "b": 2000, "c": 3000}
+    mock_speaker.cached.side_effect = lambda phrase, language: _clip(levels[phrase])
+
+    sound = clips.assemble(["a", "b", "c"])
+    samples = np.array(sound.get_array_of_samples())
+
+    margin, overlap = 240, 240  # 10 ms each at 24 kHz
+    assert len(samples) == 3 * (1000 + 2 * margin) - 2 * overlap
+    assert samples.max() == 3000
+    # The ~100 ms pads are gone: words are at most two margins less the overlap apart
+    loud = np.flatnonzero(np.abs(samples) > 300)
+    assert np.diff(loud).max() <= 2 * margin - overlap + 1
+
+
+@patch("tars.voice.clips.config.CLIP_BANK_ENABLED", True)
+@patch("tars.voice.clips.prerender_in_background")
+@patch("tars.voice.clips.speaker")
+def test_missing_clip_falls_back_and_renders_in_background(mock_speaker, mock_prerender):
+    mock_speaker.cached.side_effect = lambda phrase, language: None if phrase == "oh seven" else _clip(1000)
+
+    assert not clips.speak_time(datetime(2024, 1, 1, 15, 7), "english")
+    mock_prerender.assert_called_once_with("english")
+    mock_speaker.play_audio.assert_not_called()
+
+    mock_speaker.cached.side_effect = lambda phrase, language: _clip(1000)
+    assert clips.speak_time(datetime(2024, 1, 1, 15, 7), "english")
+    mock_speaker.play_audio.assert_called_once()
+
+
+@patch("tars.voice.clips.config.TTS_CACHE_ENABLED", False)
+@patch("tars.voice.clips.config.CLIP_BANK_ENABLED", True)
+@patch("tars.voice.clips.prerender_in_background")
+@patch("tars.voice.clips.speaker")
+def test_no_clip_bank_without_the_speech_cache(mock_speaker, mock_prerender):
+    """Clips rendered with the cache off would be thrown away — so none are."""
+    assert not clips.speak_time(datetime(2024, 1, 1, 15, 7), "english")
+    assert clips.prerender("english") == 0
+    mock_prerender.assert_not_called()
+    mock_speaker.render.assert_not_called()
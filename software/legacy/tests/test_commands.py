@@ -1,5 +1,6 @@
 """Tests for tars/commands/router.py — command routing and dispatch."""
 
+from concurrent.futures import Future
 from unittest.mock import patch
 
 from tars.commands.language import LanguageState
@@ -10,6 +11,12 @@ def _make_state():
     return SharedState(LanguageState())
 
 
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
 @patch("tars.commands.router.speaker")
 @patch("tars.commands.router.terminal")
 @patch("tars.commands.router.chat")
@@ -23,13 +30,15 @@ def test_empty_command_returns_state(mock_chat, mock_term, mock_speaker):
     mock_chat.get_response.assert_not_called()
 
 
+@patch("tars.commands.router.clips")
 @patch("tars.commands.router.speaker")
 @patch("tars.commands.router.terminal")
 @patch("tars.commands.router.chat")
-def test_time_command(mock_chat, mock_term, mock_speaker):
+def test_time_command(mock_chat, mock_term, mock_speaker, mock_clips):
     """'what time is it' triggers time response."""
     from tars.commands.router import process_command
 
+    mock_clips.speak_time.return_value = False  # clip bank not rendered yet
     state = _make_state()
     result = process_command("what time is it", state)
     assert result is state
@@ -37,6 +46,23 @@ def test_time_command(mock_chat, mock_term, mock_speaker):
     # Should contain time format
     call_args = mock_term.print_tars.call_args[0][0]
     assert ":" in call_args
+    mock_speaker.speak.assert_called_once()
+
+
+@patch("tars.commands.router.clips")
+@patch("tars.commands.router.speaker")
+@patch("tars.commands.router.terminal")
+@patch("tars.commands.router.chat")
+def test_time_command_uses_clip_bank(mock_chat, mock_term, mock_speaker, mock_clips):
+    """With the clips cached, the time is spoken from them — nothing is synthesized."""
+    from tars.commands.router import process_command
+
+    mock_clips.speak_time.return_value = True
+    process_command("what time is it", _make_state())
+
+    mock_clips.speak_time.assert_called_once()
+    mock_term.print_tars.assert_called_once()
+    mock_speaker.speak.assert_not_called()
 
 
 @patch("tars.commands.router.speaker")
@@ -62,7 +88,7 @@ def test_stop_command_returns_stop(mock_chat, mock_term, mock_speaker, mock_slee
     """'stop' command returns 'stop' string."""
     from tars.commands.router import process_command
 
-    mock_chat.get_response.return_value = "Goodbye."
+    mock_chat.submit_response.return_value = _resolved("Goodbye.")
     state = _make_state()
     result = process_command("stop", state)
     assert result == "stop"
@@ -76,12 +102,13 @@ def test_exit_command_returns_stop(mock_chat, mock_term, mock_speaker, mock_slee
     """'exit' command returns 'stop' string."""
     from tars.commands.router import process_command
 
-    mock_chat.get_response.return_value = "Goodbye."
+    mock_chat.submit_response.return_value = _resolved("Goodbye.")
     state = _make_state()
     result = process_command("exit", state)
     assert result == "stop"
 
 
+@patch("tars.commands.router.config.AI_STREAM", False)
 @patch("tars.commands.router.speaker")
 @patch("tars.commands.router.terminal")
 @patch("tars.commands.router.chat")
@@ -96,6 +123,38 @@ def test_default_goes_to_chat(mock_chat, mock_term, mock_speaker):
     mock_term.print_tars.assert_called_with("Very funny, human.")
 
 
+@patch("tars.commands.router.config.AI_STREAM", True)
+@patch("tars.commands.router.speaker")
+@patch("tars.commands.router.terminal")
+@patch("tars.commands.router.chat")
+def test_default_streams_first_sentence(mock_chat, mock_term, mock_speaker):
+    """Streamed chat prints the first sentence on its own, then the rest."""
+    from tars.commands.router import process_command
+
+    mock_chat.get_response_stream.return_value = iter(["Very fun", "ny. Now go ", "away."])
+    state = _make_state()
+    state.text_only = True
+    process_command("tell me a joke", state)
+    mock_chat.get_response.assert_not_called()
+    mock_term.print_tars.assert_called_once_with("Very funny.")
+    mock_term.print_tars_continued.assert_called_once_with("Now go away.")
+
+
+@patch("tars.commands.router.config.AI_STREAM", True)
+@patch("tars.commands.router.speaker")
+@patch("tars.commands.router.terminal")
+@patch("tars.commands.router.chat")
+def test_streamed_sentences_feed_speaker_as_they_complete(mock_chat, mock_term, mock_speaker):
+    """Each finished sentence goes to the pipelined speaker, in order."""
+    from tars.commands.router import process_command
+
+    mock_chat.get_response_stream.return_value = iter(["Very fun", "ny. Now go ", "away. Bye"])
+    process_command("tell me a joke", _make_state())
+
+    segments = mock_speaker.speak_stream.call_args.args[0]
+    assert list(segments) == ["Very funny.", "Now go away.", "Bye"]
+
+
 @patch("tars.commands.router.speaker")
 @patch("tars.commands.router.terminal")
 @patch("tars.commands.router.chat")
@@ -116,7 +175,31 @@ def test_move_forward_command(mock_move, mock_chat, mock_term, mock_speaker):
     """'move forward' triggers movement."""
     from tars.commands.router import process_command
 
-    mock_chat.get_response.return_value = "Moving."
+    order = []
+    mock_chat.submit_response.side_effect = lambda *a, **k: order.append("ai") or _resolved("Moving.")
+    mock_move.move_forward.side_effect = lambda *a: order.append("servos")
     state = _make_state()
     process_command("move forward", state)
     mock_move.move_forward.assert_called_once()
+    # The AI request is already in flight while the servos move
+    assert order == ["ai", "servos"]
+    mock_term.print_tars.assert_called_with("Moving.")
+
+
+@patch("tars.commands.router.speaker")
+@patch("tars.commands.router.terminal")
+@patch("tars.commands.router.chat")
+@patch("tars.commands.router.movement")
+@patch("tars.commands.router.acks")
+def test_controller_uses_ack_pool(mock_acks, mock_move, mock_chat, mock_term, mock_speaker):
+    """Controller movement answers from the ack pool without an AI call."""
+    from tars.commands.router import process_controller_command
+
+    mock_acks.take.return_value = "Turning. Try not to blink."
+    state = _make_state()
+    process_controller_command("turn_left", state)
+    mock_move.turn_left.assert_called_once()
+    mock_acks.take.assert_called_once()
+    assert mock_acks.take.call_args[0][0] == "Turning left"
+    mock_chat.get_response.assert_not_called()
+    mock_term.print_tars.assert_called_with("Turning. Try not to blink.")
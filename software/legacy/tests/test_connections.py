@@ -0,0 +1,59 @@
+"""Tests for tars/ai/connections.py — connection reuse against a local stub server."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import AsyncOpenAI
+
+from tars.ai import connections
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Just enough of the OpenAI API for models.list(), with keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "tars"}]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_second_request_reuses_warm_connection(stub_url):
+    """Warm-up opens the connection once; later requests reuse it."""
+    stats = connections.ConnectionStats()
+
+    async def run():
+        client = AsyncOpenAI(base_url=stub_url, api_key="stub", http_client=connections.http_client(stats))
+        for _ in range(3):
+            await client.models.list()
+        await client.close()
+
+    asyncio.run(run())
+    snap = stats.snapshot()
+    assert snap["fresh"] == 1
+    assert snap["reused"] == 2
+    assert snap["handshake_p50"] is not None
+    assert stats.idle_seconds() < 5
+
+
+def test_idle_before_first_request_is_infinite():
+    assert connections.ConnectionStats().idle_seconds() == float("inf")
@@ -0,0 +1,96 @@
+"""Tests for tars/voice/dsp.py — NumPy voice effects vs the pydub reference."""
+
+import numpy as np
+from pydub import AudioSegment, effects
+
+from tars.dev.bench_dsp import pydub_chain, synth_voice
+from tars.voice import dsp
+
+RATE = 24000
+
+
+def _tone(freq, seconds=1.0):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (10000 * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def test_filters_match_pydub():
+    """The SOS band-pass reproduces pydub's RC high-pass + low-pass."""
+    samples = synth_voice(0.5, RATE)
+    sound = AudioSegment(samples.tobytes(), sample_width=2, frame_rate=RATE, channels=1)
+    expected = effects.low_pass_filter(sound.high_pass_filter(300), 3000).get_array_of_samples()
+
+    output = dsp.SOSFilter(dsp.band_pass_sos(RATE, 300, 3000)).process(samples)
+    assert np.max(np.abs(output[10:] - np.array(expected[10:]))) < 4
+
+
+def test_band_pass_attenuates_outside_band():
+    sos = dsp.band_pass_sos(RATE, 300, 3000)
+    passed = np.std(dsp.SOSFilter(sos).process(_tone(1000))[2400:])
+    low = np.std(dsp.SOSFilter(sos).process(_tone(30))[2400:])
+    high = np.std(dsp.SOSFilter(sos).process(_tone(10000))[2400:])
+    assert low < passed / 5
+    assert high < passed / 2
+
+
+def test_band_pass_coefficients_are_cached():
+    assert dsp.band_pass_sos(RATE, 300, 3000) is dsp.band_pass_sos(RATE, 300, 3000)
+
+
+def test_streaming_filter_matches_one_shot():
+    """Filter state carries across blocks — block-wise output equals whole-buffer output."""
+    samples = synth_voice(0.3, RATE).astype(np.float64)
+    sos = dsp.band_pass_sos(RATE, 300, 3000)
+    whole = dsp.SOSFilter(sos).process(samples)
+    streaming = dsp.SOSFilter(sos)
+    blocks = np.concatenate([streaming.process(b) for b in np.array_split(samples, 7)])
+    assert np.allclose(whole, blocks)
+
+
+def test_time_scale_shortens_without_changing_pitch():
+    samples = _tone(440, seconds=2.0)
+    scaled = dsp.time_scale(samples, RATE, 1.2)
+    assert abs(len(scaled) - len(samples) / 1.2) < RATE * 0.05
+    spectrum = np.abs(np.fft.rfft(scaled))
+    peak = np.argmax(spectrum) * RATE / len(scaled)
+    assert abs(peak - 440) < 5
+
+
+def test_full_chain_tracks_pydub():
+    """Same config semantics as the old chain: length, level and waveform agree."""
+    samples = synth_voice(2.0, RATE)
+    expected = pydub_chain(samples, RATE)
+    output = dsp.apply(samples, RATE)
+
+    assert output.dtype == np.int16
+    assert abs(len(output) - len(expected)) < RATE * 0.02
+    n = min(len(output), len(expected))
+    assert np.corrcoef(output[:n], expected[:n])[0, 1] > 0.98
+    assert abs(np.std(output) / np.std(expected) - 1) < 0.05
+
+
+def test_streaming_effect_matches_one_shot():
+    """Decoded-block sized calls plus flush() reproduce the whole-utterance chain."""
+    samples = synth_voice(1.5, RATE)
+    whole = dsp.apply(samples, RATE)
+
+    effect = dsp.VoiceEffect(RATE)
+    blocks = [effect.process(b) for b in np.array_split(samples, len(samples) // 960)]
+    streamed = np.concatenate(blocks + [effect.flush()])
+    assert len(streamed) == len(whole)
+    assert np.max(np.abs(streamed.astype(int) - whole)) <= 1
+    # Output starts flowing long before the input ends
+    assert sum(len(b) for b in blocks[:10]) > 0
+
+
+def test_resampler_blocks_join_seamlessly():
+    """24 kHz speech to a 48 kHz device: right length and pitch, blocks same as one pass."""
+    samples = _tone(440)
+    whole = dsp.Resampler(RATE, 48000).process(samples)
+
+    resampler = dsp.Resampler(RATE, 48000)
+    streamed = np.concatenate([resampler.process(b) for b in np.array_split(samples, 37)])
+    assert np.array_equal(streamed, whole)
+    assert abs(len(whole) - 2 * len(samples)) <= 2
+    spectrum = np.abs(np.fft.rfft(whole))
+    assert abs(np.argmax(spectrum) * 48000 / len(whole) - 440) < 2
@@ -0,0 +1,100 @@
+"""Tests for tars/ai/hedge.py — latency tracking and hedged races."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from tars.ai import hedge
+
+
+def test_percentile_needs_min_samples():
+    """Returns the default until enough samples are recorded."""
+    tracker = hedge.LatencyTracker(min_samples=3)
+    tracker.record(0.1)
+    assert tracker.percentile(95, default=1.5) == 1.5
+
+
+def test_percentile_of_samples():
+    """p95 of 0.01..1.00 is near the top of the window."""
+    tracker = hedge.LatencyTracker(window=100, min_samples=1)
+    for i in range(1, 101):
+        tracker.record(i / 100)
+    assert tracker.percentile(95) == 0.95
+    assert tracker.percentile(50) == 0.51
+
+
+async def _chunks(*items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(agen):
+    return [chunk async for chunk in agen]
+
+
+def test_race_fast_primary_never_hedges():
+    """Fallback is not started when primary answers within the delay."""
+    fallback_started = False
+
+    def fallback():
+        nonlocal fallback_started
+        fallback_started = True
+        return _chunks("fallback")
+
+    chunks = asyncio.run(_collect(hedge.race(lambda: _chunks("primary ", "wins"), fallback, delay=1.0)))
+    assert "".join(chunks) == "primary wins"
+    assert not fallback_started
+
+
+def test_race_slow_primary_loses_and_is_cancelled():
+    """Fallback wins when primary stalls past the delay; primary's task is cancelled."""
+    primary_cancelled = False
+
+    async def primary():
+        nonlocal primary_cancelled
+        try:
+            await asyncio.sleep(2)
+            yield "late"
+        except asyncio.CancelledError:
+            primary_cancelled = True
+            raise
+
+    start = time.monotonic()
+    chunks = asyncio.run(_collect(hedge.race(primary, lambda: _chunks("quick"), delay=0.05)))
+    assert chunks == ["quick"]
+    assert primary_cancelled
+    assert time.monotonic() - start < 1.0
+
+
+def test_race_failed_primary_falls_back_immediately():
+    """A primary that fails outright doesn't make us wait out the delay."""
+    start = time.monotonic()
+    with patch("builtins.print"):
+        chunks = asyncio.run(_collect(hedge.race(lambda: _chunks(), lambda: _chunks("backup"), delay=5.0)))
+    assert chunks == ["backup"]
+    assert time.monotonic() - start < 1.0
+
+
+def test_race_both_fail_yields_nothing():
+    """Race ends quietly when neither backend produces text."""
+    assert asyncio.run(_collect(hedge.race(lambda: _chunks(), lambda: _chunks(), delay=0.01))) == []
+
+
+def test_race_winner_failing_midway_raises():
+    """Once a backend has won, its failure ends the race with that error."""
+    async def broken():
+        yield "half "
+        raise ConnectionError("reset")
+
+    async def collect():
+        chunks = []
+        try:
+            async for chunk in hedge.race(broken, lambda: _chunks("unused"), delay=1.0):
+                chunks.append(chunk)
+        except ConnectionError:
+            return chunks, True
+        return chunks, False
+
+    assert asyncio.run(collect()) == (["half "], True)
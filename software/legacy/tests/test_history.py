@@ -0,0 +1,84 @@
+"""Tests for tars/ai/history.py — token-budgeted history and summarization."""
+
+import time
+
+from tars.ai.history import ConversationHistory, estimate_tokens, message_tokens
+
+
+def _wait_until_compacted(hist, turns, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(hist) <= turns and not hist._compacting:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_estimate_tokens():
+    """About four characters per token."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_messages_under_budget_returned_verbatim():
+    """Short conversations are passed through untouched."""
+    hist = ConversationHistory(token_budget=1000)
+    hist.add_exchange("Hi", "Hello.")
+    assert hist.messages() == [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello."},
+    ]
+
+
+def test_prompt_never_exceeds_budget():
+    """messages() trims the oldest turns even before compaction finishes."""
+    hist = ConversationHistory(token_budget=60, keep_recent=2, summarize=None)
+    hist._compacting = True  # pretend a summary is in flight
+    for i in range(20):
+        hist.add_exchange(f"question {i} " * 5, f"answer {i} " * 5)
+    msgs = hist.messages()
+    assert sum(message_tokens(m) for m in msgs) <= 60
+    assert msgs[0]["role"] == "user"
+    assert msgs[-1]["content"].startswith("answer 19")
+
+
+def test_compaction_summarizes_old_turns():
+    """Over budget, old turns are replaced by a summary in the background."""
+    seen = []
+
+    def summarize(summary, turns):
+        seen.append((summary, turns))
+        return "User asked many questions."
+
+    hist = ConversationHistory(token_budget=80, keep_recent=2, summarize=summarize)
+    for i in range(6):
+        hist.add_exchange(f"question number {i} " * 3, f"answer number {i} " * 3)
+
+    assert _wait_until_compacted(hist, 4)
+    assert hist.summary == "User asked many questions."
+    assert seen and seen[0][1][0]["content"].startswith("question number 0")
+    msgs = hist.messages()
+    assert msgs[0]["role"] == "system"
+    assert "User asked many questions." in msgs[0]["content"]
+
+
+def test_failed_summary_drops_old_turns():
+    """If summarizing fails, old turns are dropped like a plain rolling buffer."""
+    def summarize(summary, turns):
+        raise RuntimeError("offline")
+
+    hist = ConversationHistory(token_budget=40, keep_recent=2, summarize=summarize)
+    for i in range(4):
+        hist.add_exchange(f"question {i} " * 4, f"answer {i} " * 4)
+
+    assert _wait_until_compacted(hist, 4)
+    assert hist.summary == ""
+
+
+def test_clear_forgets_everything():
+    hist = ConversationHistory()
+    hist.add_exchange("Hi", "Hello.")
+    hist.clear()
+    assert len(hist) == 0
+    assert hist.messages() == []
@@ -0,0 +1,63 @@
+"""Tests for tars/voice/keywords.py — the command-word fast path."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tars.commands import router
+from tars.voice import keywords, stt
+
+
+class _StubSession:
+    def __init__(self, result):
+        self.result = result
+        self.frames = []
+
+    def feed(self, frame):
+        self.frames.append(frame)
+
+    def finish(self):
+        return self.result
+
+
+@pytest.fixture(autouse=True)
+def grammar():
+    keywords.initialize(router.command_phrases(), router.MOVEMENT_COMMANDS)
+    yield
+    keywords.initialize([], [])
+
+
+def test_grammar_comes_from_router_phrases_and_languages():
+    assert "take two steps" in keywords._grammar
+    assert keywords._grammar["take two steps"] == "take 2 steps"
+    assert "speak spanish" in keywords._grammar
+    assert "turn left" in keywords._fast
+    assert "stop" not in keywords._fast  # shutdown always waits for the full transcript
+
+
+@pytest.mark.parametrize("heard, expected", [
+    (stt.Result("take two steps", 0.95), "take 2 steps"),
+    (stt.Result("turn left", 0.5), None),  # not confident enough
+    (stt.Result("speak spanish", 0.95), None),  # a command, but not movement
+    (stt.Result("[unk] turn left", 0.95), None),  # part of a longer sentence
+    (None, None),
+])
+def test_spotter_only_answers_confident_movement(heard, expected):
+    result = keywords.Spotter(_StubSession(heard)).finish()
+    assert (result.text if result else None) == expected
+
+
+def test_fast_path_answers_without_asking_the_backends():
+    backend = MagicMock()
+    fast = keywords.Spotter(_StubSession(stt.Result("turn right", 0.97)))
+    utterance = stt.Utterance([backend], fast_path=fast)
+    utterance.feed(b"frame")
+    result = utterance.finish()
+
+    assert (result.text, result.backend) == ("turn right", "keywords")
+    backend.session.return_value.finish.assert_not_called()
+
+
+def test_no_fast_path_without_a_local_model():
+    with patch.object(keywords.stt, "local_model", return_value=None):
+        assert keywords.spotter() is None
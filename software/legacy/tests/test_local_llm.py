@@ -0,0 +1,89 @@
+"""Tests for tars/ai/local_llm.py — Ollama session, keep-alive and streaming."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from tars.ai import local_llm
+
+
+class _FakeResponse:
+    """Minimal aiohttp response: async context manager with text() and a line stream."""
+
+    def __init__(self, body=b"", lines=(), status=200):
+        self.status = status
+        self._body = body
+        self.content = self._lines(lines)
+
+    async def _lines(self, lines):
+        for line in lines:
+            yield line
+
+    async def text(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def _collect(agen):
+    return [chunk async for chunk in agen]
+
+
+@patch("tars.ai.local_llm._ollama_available", True)
+@patch("tars.ai.local_llm._get_http")
+def test_get_response_uses_shared_session_and_keep_alive(mock_http):
+    """Requests go through the pooled session and ask Ollama to keep the model loaded."""
+    body = json.dumps({"message": {"content": "Offline, not dead."}})
+    mock_http.return_value.post.return_value = _FakeResponse(body=body)
+
+    assert asyncio.run(local_llm.get_response_async("Hello")) == "Offline, not dead."
+    payload = mock_http.return_value.post.call_args.kwargs["json"]
+    assert payload["keep_alive"] == local_llm._keep_alive
+    assert payload["stream"] is False
+
+
+@patch("tars.ai.local_llm._session")
+def test_warm_up_loads_model(mock_session):
+    """warm_up() sends an empty generate request with keep_alive."""
+    mock_session.post.return_value.status_code = 200
+
+    assert local_llm.warm_up() is True
+    url = mock_session.post.call_args.args[0]
+    payload = mock_session.post.call_args.kwargs["json"]
+    assert url.endswith("/api/generate")
+    assert payload["prompt"] == ""
+    assert "keep_alive" in payload
+
+
+@patch("tars.ai.local_llm._ollama_available", True)
+@patch("tars.ai.local_llm._get_http")
+def test_get_response_stream_parses_ndjson(mock_http):
+    """Streams message content from Ollama's newline-delimited JSON."""
+    lines = [
+        json.dumps({"message": {"content": "No "}, "done": False}).encode() + b"\n",
+        b"\n",
+        json.dumps({"message": {"content": "signal."}, "done": False}).encode() + b"\n",
+        json.dumps({"message": {"content": ""}, "done": True}).encode() + b"\n",
+    ]
+    mock_http.return_value.post.return_value = _FakeResponse(lines=lines)
+
+    assert asyncio.run(_collect(local_llm.get_response_stream_async("Hello"))) == ["No ", "signal."]
+
+
+@patch("tars.ai.local_llm._ollama_available", False)
+def test_unavailable_returns_nothing():
+    """No Ollama means no response and an empty stream."""
+    assert asyncio.run(local_llm.get_response_async("Hello")) is None
+    assert asyncio.run(_collect(local_llm.get_response_stream_async("Hello"))) == []
+
+
+def test_set_awake_toggles_keep_warm():
+    """set_awake() controls whether keep-warm pings run."""
+    local_llm.set_awake(False)
+    assert not local_llm._awake.is_set()
+    local_llm.set_awake(True)
+    assert local_llm._awake.is_set()
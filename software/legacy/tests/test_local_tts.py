@@ -0,0 +1,42 @@
+"""Tests for tars/voice/local_tts.py — the offline voice."""
+
+import io
+import struct
+from unittest.mock import patch
+
+import numpy as np
+
+from tars.voice import local_tts
+
+
+def _wav_stream(samples, rate=22050):
+    data = samples.tobytes()
+    header = (b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+              + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, rate, rate * 2, 2, 16)
+              + b"data" + struct.pack("<I", 0xFFFFFFFF))
+    return io.BufferedReader(io.BytesIO(header + data))
+
+
+@patch("tars.voice.local_tts._espeak", "/usr/bin/espeak-ng")
+@patch("tars.voice.local_tts._engine", "espeak")
+@patch("tars.voice.local_tts.subprocess.Popen")
+def test_espeak_pcm_is_streamed_from_stdout(mock_popen):
+    samples = np.arange(-3000, 3000, dtype=np.int16)
+    mock_popen.return_value.stdout = _wav_stream(samples)
+
+    blocks = list(local_tts.synthesize("Hello there", "english"))
+
+    assert mock_popen.call_args.args[0] == ["/usr/bin/espeak-ng", "--stdout", "-v", "en", "Hello there"]
+    assert len(blocks) > 1  # read as it is written, not all at once
+    assert {rate for _, rate in blocks} == {22050}
+    assert np.array_equal(np.concatenate([b for b, _ in blocks]), samples)
+
+
+@patch("tars.voice.local_tts.config")
+@patch("tars.voice.local_tts.shutil.which", return_value=None)
+def test_no_engine_installed(mock_which, mock_config):
+    mock_config.LOCAL_TTS_ENGINE = "auto"
+    mock_config.PIPER_MODEL = ""
+    local_tts.initialize()
+    assert not local_tts.is_available()
+    assert list(local_tts.synthesize("Hello")) == []
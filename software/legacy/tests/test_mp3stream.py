@@ -0,0 +1,31 @@
+"""Tests for tars/voice/mp3stream.py — whole-frame MP3 feed for the streaming decoder."""
+
+from tars.voice import mp3stream
+
+# MPEG-2 Layer III, 48 kbit/s, 24 kHz mono — edge-tts' format, 144-byte frames
+HEADER = bytes.fromhex("fff364c4")
+FRAME = HEADER + bytes(140)
+
+
+def test_frame_length_of_edge_tts_format():
+    assert mp3stream.frame_length(HEADER) == 144
+    assert mp3stream.frame_length(b"\x00\x00\x00\x00") is None
+
+
+def test_feed_hands_out_whole_frames_only():
+    """A partly received frame is held back until the rest of it arrives."""
+    feed = mp3stream.Mp3Feed()
+    feed.put(FRAME * 3 + FRAME[:50])
+    assert feed.read(65536) == FRAME * 3
+
+    feed.put(FRAME[50:] + FRAME)
+    assert feed.read(65536) == FRAME * 2
+    feed.end()
+    assert feed.read(65536) == b""
+
+
+def test_feed_passes_through_unparsed_data():
+    feed = mp3stream.Mp3Feed()
+    feed.put(b"not an mp3")
+    feed.end()
+    assert feed.read_all() == b"not an mp3"
@@ -0,0 +1,121 @@
+"""Tests for tars/voice/output.py — the persistent audio output."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import miniaudio
+import numpy as np
+
+from tars.voice import output
+
+
+def _device():
+    # The NULL backend consumes audio in real time without a sound card
+    return output.DeviceOutput(buffer_ms=20, backends=[miniaudio.Backend.NULL])
+
+
+def test_device_plays_queued_audio_and_measures_latency():
+    stream = _device()
+    try:
+        samples = np.ones(stream.rate // 10, dtype=np.int16)  # 100 ms
+        started = time.perf_counter()
+        stream.write(samples)
+        stream.drain()
+        assert time.perf_counter() - started >= 0.09
+        assert stream.latency.percentile(50) is not None
+    finally:
+        stream.close()
+
+
+def test_device_stop_drops_queued_audio():
+    stream = _device()
+    try:
+        stream.write(np.ones(stream.rate // 2, dtype=np.int16))  # 500 ms
+        stream.stop()
+        started = time.perf_counter()
+        stream.drain()
+        assert time.perf_counter() - started < 0.1
+        # Writes after a stop play normally
+        stream.write(np.ones(stream.rate // 50, dtype=np.int16))
+        assert stream._queued
+    finally:
+        stream.close()
+
+
+@patch("tars.voice.output.subprocess.Popen")
+def test_pipe_keeps_one_player_for_every_write(mock_popen):
+    stream = output.PipeOutput(["pw-play", "-"], "PipeWire")
+    stream.write(np.zeros(240, dtype=np.int16))
+    stream.write(np.zeros(240, dtype=np.int16))
+
+    mock_popen.assert_called_once()
+    writes = [c.args[0] for c in mock_popen.return_value.stdin.write.call_args_list]
+    assert writes[0][:4] == b"RIFF"
+    assert len(writes) == 3
+
+
+@patch("tars.voice.output.subprocess.Popen")
+def test_pipe_measures_latency_once_per_utterance(mock_popen):
+    stream = output.PipeOutput(["pw-play", "-"], "PipeWire")
+    stream.write(np.zeros(240, dtype=np.int16))
+    stream.write(np.zeros(240, dtype=np.int16))  # same utterance
+    assert len(stream.latency) == 1
+    assert stream.latency.percentile(50) >= stream.buffer_seconds
+
+    with patch.object(output, "_output", stream):
+        assert output.latency()["measured"] == stream.latency.percentile(50)
+
+
+@patch("tars.voice.output.subprocess.Popen")
+def test_pipe_stop_kills_player_and_starts_next(mock_popen):
+    stream = output.PipeOutput(["pw-play", "-"], "PipeWire")
+    stream.write(np.zeros(24000, dtype=np.int16))
+    stream.stop()
+    stream.drain()  # nothing left to wait for
+
+    mock_popen.return_value.kill.assert_called_once()
+    assert stream._ready.wait(2)
+    assert mock_popen.call_count == 2
+
+
+@patch("tars.voice.output.shutil.which", return_value=None)
+@patch("tars.voice.output.config")
+def test_no_player_found_without_launching_anything(mock_config, mock_which):
+    mock_config.AUDIO_OUTPUT_BACKEND = "pipe"
+    with patch("tars.voice.output.subprocess.Popen") as mock_popen:
+        assert output._open() is None
+    mock_popen.assert_not_called()
+
+
+@patch("tars.voice.output.subprocess.Popen")
+def test_pipe_stop_twice_restarts_one_player(mock_popen):
+    players = []
+    mock_popen.side_effect = lambda *a, **k: players.append(MagicMock()) or players[-1]
+    stream = output.PipeOutput(["pw-play", "-"], "PipeWire")
+    stream.stop()  # idle player — nothing to silence
+    assert len(players) == 1 and not players[0].kill.called
+
+    stream.write(np.zeros(240, dtype=np.int16))
+    stream.stop()
+    stream.stop()  # restart already pending
+    assert stream._ready.wait(2)
+    assert len(players) == 2
+    assert players[0].kill.called and not players[1].kill.called
+
+    stream.close()
+    players[1].terminate.assert_called_once()
+
+
+@patch("tars.voice.output.subprocess.Popen")
+def test_pipe_fails_fast_until_the_player_restarts(mock_popen):
+    mock_popen.side_effect = OSError("no such device")
+    stream = output.PipeOutput(["pw-play", "-"], "PipeWire")
+    started = time.perf_counter()
+    for _ in range(25):  # a sentence of 40 ms blocks
+        stream.write(np.zeros(960, dtype=np.int16))
+    assert time.perf_counter() - started < 1.0
+
+    mock_popen.side_effect = None
+    stream.stop()
+    stream.write(np.zeros(240, dtype=np.int16))
+    assert mock_popen.return_value.stdin.write.call_count == 2  # header, then the samples
@@ -0,0 +1,123 @@
+"""Tests for tars/voice/playback.py — the single-worker speech queue."""
+
+import threading
+
+from tars.voice import playback
+
+
+def _recorder(played, gate=None):
+    def play_as(name):
+        def play(job):
+            if gate is not None:
+                gate.wait(timeout=2)
+            played.append(name)
+        return play
+    return play_as
+
+
+def _wait_until_playing(q):
+    while not q.busy() or q.depth():
+        threading.Event().wait(0.01)
+
+
+def test_urgent_jobs_play_before_queued_chat():
+    played, gate = [], threading.Event()
+    play = _recorder(played, gate)
+    q = playback.PlaybackQueue()
+    q.submit(play("first"))  # holds the worker until the gate opens
+    _wait_until_playing(q)
+    q.submit(play("chat"))
+    last = q.submit(play("error"), playback.URGENT)
+    gate.set()
+    q.submit(play("done")).wait(2)
+
+    assert last.done()
+    assert played == ["first", "error", "chat", "done"]
+
+
+def test_duplicate_key_coalesces_into_queued_job():
+    played, gate = [], threading.Event()
+    play = _recorder(played, gate)
+    q = playback.PlaybackQueue()
+    q.submit(play("first"))
+    _wait_until_playing(q)
+    job = q.submit(play("ack"), key="Moving forward")
+    assert q.submit(play("ack again"), key="Moving forward") is job
+    gate.set()
+    job.wait(2)
+
+    assert played == ["first", "ack"]
+    assert q.stats()["coalesced"] == 1
+
+
+def test_preempt_cancels_playing_job_and_goes_next():
+    started, played = threading.Event(), []
+
+    def long_play(job):
+        started.set()
+        while not job.cancelled():
+            threading.Event().wait(0.01)
+        played.append("cut off")
+
+    q = playback.PlaybackQueue()
+    current = q.submit(long_play)
+    queued = q.submit(lambda job: played.append("chat"))
+    started.wait(2)
+    q.submit(lambda job: played.append("goodbye"), playback.URGENT, preempt=True).wait(2)
+    queued.wait(2)
+
+    assert current.cancelled()
+    assert played == ["cut off", "goodbye", "chat"]
+    assert q.stats()["preempted"] == 1
+
+
+def test_flush_drops_everything():
+    played, gate = [], threading.Event()
+    play = _recorder(played, gate)
+    q = playback.PlaybackQueue()
+    first = q.submit(play("first"))
+    _wait_until_playing(q)
+    queued = [q.submit(play(str(i))) for i in range(3)]
+    q.flush()
+    gate.set()
+    first.wait(2)
+
+    assert all(job.done() and job.cancelled() for job in queued)
+    assert played == ["first"]  # only what was already playing, which is cancelled
+    assert not q.busy()
+
+
+def test_long_queue_plays_everything_in_order_without_blocking():
+    played, gate = [], threading.Event()
+    play = _recorder(played, gate)
+    prepared = []
+    q = playback.PlaybackQueue(prepare_ahead=1)
+    q.submit(play("playing"))
+    _wait_until_playing(q)
+    jobs = [q.submit(play(str(i)), prepare=lambda job, i=i: prepared.append(i)) for i in range(20)]
+    assert q.depth() == 20  # every submit returned at once
+    assert prepared == [0]  # but only the next job holds audio
+    gate.set()
+    jobs[-1].wait(2)
+
+    assert played == ["playing", *map(str, range(20))]
+    assert prepared == list(range(20))
+    assert not any(job.cancelled() for job in jobs)
+    assert q.stats()["max_depth"] == 20
+
+
+def test_prepare_runs_only_near_the_head():
+    played, gate = [], threading.Event()
+    play = _recorder(played, gate)
+    prepared = []
+    q = playback.PlaybackQueue(prepare_ahead=1)
+    q.submit(play("playing"), prepare=lambda job: prepared.append("playing"))
+    _wait_until_playing(q)
+    q.submit(play("a"), prepare=lambda job: prepared.append("a"))
+    q.submit(play("b"), prepare=lambda job: prepared.append("b"))
+    assert prepared == ["playing", "a"]  # b waits until it's next
+
+    gate.set()
+    q.submit(play("c")).wait(2)
+    assert prepared == ["playing", "a", "b"]
+    assert played == ["playing", "a", "b", "c"]
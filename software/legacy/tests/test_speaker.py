@@ -0,0 +1,282 @@
+"""Tests for tars/voice/speaker.py — in-memory synthesis, decoding and playback."""
+
+import array
+import asyncio
+import io
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from tars.ai import breaker
+from tars.voice import mp3stream, playback, speaker
+
+
+@pytest.fixture(autouse=True)
+def fresh_breaker():
+    """Each test starts with edge-tts healthy (and no background probe)."""
+    with patch.object(speaker, "_edge_breaker", breaker.CircuitBreaker("edge-tts", consecutive_failures=2)):
+        yield
+
+
+class _FakeCommunicate:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def stream(self):
+        yield {"type": "audio", "data": b"ID3"}
+        yield {"type": "WordBoundary", "offset": 0}
+        yield {"type": "audio", "data": b"mp3"}
+
+
+@patch("tars.voice.speaker._initialized", True)
+@patch("tars.voice.speaker.edge_tts.Communicate", _FakeCommunicate)
+def test_generate_speech_collects_chunks_in_memory():
+    """Audio chunks are gathered into a buffer — no file is saved."""
+    assert speaker.generate_speech("Hello").read() == b"ID3mp3"
+
+
+@patch("tars.voice.speaker._initialized", True)
+@patch("tars.voice.speaker.edge_tts.Communicate", _FakeCommunicate)
+def test_synthesis_runs_on_one_speech_loop_from_any_thread():
+    """Callers inside their own event loop (GUI, async code) share the speech loop too."""
+    async def caller():
+        return speaker.generate_speech("Hello").read()
+
+    assert asyncio.run(caller()) == b"ID3mp3"
+    loop = speaker._loop.loop
+    assert speaker.submit_speech("Again").result(timeout=2) == b"ID3mp3"
+    assert speaker._loop.loop is loop
+
+
+@patch("tars.voice.speaker.MINIAUDIO_AVAILABLE", True)
+@patch("tars.voice.speaker.miniaudio")
+def test_decode_mp3_in_process(mock_miniaudio):
+    decoded = MagicMock(sample_rate=24000, nchannels=1, samples=array.array("h", [0, 100, -100, 0]))
+    mock_miniaudio.mp3_read_s16.return_value = decoded
+
+    sound = speaker.decode_mp3(io.BytesIO(b"mp3"))
+    mock_miniaudio.mp3_read_s16.assert_called_once_with(b"mp3")
+    assert sound.frame_rate == 24000
+    assert len(sound.get_array_of_samples()) == 4
+
+
+def _pcm_blocks(feed):
+    """Stand-in decoder: treats each chunk read from the feed as raw PCM."""
+    while chunk := feed.read(48000):
+        yield np.frombuffer(chunk, dtype=np.int16), 24000
+
+
+@patch("tars.voice.speaker._decoded_blocks", _pcm_blocks)
+def test_synthesis_streams_blocks_before_download_finishes():
+    """Processed audio comes out while edge-tts is still sending the sentence."""
+    first_block_out = threading.Event()
+    download_finished = []
+
+    class SlowCommunicate:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def stream(self):
+            yield {"type": "audio", "data": np.zeros(12000, dtype=np.int16).tobytes()}
+            await asyncio.to_thread(first_block_out.wait, 2)
+            yield {"type": "audio", "data": np.zeros(12000, dtype=np.int16).tobytes()}
+            download_finished.append(True)
+
+    with patch("tars.voice.speaker.edge_tts.Communicate", SlowCommunicate):
+        blocks = speaker._synthesize_blocks("Hello", "voice", mp3stream.Mp3Feed())
+        next(blocks)
+        assert not download_finished
+        first_block_out.set()
+        rest = list(blocks)
+
+    assert download_finished and rest
+
+
+@patch("tars.voice.speaker._initialized", True)
+@patch("tars.voice.speaker.tts_cache")
+@patch("tars.voice.speaker._synthesize_blocks")
+def test_failed_download_is_not_cached(mock_synthesize, mock_cache):
+    def partial(text, voice_id, feed):
+        feed.failed = True
+        yield _tone(1)
+
+    mock_cache.get.return_value = None
+    mock_synthesize.side_effect = partial
+    assert speaker.render("Hello") is not None
+    mock_cache.put.assert_not_called()
+
+
+class _FakeStream:
+    """Stand-in for the shared output stream: records what would be played."""
+
+    def __init__(self, rate=24000, on_write=None):
+        self.rate = rate
+        self.writes = []
+        self.on_write = on_write
+        self.stops = 0
+
+    def write(self, samples, cancelled=None):
+        self.writes.append(samples)
+        if self.on_write:
+            self.on_write(samples)
+
+    def drain(self, cancelled=None):
+        pass
+
+    def stop(self):
+        self.stops += 1
+
+
+@patch("tars.voice.speaker.output")
+def test_playback_resamples_once_onto_shared_stream(mock_output):
+    """Audio goes to the one open output, converted to its rate in-process."""
+    stream = _FakeStream(rate=48000)
+    mock_output.get.return_value = stream
+    speaker.play_audio(AudioSegment.silent(duration=50, frame_rate=24000))
+
+    assert sum(len(w) for w in stream.writes) == pytest.approx(2400, abs=2)
+    assert all(w.dtype == np.int16 for w in stream.writes)
+    assert not speaker.is_speaking()
+
+
+def _tone(value):
+    return AudioSegment(data=array.array("h", [value] * 240).tobytes(), sample_width=2, frame_rate=24000,
+                        channels=1)
+
+
+@patch("tars.voice.speaker.output")
+@patch("tars.voice.speaker._render_blocks")
+def test_speak_renders_next_sentence_while_playing(mock_render, mock_output):
+    """Sentence two is synthesized during sentence one's playback, onto the same stream."""
+    second_started = threading.Event()
+    overlapped = []
+
+    def render(text, language):
+        if text.startswith("Second"):
+            second_started.set()
+        yield _tone(len(text))
+
+    def write(samples):
+        if samples[0] == len("First one."):
+            # Still "playing" sentence one — the next render must already be underway
+            overlapped.append(second_started.wait(timeout=2))
+
+    stream = _FakeStream(on_write=write)
+    mock_render.side_effect = render
+    mock_output.get.return_value = stream
+
+    speaker.speak("First one. Second one.", blocking=True)
+
+    assert overlapped == [True]
+    assert [w.tobytes() for w in stream.writes] == [_tone(len("First one.")).raw_data,
+                                                   _tone(len("Second one.")).raw_data]
+
+
+@patch("tars.voice.speaker.output")
+@patch("tars.voice.speaker._render_blocks")
+def test_stop_speaking_cancels_pending_renders(mock_render, mock_output):
+    stream = _FakeStream(on_write=lambda samples: speaker.stop_speaking())
+    mock_render.side_effect = lambda text, language: iter([_tone(1)])
+    mock_output.get.return_value = stream
+
+    speaker.speak("One. Two. Three. Four.", blocking=True)
+
+    assert stream.stops == 1  # silenced once, by the cancelled job
+    mock_output.stop.assert_not_called()
+    assert len(stream.writes) == 1
+    assert mock_render.call_count < 4
+
+
+@patch("tars.voice.speaker.output")
+@patch("tars.voice.speaker._render_blocks")
+def test_preempt_with_nothing_playing_keeps_the_output_warm(mock_render, mock_output):
+    """An idle output isn't stopped (and restarted) just because a line preempts."""
+    stream = _FakeStream()
+    mock_render.side_effect = lambda text, language: iter([_tone(len(text))])
+    mock_output.get.return_value = stream
+
+    speaker.speak("Goodbye.", blocking=True, preempt=True)
+
+    assert len(stream.writes) == 1
+    assert stream.stops == 0
+    mock_output.stop.assert_not_called()
+
+
+@patch("tars.voice.speaker.output")
+@patch("tars.voice.speaker._render_blocks")
+def test_back_to_back_responses_play_in_turn_and_once(mock_render, mock_output):
+    """Non-blocking responses queue on one worker instead of racing; repeats coalesce."""
+    release = threading.Event()
+    stream = _FakeStream(on_write=lambda samples: release.wait(timeout=2))
+    mock_render.side_effect = lambda text, language: iter([_tone(len(text))])
+    mock_output.get.return_value = stream
+
+    speaker.speak("Chat reply.", blocking=False)
+    while speaker._queue.depth():
+        threading.Event().wait(0.01)  # chat reply is playing
+    speaker.speak("Moving.", blocking=False)
+    speaker.speak("Moving.", blocking=False)  # burst of presses
+    speaker.speak("Error!", blocking=False, priority=playback.URGENT)
+    release.set()
+    while speaker.is_speaking():
+        threading.Event().wait(0.01)
+
+    assert [w[0] for w in stream.writes] == [len("Chat reply."), len("Error!"), len("Moving.")]
+    assert speaker.playback_stats()["coalesced"] >= 1
+
+
+def _local_voice(text, language):
+    yield np.full(4800, 500, dtype=np.int16), 22050
+
+
+@patch("tars.voice.speaker._initialized", True)
+@patch("tars.voice.speaker.config.TTS_TIMEOUT", 0.1)
+@patch("tars.voice.speaker.local_tts")
+@patch("tars.voice.speaker.tts_cache")
+def test_slow_edge_tts_is_abandoned_for_local_voice(mock_cache, mock_local):
+    """No audio from edge-tts within the timeout — the offline engine speaks instead."""
+    class StalledCommunicate:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def stream(self):
+            await asyncio.sleep(10)
+            yield {"type": "audio", "data": b""}
+
+    mock_cache.get.return_value = None
+    mock_local.is_available.return_value = True
+    mock_local.synthesize.side_effect = _local_voice
+
+    with patch("tars.voice.speaker.edge_tts.Communicate", StalledCommunicate):
+        started = time.monotonic()
+        sound = speaker.render("Hello")
+
+    assert time.monotonic() - started < 2
+    assert sound is not None and sound.frame_rate == 22050
+    assert speaker._edge_breaker.snapshot()["failures"] == 1
+    mock_cache.put.assert_not_called()  # fallback audio isn't cached
+
+
+@patch("tars.voice.speaker._initialized", True)
+@patch("tars.voice.speaker.local_tts")
+@patch("tars.voice.speaker.tts_cache")
+@patch("tars.voice.speaker._synthesize_blocks")
+def test_open_breaker_goes_straight_to_local_voice(mock_synthesize, mock_cache, mock_local):
+    def failing(text, voice_id, feed):
+        feed.failed = True
+        return iter(())
+
+    mock_cache.get.return_value = None
+    mock_local.is_available.return_value = True
+    mock_local.synthesize.side_effect = _local_voice
+    mock_synthesize.side_effect = failing
+
+    for _ in range(3):
+        assert speaker.render("Offline") is not None
+
+    assert mock_synthesize.call_count == 2  # then the breaker opened
+    assert speaker.get_health()["edge-tts"]["state"] == "open"
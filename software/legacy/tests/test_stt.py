@@ -0,0 +1,160 @@
+"""Tests for tars/voice/stt.py — pluggable speech recognition backends."""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import speech_recognition as sr
+
+from tars.voice import stt
+
+
+class _FakeKaldi:
+    """Stands in for vosk.KaldiRecognizer: each frame is one word, b"." ends a segment."""
+
+    def __init__(self, model, rate):
+        self.words = []
+        self.segments = []
+
+    def SetWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, data):
+        if data == b".":
+            self.segments.append(self.words)
+            self.words = []
+            return True
+        self.words.append(data.decode())
+        return False
+
+    def _segment(self, words):
+        return json.dumps({"text": " ".join(words), "result": [{"word": w, "conf": 0.8} for w in words]})
+
+    def Result(self):
+        return self._segment(self.segments[-1])
+
+    def PartialResult(self):
+        return json.dumps({"partial": " ".join(self.words)})
+
+    def FinalResult(self):
+        return self._segment(self.words)
+
+
+class _StubBackend:
+    def __init__(self, name, result=None, error=None, delay=0.0):
+        self.name = name
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.heard = None
+
+    def session(self):
+        return stt._BufferedSession(self._recognize)
+
+    def _recognize(self, data):
+        self.heard = data
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    with patch.dict(stt._stats, clear=True):
+        yield
+
+
+def _race(*backends, deadline=1.0):
+    utterance = stt.Utterance(list(backends), race=True, min_confidence=0.8, deadline=deadline)
+    utterance.feed(b"audio")
+    return utterance.finish()
+
+
+@pytest.fixture
+def fake_vosk():
+    with patch.object(stt, "vosk", MagicMock(KaldiRecognizer=_FakeKaldi), create=True):
+        yield stt.VoskBackend(model=None)
+
+
+def test_vosk_streams_partials_and_finishes_from_what_it_decoded(fake_vosk):
+    partials = []
+    utterance = stt.Utterance([fake_vosk], on_partial=partials.append)
+    for frame in (b"turn", b"turn", b".", b"left"):
+        utterance.feed(frame)
+    result = utterance.finish()
+
+    assert partials == ["turn", "turn turn", "turn turn left"]
+    assert result.text == "turn turn left"
+    assert result.confidence == pytest.approx(0.8)
+    assert result.backend == "vosk"
+
+
+def test_unreachable_backend_falls_back_to_the_next_with_the_same_audio():
+    cloud = _StubBackend("google", error=stt.Unavailable("offline"))
+    local = _StubBackend("vosk", result=stt.Result("stop", 0.9, "vosk"))
+    utterance = stt.Utterance([cloud, local])
+    utterance.feed(b"ab")
+    utterance.feed(b"cd")
+
+    assert utterance.finish().text == "stop"
+    assert local.heard == b"abcd"
+
+
+def test_google_maps_network_errors_to_unavailable():
+    backend = stt.GoogleBackend()
+    with patch.object(backend._recognizer, "recognize_google", side_effect=sr.RequestError("no network")):
+        with pytest.raises(stt.Unavailable):
+            backend.recognize(b"\0\0" * 160)
+    with patch.object(backend._recognizer, "recognize_google", side_effect=sr.UnknownValueError()):
+        assert backend.recognize(b"\0\0" * 160) is None
+
+
+def test_engine_order_follows_config():
+    backends = {"google": _StubBackend("google"), "vosk": _StubBackend("vosk")}
+    with patch.dict(stt._backends, backends, clear=True):
+        for engine, order in (("auto", ["vosk", "google"]), ("google", ["google", "vosk"]), ("local", ["vosk"])):
+            with patch.object(stt.config, "STT_ENGINE", engine):
+                assert stt.engines() == order
+
+
+def test_race_takes_the_first_confident_answer():
+    slow = _StubBackend("google", stt.Result("turn left", 0.95, "google"), delay=0.5)
+    fast = _StubBackend("vosk", stt.Result("turn lift", 0.9, "vosk"))
+    started = time.monotonic()
+    assert _race(slow, fast).text == "turn lift"
+    assert time.monotonic() - started < 0.4  # didn't wait for the slow one
+    assert slow.heard == fast.heard == b"audio"
+
+
+def test_race_takes_the_best_answer_by_the_deadline():
+    unsure = _StubBackend("vosk", stt.Result("tern left", 0.4, "vosk"))
+    better = _StubBackend("google", stt.Result("turn left", 0.7, "google"), delay=0.05)
+    hung = _StubBackend("other", stt.Result("turn left", 0.99, "other"), delay=1.0)
+    assert _race(unsure, better, hung, deadline=0.3).text == "turn left"
+    stats = stt.stats()
+    assert stats["google"]["wins"] == 1 and stats["vosk"]["wins"] == 0
+    assert stats["other"]["timeouts"] == 1
+    assert stats["vosk"]["p50"] is not None
+
+
+def test_race_with_every_backend_down_is_unavailable():
+    with pytest.raises(stt.Unavailable):
+        _race(_StubBackend("google", error=stt.Unavailable("offline")),
+              _StubBackend("other", delay=1.0), deadline=0.1)
+    assert _race(_StubBackend("google"), _StubBackend("vosk")) is None  # heard, but nothing understood
+
+
+def test_stragglers_from_earlier_races_dont_starve_the_next():
+    for _ in range(3):
+        hung = [_StubBackend(f"hung{i}", stt.Result("turn", 0.99), delay=0.5) for i in range(2)]
+        fast = _StubBackend("vosk", stt.Result("turn left", 0.9, "vosk"))
+        assert _race(*hung, fast, deadline=0.3).text == "turn left"
+
+
+def test_racing_google_gives_up_at_the_deadline():
+    with patch.dict(stt._backends, clear=True), patch.object(stt, "VOSK_AVAILABLE", False), \
+            patch.object(stt.config, "STT_RACE", True), patch.object(stt.config, "STT_DEADLINE", 2.5):
+        stt.initialize()
+        assert stt._backends["google"]._recognizer.operation_timeout == 2.5
@@ -0,0 +1,76 @@
+"""Tests for tars/dev — the stub AI server and the AI latency benchmark."""
+
+import asyncio
+from unittest.mock import patch
+
+import openai
+import pytest
+
+from tars.ai import chat, local_llm
+from tars.dev import bench_ai
+from tars.dev.stub_server import Latency, Profile, StubServer
+
+
+@pytest.fixture
+def stub():
+    with StubServer(Profile(tokens_per_second=0, reply="Stub reply here.")) as server:
+        yield server
+
+
+def test_openai_streaming_protocol(stub):
+    """The OpenAI SDK can stream a reply from the stub, token by token."""
+    client = openai.OpenAI(base_url=f"{stub.url}/v1", api_key="stub")
+    stream = client.chat.completions.create(model="stub", messages=[], stream=True)
+    chunks = [c.choices[0].delta.content for c in stream if c.choices and c.choices[0].delta.content]
+    assert "".join(chunks) == "Stub reply here."
+    assert len(chunks) == 3
+
+
+def test_error_rate_returns_server_errors(stub):
+    stub.profile.error_rate = 1.0
+    client = openai.OpenAI(base_url=f"{stub.url}/v1", api_key="stub", max_retries=0)
+    with pytest.raises(openai.InternalServerError):
+        client.chat.completions.create(model="stub", messages=[])
+    assert stub.errors == 1
+
+
+def test_ollama_streaming_protocol(stub):
+    """local_llm streams NDJSON from the stub's /api/chat."""
+    async def collect():
+        try:
+            return [c async for c in local_llm.get_response_stream_async("Hello")]
+        finally:
+            await local_llm.close_async()
+
+    with patch("tars.ai.local_llm._base_url", stub.url), patch("tars.ai.local_llm._ollama_available", True):
+        assert "".join(asyncio.run(collect())) == "Stub reply here."
+
+
+def test_latency_distributions_are_seeded():
+    import random
+
+    assert Latency.fixed(0.2).sample(random.Random(1)) == 0.2
+    assert 0.1 <= Latency.uniform(0.1, 0.3).sample(random.Random(1)) <= 0.3
+    assert Latency.lognormal(0.2).sample(random.Random(1)) == Latency.lognormal(0.2).sample(random.Random(1))
+
+
+def test_benchmark_fallback_scenario():
+    """A failing Cerebras stub hands over to the OpenAI stub; percentiles are reported."""
+    scenario = {
+        "cerebras": Profile(tokens_per_second=0, error_rate=1.0),
+        "openai": Profile(tokens_per_second=0),
+        "stream": False,
+    }
+    with patch.dict(bench_ai.SCENARIOS, {"test": scenario}), \
+            patch.multiple(chat, _cerebras_client=None, _openai_client=None, _cerebras_available=False,
+                           _openai_available=False, _breakers=chat._breakers), \
+            patch.multiple(local_llm, _ollama_available=False, _base_url=local_llm._base_url), \
+            patch("tars.dev.bench_ai.config.AI_CACHE_ENABLED", False), \
+            patch("tars.dev.bench_ai.config.AI_TIMEOUT", 5), \
+            patch("builtins.print"):
+        result = bench_ai.run_scenario("test", requests=4)
+
+    assert result["failures"] == 0
+    p50, p95, p99 = result["total"]
+    assert p50 <= p95 <= p99
+    assert result["backend_requests"]["openai"] == 4
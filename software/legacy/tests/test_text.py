@@ -0,0 +1,40 @@
+"""Tests for tars/utils/text.py — sentence splitting."""
+
+from tars.utils.text import pop_sentences, split_clauses, split_sentences
+
+
+def test_pop_sentences_keeps_unfinished_tail():
+    """Only sentences followed by whitespace are complete."""
+    sentences, rest = pop_sentences("Hello there. How are")
+    assert sentences == ["Hello there."]
+    assert rest == "How are"
+
+
+def test_pop_sentences_waits_for_whitespace():
+    """A trailing period may be a decimal point — not complete yet."""
+    sentences, rest = pop_sentences("Pi is 3.")
+    assert sentences == []
+    assert rest == "Pi is 3."
+
+
+def test_pop_sentences_cjk():
+    """CJK punctuation ends a sentence without trailing whitespace."""
+    sentences, rest = pop_sentences("前進します。左に")
+    assert sentences == ["前進します。"]
+    assert rest == "左に"
+
+
+def test_split_sentences_includes_fragment():
+    """split_sentences returns the trailing fragment as the last sentence."""
+    assert split_sentences("One. Two! Three") == ["One.", "Two!", "Three"]
+
+
+def test_split_clauses_keeps_short_sentences_whole():
+    assert split_clauses("Hello there, human.", 40) == ["Hello there, human."]
+
+
+def test_split_clauses_packs_long_sentences():
+    sentence = "I see a desk, two chairs, a very tired plant, and one human pretending to work."
+    pieces = split_clauses(sentence, 30)
+    assert pieces == ["I see a desk, two chairs,", "a very tired plant,", "and one human pretending to work."]
+    assert " ".join(pieces) == sentence
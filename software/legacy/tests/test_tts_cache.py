@@ -0,0 +1,79 @@
+"""Tests for tars/voice/tts_cache.py — content-addressed speech cache."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from pydub import AudioSegment
+
+from tars.voice import speaker, tts_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    """Point the cache at a temp directory with fresh module state."""
+    with patch("tars.voice.tts_cache.config.TTS_CACHE_DIR", str(tmp_path)), \
+            patch("tars.voice.tts_cache.config.TTS_CACHE_ENABLED", True), \
+            patch("tars.voice.tts_cache._index", None), \
+            patch("tars.voice.tts_cache._total_bytes", 0), \
+            patch("tars.voice.tts_cache._recent", tts_cache.OrderedDict()):
+        yield tmp_path
+
+
+def _tone(ms=200):
+    return AudioSegment.silent(duration=ms, frame_rate=24000) + 3
+
+
+def test_key_depends_on_voice_and_effects():
+    base = tts_cache.key("Moving forward", "en-US-GuyNeural")
+    assert base == tts_cache.key(" Moving forward ", "en-US-GuyNeural")
+    assert base != tts_cache.key("Moving forward", "es-ES-AlvaroNeural")
+    with patch("tars.voice.tts_cache.config.PLAYBACK_SPEED", 1.5):
+        assert base != tts_cache.key("Moving forward", "en-US-GuyNeural")
+
+
+def test_persisted_audio_round_trips(cache_dir):
+    sound = _tone()
+    tts_cache.put("abc", sound, persist=True)
+    assert os.path.exists(cache_dir / "abc.wav")
+
+    cached = tts_cache.get("abc")
+    assert cached.raw_data == sound.raw_data
+    assert cached.frame_rate == 24000
+
+
+def test_one_off_renders_stay_in_memory_until_repeated(cache_dir):
+    """A phrase is only written to disk the second time it is needed."""
+    tts_cache.put("once", _tone())
+    assert not os.listdir(cache_dir)
+
+    assert tts_cache.get("once") is not None
+    assert tts_cache.contains("once")
+
+
+def test_lru_eviction_over_size_cap(cache_dir):
+    """Least recently used files are deleted once the cap is exceeded."""
+    sound = _tone(1000)  # ~48 KB
+    with patch("tars.voice.tts_cache.config.TTS_CACHE_MAX_MB", 0.1):
+        tts_cache.put("a", sound, persist=True)
+        tts_cache.put("b", sound, persist=True)
+        tts_cache.get("a")
+        tts_cache.put("c", sound, persist=True)
+
+    assert tts_cache.contains("a")
+    assert not tts_cache.contains("b")
+    assert tts_cache.contains("c")
+    assert tts_cache.stats()["bytes"] <= 0.1 * 1024 * 1024
+
+
+@patch("tars.voice.speaker._initialized", True)
+@patch("tars.voice.speaker._synthesize_blocks")
+def test_render_hits_skip_synthesis(mock_synthesize):
+    """Pre-rendered phrases never touch edge-tts or the effect chain again."""
+    mock_synthesize.side_effect = lambda text, voice_id, feed: iter([_tone()])
+
+    assert speaker.prerender([("Let me take a look...", "english")]) == 1
+    mock_synthesize.reset_mock()
+
+    assert speaker.render("Let me take a look...", "english") is not None
+    mock_synthesize.assert_not_called()
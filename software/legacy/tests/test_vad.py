@@ -0,0 +1,74 @@
+"""Tests for tars/voice/vad.py — adaptive end-of-speech detection."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from tars.voice import capture, listener, stt, vad
+
+SILENT = bytes(vad.FRAME_SAMPLES * 2)
+VOICED = b"\x01" + bytes(vad.FRAME_SAMPLES * 2 - 1)
+
+
+def _endpointer():
+    # Stub classifier: a frame is voiced if its first byte is set
+    return vad.Endpointer(classifier=lambda frame: frame[0] != 0, min_hangover=0.3, max_hangover=0.8)
+
+
+def _run(endpointer, pattern):
+    """Feed a pattern like '..VVV..' (V voiced); return the frame index where it ended, or None."""
+    endpointer.reset()
+    for i, c in enumerate(pattern):
+        if endpointer.feed(VOICED if c == "V" else SILENT):
+            return i
+    return None
+
+
+def test_start_ignores_blips_and_end_waits_for_min_hangover():
+    endpointer = _endpointer()
+    ended_at = _run(endpointer, "..V...VVVVVV" + "." * 20)
+    assert endpointer.start == 6  # the lone blip didn't start it
+    assert endpointer.end == 12
+    assert ended_at == 11 + 10  # 10 silent frames = 0.3 s
+
+
+def test_short_pause_does_not_cut_the_command():
+    endpointer = _endpointer()
+    _run(endpointer, "VVVV" + "." * 6 + "VVVV" + "." * 20)
+    assert endpointer.end == 14
+
+
+def test_hangover_grows_for_a_speaker_who_pauses():
+    endpointer = _endpointer()
+    for _ in range(5):
+        _run(endpointer, "VVVV" + "." * 9 + "VVVV" + "." * 8 + "VVVV" + "." * 40)
+    # 270 ms pauses are typical for this speaker — wait longer than that
+    assert 0.3 < endpointer.hangover() <= 0.8
+    assert _run(endpointer, "VVVV" + "." * 11 + "VVVV" + "." * 40) is not None
+    assert endpointer.end == 19
+
+
+def test_listener_streams_the_utterance_to_the_recognizer():
+    """The VAD path feeds the speech plus a short lead-in as it's captured, and stops at the endpoint."""
+    frames = np.zeros(120 * vad.FRAME_SAMPLES, dtype=np.int16)
+    frames[30 * vad.FRAME_SAMPLES:50 * vad.FRAME_SAMPLES] = 1000
+    endpointer = vad.Endpointer(classifier=lambda frame: np.frombuffer(frame, dtype=np.int16)[0] != 0,
+                                min_hangover=0.3, max_hangover=0.3)
+    ring = capture.RingBuffer(len(frames))
+    ring.write(frames)
+    fed = []
+    utterance = MagicMock()
+    utterance.feed.side_effect = lambda frame: fed.append(np.frombuffer(frame, dtype=np.int16))
+    utterance.finish.return_value = stt.Result("Turn Left")
+
+    with patch.object(capture, "_ring", ring), patch.object(capture, "_running", False), \
+            patch.object(listener, "_endpointer", endpointer), \
+            patch.object(listener.capture, "start", return_value=True), \
+            patch.object(listener.vad, "is_available", return_value=True), \
+            patch.object(listener.stt, "utterance", return_value=utterance):
+        assert listener.listen(start=0) == "turn left"
+
+    samples = np.concatenate(fed)
+    # 10 lead-in frames, 20 of speech, then the 0.3 s hangover that ended it
+    assert len(samples) == (listener._LEAD_FRAMES + 20 + 10) * vad.FRAME_SAMPLES
+    assert np.count_nonzero(samples) == 20 * vad.FRAME_SAMPLES